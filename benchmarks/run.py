@@ -0,0 +1,218 @@
+"""
+Benchmarks of chain-smoker's own overhead against a local stub HTTP server.
+
+Every benchmark case runs in a fresh process, so the reported peak RSS belongs to that case only.
+The stub server runs in a separate process and does not count towards the measured CPU time.
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import yaml
+
+from src.chain_smoker import __version__
+from src.chain_smoker.api_client import APIClient
+from src.chain_smoker.config import ClientConfig, Transport
+from src.chain_smoker.file_loader import TestFileLoader
+from src.chain_smoker.logger import logger
+from src.chain_smoker.test_methods import ContainsTest
+
+from .stub_server import canned_body, serve
+
+BENCHMARKS = ['TestFileLoader', 'APIClient', 'SmokeTest', 'ChainedSmokeTest', 'ContainsTest']
+# benchmarks sending requests, which run once per transport
+REQUEST_BENCHMARKS = ['APIClient', 'SmokeTest', 'ChainedSmokeTest']
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+# requests of a chained test, the authentication and two authenticated requests
+CHAIN_LENGTH = 3
+
+
+def _smoke_test(i: int) -> Dict:
+    return {'endpoint': f'items/{i}', 'expects_status_code': 200, 'contains': {'token': 'benchmark-token'}}
+
+
+def _chained_test(i: int) -> Dict:
+    return {
+        'multi_step': True,
+        'steps': [
+            {
+                'name': f'authenticate_{i}', 'endpoint': 'auth', 'method': 'post', 'payload': '{}',
+                'is_authentication': True,
+                'auth_header_template': {
+                    'token_position': "res.json().get('token')", 'auth_header': {'Authorization': 'JWT {token}'}
+                }
+            },
+            {'name': f'first_{i}', 'endpoint': f'items/{i}', 'expects_status_code': 200},
+            {
+                'name': f'second_{i}', 'endpoint': 'items/{id}',
+                'uses': {'id': f"values['first_{i}']['items'][0]['id']"},
+                'contains': {'token': 'benchmark-token'}
+            },
+        ]
+    }
+
+
+def write_suite(directory: str, url: str, tests: int, tests_per_file: int, chained: bool = False,
+                transport: Transport = Transport.REQUESTS) -> List[str]:
+    """Writes a synthetic suite of `tests` tests to `directory`, returns the written files."""
+    files = list()
+    for start in range(0, tests, tests_per_file):
+        filename = os.path.join(directory, f'suite_{len(files):05d}.yaml')
+        build = _chained_test if chained else _smoke_test
+        content = {
+            'type': 'api-test',
+            'config': {'client': {'base_url': url, 'transport': transport.value}},
+            'tests': {f'test_{i}': build(i) for i in range(start, min(start + tests_per_file, tests))},
+        }
+        with open(filename, 'w') as stream:
+            yaml.safe_dump(content, stream)
+        files.append(filename)
+    return files
+
+
+def _measure(run: Callable[[], None]) -> Dict[str, float]:
+    wall, cpu = time.perf_counter(), time.process_time()
+    run()
+    return {'wall': time.perf_counter() - wall, 'cpu': time.process_time() - cpu}
+
+
+def _peak_rss() -> int:
+    """Peak resident set size of the current process in KiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _run_case(benchmark: str, tests: int, url: str, tests_per_file: int, response_size: int,
+              transport: Transport) -> Dict:
+    files: List[str] = list()
+    with tempfile.TemporaryDirectory() as directory:
+        if benchmark == 'APIClient':
+            # bare requests without any test, the connection is established beforehand
+            client = APIClient(ClientConfig(base_url=url, transport=transport))
+            client.get('items/0')
+            measured = _measure(lambda: [client.get(f'items/{i}') for i in range(tests)])
+            requests = tests
+        elif benchmark == 'ContainsTest':
+            body = json.loads(canned_body(response_size))
+            value_test = ContainsTest({'token': 'benchmark-token'}, name='test', method='get')
+            measured = _measure(lambda: [value_test.test(body) for _ in range(tests)])
+            requests = 0
+        elif benchmark == 'TestFileLoader':
+            files = write_suite(directory, url, tests, tests_per_file)
+            measured = _measure(lambda: [TestFileLoader(file) for file in files])
+            requests = 0
+        else:
+            chained = benchmark == 'ChainedSmokeTest'
+            tests = max(1, tests // CHAIN_LENGTH) if chained else tests
+            files = write_suite(directory, url, tests, tests_per_file, chained=chained, transport=transport)
+            loaders = [TestFileLoader(file) for file in files]
+
+            def run() -> None:
+                for loader in loaders:
+                    result = loader.run(fail_fast=False)
+                    assert result.passed, [test.error for test in result.tests if not test.passed]
+
+            measured = _measure(run)
+            requests = tests * CHAIN_LENGTH if chained else tests
+
+    wall, cpu = measured['wall'], measured['cpu']
+    return {
+        'benchmark': benchmark,
+        'transport': transport.value if benchmark in REQUEST_BENCHMARKS else None,
+        'tests': tests,
+        'files': len(files),
+        'requests': requests,
+        'wall': wall,
+        'cpu': cpu,
+        'files_per_sec': len(files) / wall if files and wall else None,
+        'tests_per_sec': tests / wall if wall else None,
+        'cpu_per_test_us': cpu / tests * 1e6,
+        'cpu_per_request_us': cpu / requests * 1e6 if requests else None,
+        'peak_rss_kib': _peak_rss(),
+    }
+
+
+def run_case(benchmark: str, tests: int, url: str, tests_per_file: int, response_size: int,
+             transport: Transport = Transport.REQUESTS) -> Dict:
+    """Runs a single benchmark case, meant to be executed in a fresh process. Passing tests aren't logged."""
+    level = logger.level
+    logger.setLevel(max(level, logging.WARNING))
+    try:
+        return _run_case(benchmark, tests, url, tests_per_file, response_size, transport)
+    finally:
+        logger.setLevel(level)
+
+
+def _summary(result: Dict) -> str:
+    name = result['benchmark'] + (f' ({result["transport"]})' if result['transport'] else '')
+    out = f'{name:>26} {result["tests"]:>7} tests: {result["tests_per_sec"]:>10.1f} tests/s, ' \
+          f'{result["cpu_per_test_us"]:>9.1f} us CPU/test, '
+    if result['cpu_per_request_us'] is not None:
+        out += f'{result["cpu_per_request_us"]:>9.1f} us CPU/request, '
+    return out + f'peak RSS {result["peak_rss_kib"]} KiB'
+
+
+def main(argv: Optional[List[str]] = None) -> Dict:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-b', '--benchmark', action='append', choices=BENCHMARKS, default=None,
+                        help='benchmark to run, can be repeated [default: all]')
+    parser.add_argument('-n', '--sizes', type=lambda v: [int(s) for s in v.split(',')], default=DEFAULT_SIZES,
+                        help='comma separated numbers of tests per suite [default: 10,100,1000,10000,100000]')
+    parser.add_argument('-t', '--transport', action='append', type=Transport, choices=[t.value for t in Transport],
+                        default=None, help='transport of the benchmarks sending requests, can be repeated '
+                                           '[default: all]')
+    parser.add_argument('--tests-per-file', type=int, default=100, help='number of tests per generated file')
+    parser.add_argument('--response-size', type=int, default=512, help='size of the stub responses in bytes')
+    parser.add_argument('--latency', type=float, default=0., help='delay of each stub response in seconds')
+    parser.add_argument('-o', '--output', type=str, default='benchmark-results.json',
+                        help='file to write the results to as JSON')
+    args = parser.parse_args(argv)
+
+    context = multiprocessing.get_context('spawn')
+    receiver, sender = context.Pipe(duplex=False)
+    server = context.Process(target=serve, args=(args.response_size, args.latency), kwargs={'ready': sender},
+                             daemon=True)
+    server.start()
+    url = receiver.recv()
+
+    results = list()
+    try:
+        for benchmark in args.benchmark or BENCHMARKS:
+            transports = args.transport or list(Transport) if benchmark in REQUEST_BENCHMARKS else [Transport.REQUESTS]
+            for transport in transports:
+                for tests in args.sizes:
+                    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                        result = executor.submit(
+                            run_case, benchmark, tests, url, args.tests_per_file, args.response_size, transport
+                        ).result()
+                    print(_summary(result))
+                    results.append(result)
+    finally:
+        server.terminate()
+        server.join()
+
+    report = {
+        'version': __version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {
+            'tests_per_file': args.tests_per_file, 'response_size': args.response_size, 'latency': args.latency
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as stream:
+        json.dump(report, stream, indent=2)
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing.connection import Connection
+from typing import Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+def canned_body(size: int) -> bytes:
+    """JSON body of about `size` bytes, containing `items` to search in."""
+    items, length = list(), 2
+    while length < size:
+        item = {'id': len(items), 'name': f'item-{len(items)}'}
+        items.append(item)
+        length += len(json.dumps(item)) + 2
+    return json.dumps({'token': 'benchmark-token', 'items': items}).encode()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Serves the canned response of the server to every request.
+    The query parameters `size` and `latency` override the defaults of the server for a single request.
+    """
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    server: 'StubServer'
+
+    def _respond(self) -> None:
+        query = parse_qs(urlparse(self.path).query)
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+
+        latency = float(query['latency'][0]) if 'latency' in query else self.server.latency
+        body = canned_body(int(query['size'][0])) if 'size' in query else self.server.body
+        if latency:
+            time.sleep(latency)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_PATCH = _respond
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int] = ('127.0.0.1', 0), size: int = 512, latency: float = 0.) -> None:
+        super().__init__(address, StubHandler)
+        self.body: bytes = canned_body(size)
+        self.latency: float = latency
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}/'
+
+
+def serve(size: int = 512, latency: float = 0., port: int = 0, ready: Optional[Connection] = None) -> None:
+    """Runs a stub server until interrupted, sending its URL to `ready` once listening."""
+    server = StubServer(('127.0.0.1', port), size=size, latency=latency)
+    if ready is not None:
+        ready.send(server.url)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Local stub HTTP server serving canned JSON responses.')
+    parser.add_argument('-p', '--port', type=int, default=8000, help='port to listen on')
+    parser.add_argument('-s', '--size', type=int, default=512, help='size of the response bodies in bytes')
+    parser.add_argument('-l', '--latency', type=float, default=0., help='delay of each response in seconds')
+    args = parser.parse_args()
+    serve(args.size, args.latency, args.port)
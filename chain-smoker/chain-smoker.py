@@ -1,20 +1,186 @@
 #!/usr/bin/env python
 
 import argparse
-import os
+import logging
+import sys
 
-from src.chain_smoker.file_loader import TestFileLoader
+from src.chain_smoker.cache import ConfigCache
+from src.chain_smoker.cassette import CassetteMode
+from src.chain_smoker.config import Engine, Transport
+from src.chain_smoker.discovery import DEFAULT_INCLUDE, discover
+from src.chain_smoker.load import LoadConfig
+from src.chain_smoker.logger import configure_logging
+from src.chain_smoker.metrics import Metrics, serve_metrics
+from src.chain_smoker.profiling import ProfileConfig
+from src.chain_smoker.reporters import JSONLinesReporter, JUnitXMLReporter
+from src.chain_smoker.runner import RunFailed, run_files, monitor_files, report, load_files
+from src.chain_smoker.scheduling import Plan, Shard, longest_first, shard
+from src.chain_smoker.selection import NODE_SEPARATOR, TestIndex, TestSelector
+from src.chain_smoker.timings import Timings
 
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument('-d', '--directory', type=str, default='smoke_tests/',
                         help='directory to read from')
+    parser.add_argument('--include', action='append', default=None,
+                        help='glob pattern of test files, can be repeated [default: "*.yaml", "*.yml"]')
+    parser.add_argument('--exclude', action='append', default=[],
+                        help='glob pattern of excluded files and directories, can be repeated')
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help='number of processes used to run test files in parallel')
+    parser.add_argument('-c', '--concurrency', type=int, default=None,
+                        help='number of independent tests per file executed concurrently, overrides the file config')
+    parser.add_argument('-e', '--engine', type=Engine, choices=[e.value for e in Engine], default=Engine.SYNC,
+                        help='execution engine, "async" runs all requests on a single event loop')
+    parser.add_argument('--transport', type=Transport, choices=[t.value for t in Transport], default=None,
+                        help='HTTP library of the "sync" engine for all files, overriding their client configuration')
+    parser.add_argument('-m', '--monitor', action='store_true',
+                        help='keep running, re-run each file on its `config.interval`')
+    parser.add_argument('-i', '--interval', type=float, default=60.,
+                        help='seconds between two runs of files without `config.interval` in monitor mode')
+    parser.add_argument('--cache-dir', type=str, default=None,
+                        help='directory caching validated test file configurations between runs')
+    parser.add_argument('--continue-on-failure', action='store_true',
+                        help='run all tests regardless of failures and report all results at the end')
+    parser.add_argument('-k', '--keyword', action='append', default=[],
+                        help='only run tests whose name contains the keyword, can be repeated')
+    parser.add_argument('--tag', action='append', default=[],
+                        help='only run tests with the tag, can be repeated')
+    parser.add_argument('--endpoint', action='append', default=[],
+                        help='only run tests requesting an endpoint matching the glob pattern, can be repeated')
+    parser.add_argument('--method', action='append', default=[],
+                        help='only run tests using the HTTP method, can be repeated')
+    parser.add_argument('--index', type=str, default=None,
+                        help='file storing the test index used to select test files between runs')
+    parser.add_argument('--shard', type=Shard.parse, default=None,
+                        help='only run shard "i/n" of the test files, balanced by the durations in `--timings`')
+    parser.add_argument('--shard-by', choices=['file', 'test'], default='file',
+                        help='split whole files or single tests into shards, chained tests are never split')
+    parser.add_argument('--timings', type=str, default=None,
+                        help='file storing the durations of files and tests, updated after each run '
+                             'and used to run the longest files and tests first')
+    parser.add_argument('--plan', action='store_true',
+                        help='print the order of execution and the estimated makespan without running any test')
+    parser.add_argument('--load', action='store_true',
+                        help='replay the tests of each file with `--concurrency` workers and report latencies')
+    parser.add_argument('--duration', type=float, default=None,
+                        help='seconds to replay the tests of each file for in load mode')
+    parser.add_argument('--iterations', type=int, default=None,
+                        help='number of test runs per file in load mode')
+    parser.add_argument('--rate', type=float, default=None,
+                        help='target number of test runs per second in load mode')
+    parser.add_argument('--sample', type=float, default=1.,
+                        help='share of responses evaluated by the value tests in load mode [default: 1]')
+    parser.add_argument('--profile', nargs='?', const='profiles', default=None, metavar='DIRECTORY',
+                        help='profile each file with cProfile and dump the stats to DIRECTORY [default: profiles]')
+    parser.add_argument('--trace-malloc', nargs='?', type=int, const=10, default=0, metavar='N',
+                        help='report the top N memory allocations of each file using tracemalloc [default: 10]')
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help='serve Prometheus metrics on http://localhost:PORT/metrics in monitor mode')
+    parser.add_argument('--metrics-file', type=str, default=None,
+                        help='write Prometheus metrics to the given file for the textfile collector')
+    parser.add_argument('--jsonl', type=str, default=None,
+                        help='write the result of every test as JSON Lines to the given file')
+    parser.add_argument('--junit-xml', type=str, default=None,
+                        help='write a JUnit XML report to the given file')
+    parser.add_argument('--log', action='append', default=None, metavar='SINK',
+                        help='write logs to "stdout", "stderr" or the given file, can be repeated [default: stdout]')
+    parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'], default='INFO',
+                        help='minimum level of logged records [default: INFO]')
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument('--record', dest='cassette', action='store_const', const=CassetteMode.RECORD, default=None,
+                          help='record all responses to a cassette next to each test file')
+    cassette.add_argument('--replay', dest='cassette', action='store_const', const=CassetteMode.REPLAY,
+                          help='serve responses from the recorded cassettes instead of sending requests')
     args = parser.parse_args()
+    configure_logging(args.log or ['stdout'], level=getattr(logging, args.log_level))
+    if args.monitor and args.engine != Engine.SYNC:
+        parser.error('monitor mode requires the "sync" engine')
+    if args.transport is not None and args.engine != Engine.SYNC:
+        parser.error('--transport requires the "sync" engine')
+    profile = ProfileConfig(directory=args.profile, trace_malloc=args.trace_malloc) \
+        if args.profile or args.trace_malloc else None
+    if profile is not None and (args.engine != Engine.SYNC or args.monitor or args.load):
+        parser.error('profiling requires the "sync" engine and can\'t be combined with monitor or load mode')
+    if args.load and args.monitor:
+        parser.error('load mode can\'t be combined with monitor mode')
+    if args.cassette is not None and (args.monitor or args.load):
+        parser.error('--record and --replay can\'t be combined with monitor or load mode')
+    if (args.jsonl or args.junit_xml) and (args.monitor or args.load):
+        parser.error('reports can\'t be combined with monitor or load mode')
+    if args.metrics_port is not None and not args.monitor:
+        parser.error('--metrics-port requires monitor mode')
+    if (args.metrics_port is not None or args.metrics_file) and args.load:
+        parser.error('metrics can\'t be combined with load mode')
+    if args.load and args.duration is None and args.iterations is None:
+        parser.error('load mode requires --duration or --iterations')
 
-    filtered_files = filter(lambda f: '.yaml' in f or '.yml' in f, os.listdir(args.directory))
-    files = map(lambda x: os.path.join(args.directory, x), filtered_files)
-    for file in files:
-        loader = TestFileLoader(file)
-
-        loader.run()
+    files = discover(args.directory, include=args.include or DEFAULT_INCLUDE, exclude=args.exclude)
+    selector = TestSelector(keywords=args.keyword, tags=args.tag, endpoints=args.endpoint, methods=args.method)
+    index = TestIndex.load(args.index) if args.index else TestIndex()
+    timings = Timings.load(args.timings) if args.timings else Timings()
+    if args.shard and args.shard_by == 'test':
+        nodes = shard(index.select_tests(files, selector), args.shard, timings.duration)
+        selector = selector.with_nodes(nodes)
+        files = list(dict.fromkeys(node.partition(NODE_SEPARATOR)[0] for node in nodes))
+    else:
+        if not selector.is_empty:
+            files = index.select(files, selector)
+        if args.shard:
+            files = shard(files, args.shard, timings.duration)
+    if args.timings and (args.workers > 1 or args.engine == Engine.ASYNC):
+        files = longest_first(files, timings.duration)
+    if args.plan:
+        print(Plan.create(files, args.workers, timings.duration).summary())
+        sys.exit(0)
+    loader_kwargs = {
+        'concurrency': args.concurrency,
+        'cache': ConfigCache(args.cache_dir) if args.cache_dir else None,
+        'selector': None if selector.is_empty else selector,
+        'timings': timings if args.timings else None,
+        'cassette': args.cassette,
+        'transport': args.transport,
+    }
+    metrics = Metrics(textfile=args.metrics_file) if args.metrics_port is not None or args.metrics_file else None
+    if args.load:
+        load = LoadConfig(concurrency=args.concurrency or 1, rate=args.rate, duration=args.duration,
+                          iterations=args.iterations, sample=args.sample)
+        results = load_files(files, load, cache=loader_kwargs['cache'], selector=loader_kwargs['selector'],
+                             transport=args.transport)
+        sys.exit(0 if all(result.errors == result.failures == 0 for result in results) else 1)
+    elif args.monitor:
+        files = list(files)
+        if args.index:
+            index.save(args.index)
+        if args.metrics_port is not None:
+            serve_metrics(metrics, args.metrics_port)
+        monitor_files(files, default_interval=args.interval, workers=args.workers, metrics=metrics, **loader_kwargs)
+    else:
+        reporters = [JSONLinesReporter(args.jsonl)] if args.jsonl else []
+        if args.junit_xml:
+            reporters.append(JUnitXMLReporter(args.junit_xml))
+        failure = None
+        try:
+            result = run_files(files, workers=args.workers, engine=args.engine, fail_fast=not args.continue_on_failure,
+                               profile=profile, reporters=reporters, **loader_kwargs)
+        except RunFailed as e:
+            # failed runs are recorded like passed ones before raising
+            result, failure = e.result, e
+        finally:
+            for reporter in reporters:
+                reporter.close()
+            if args.index:
+                index.save(args.index)
+        if metrics is not None:
+            for file in result.files:
+                metrics.observe(file)
+            metrics.write()
+        if args.timings:
+            timings.update(result)
+            timings.save(args.timings)
+        if failure is not None:
+            raise failure
+        if args.continue_on_failure:
+            report(result)
+            sys.exit(0 if result.passed else 1)
@@ -1,10 +1,18 @@
+import time
+from contextlib import nullcontext
+from datetime import timedelta
 from enum import Enum
 from typing import Optional, Union, Dict
 from urllib.parse import urljoin
 
-from requests import Session, Response
+from requests import Response, ConnectionError, Timeout
 
-from .config import ClientConfig
+from .body import read_body
+from .cassette import Cassette, request_key
+from .config import BodyConfig, ClientConfig, PoolConfig, Transport
+from .rate_limit import RateLimiter, get_limiter
+from .results import RequestTimings
+from .transports import HTTPSession, connect_time, reset_connect_time, timed_session, unauthenticated_session
 
 
 class PayloadType(str, Enum):
@@ -13,13 +21,26 @@ class PayloadType(str, Enum):
 
 
 class APIClient:
+    # errors retried by tests with `retry_on: ['error']`
+    RETRYABLE_ERRORS = (ConnectionError, Timeout)
+
     def __init__(self, config: ClientConfig) -> None:
         self.base_url = config.base_url
-        self.session = Session()
+        self.pool: PoolConfig = config.pool
+        self.transport: Transport = config.transport
+        self.session: HTTPSession = timed_session(config.pool, config.transport)
+        # created on first use, reused by all unauthenticated requests to keep their connections alive
+        self.unauthenticated_session: Optional[HTTPSession] = None
         self.default_kwargs = config.kwargs
+        self.retry = config.retry
+        self.body: BodyConfig = config.body
+        self.limiter: Optional[RateLimiter] = get_limiter(config)
+        # records responses, or serves them instead of sending requests when replaying
+        self.cassette: Optional[Cassette] = None
+        # sessions are configured once, headers of single requests are merged into the session headers per request,
+        # so a client can be shared by concurrent tests
         if config.auth_header is not None:
             self.session.headers.update(config.auth_header.auth_header.model_dump())
-        self.default_headers = self.session.headers.copy()
 
     def _build_url(self, path: str) -> str:
         return urljoin(self.base_url, path)
@@ -27,16 +48,45 @@ class APIClient:
     def _enhance_kwargs(self, kwargs: Dict) -> Dict:
         out_kwargs = self.default_kwargs.copy()
         out_kwargs.update(kwargs)
+        if kwargs.get('headers') and self.default_kwargs.get('headers'):
+            out_kwargs['headers'] = {**self.default_kwargs['headers'], **kwargs['headers']}
         return out_kwargs
 
     def _request(self, method: str, path: str, requires_auth: bool = True, **kwargs) -> Response:
-        session = self.session
-        if not requires_auth:
-            session = Session()
-        rsp = getattr(session, method)(self._build_url(path), **self._enhance_kwargs(kwargs))
-        self.set_headers(self.default_headers)
+        url, kwargs = self._build_url(path), self._enhance_kwargs(kwargs)
+        if self.cassette is not None and self.cassette.replaying:
+            return self.cassette.play(request_key(method, url, kwargs))
+
+        session = self._get_session(requires_auth)
+        if self.body.streamed:
+            kwargs['stream'] = True
+        with self.limiter.limit() if self.limiter is not None else nullcontext():
+            reset_connect_time()
+            start = time.perf_counter()
+            rsp = getattr(session, method)(url, **kwargs)
+            if self.body.streamed:
+                read_body(rsp, self.body)
+            rsp.timings = self._timings(rsp, time.perf_counter() - start)
+        if self.cassette is not None:
+            self.cassette.record(request_key(method, url, kwargs), rsp)
         return rsp
 
+    def _get_session(self, requires_auth: bool) -> HTTPSession:
+        if requires_auth:
+            return self.session
+        if self.unauthenticated_session is None:
+            self.unauthenticated_session = unauthenticated_session(self.pool, self.transport)
+        return self.unauthenticated_session
+
+    @staticmethod
+    def _timings(rsp: Response, total: float) -> RequestTimings:
+        # `elapsed` covers the time until the headers were parsed, the body is read afterwards
+        connect = connect_time()
+        elapsed = getattr(rsp, 'elapsed', None)
+        headers_received = min(elapsed.total_seconds(), total) if isinstance(elapsed, timedelta) else total
+        return RequestTimings(connect=connect, ttfb=max(0., headers_received - connect),
+                              download=total - max(headers_received, connect), total=total)
+
     def _request_with_payload(self, method: str, path: str, data: Union[Dict, str],
                               payload_type: Optional[PayloadType] = None, *args, **kwargs) -> Response:
         payload_key = {
@@ -60,7 +110,3 @@ class APIClient:
     def patch(self, path: str, data: Union[Dict, str], payload_type: Optional[PayloadType] = None,
               *args, **kwargs) -> Response:
         return self._request_with_payload('patch', path, data, payload_type, *args, **kwargs)
-
-    def set_headers(self, headers):
-        if headers:
-            self.session.headers = headers
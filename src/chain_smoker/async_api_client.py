@@ -0,0 +1,150 @@
+import asyncio
+import time
+from contextlib import nullcontext
+from types import SimpleNamespace
+from typing import Optional, Dict
+from urllib.parse import urlparse
+
+from requests import Response
+from requests.cookies import RequestsCookieJar, morsel_to_cookie
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .api_client import APIClient
+from .body import CHUNK_SIZE, read_body_async
+from .cassette import Cassette, request_key
+from .config import BodyConfig, ClientConfig
+from .rate_limit import get_limiter
+from .results import RequestTimings
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+
+class AsyncAPIClient(APIClient):
+    """
+    asyncio based client, exposing the same request methods as `APIClient`.
+
+    Requests return awaitables resolving into `requests.Response` objects,
+    which allows reusing all value tests on the received responses.
+    Requires the optional dependency `aiohttp`, install it using `pip install chain-smoker[async]`.
+    """
+    RETRYABLE_ERRORS = (asyncio.TimeoutError, ) + ((aiohttp.ClientConnectionError, ) if aiohttp is not None else ())
+
+    def __init__(self, config: ClientConfig) -> None:
+        if aiohttp is None:
+            raise ImportError('The async engine requires "aiohttp", use `pip install chain-smoker[async]`.')
+        self.base_url = config.base_url
+        self.pool = config.pool
+        self.default_kwargs = config.kwargs
+        self.retry = config.retry
+        self.body: BodyConfig = config.body
+        self.limiter = get_limiter(config)
+        self.cassette: Optional[Cassette] = None
+        # headers of authenticated requests, merged with the headers of each request
+        self.headers: Dict = dict()
+        if config.auth_header is not None:
+            self.headers.update(config.auth_header.auth_header.model_dump())
+        # sessions have to be created within a running event loop
+        self.session: Optional['aiohttp.ClientSession'] = None
+        self.unauthenticated_session: Optional['aiohttp.ClientSession'] = None
+
+    @staticmethod
+    def _translate_kwargs(kwargs: Dict) -> Dict:
+        """Translates `requests` request kwargs into their `aiohttp` equivalent."""
+        kwargs.pop('stream', None)
+        if 'timeout' in kwargs and not isinstance(kwargs['timeout'], aiohttp.ClientTimeout):
+            kwargs['timeout'] = aiohttp.ClientTimeout(total=kwargs['timeout'])
+        if 'verify' in kwargs:
+            kwargs['ssl'] = None if kwargs.pop('verify') else False
+        return kwargs
+
+    @staticmethod
+    async def _to_response(rsp: 'aiohttp.ClientResponse', body: Optional[BodyConfig] = None) -> Response:
+        response = Response()
+        response.status_code = rsp.status
+        response.reason = rsp.reason
+        response.url = str(rsp.url)
+        response.headers = CaseInsensitiveDict(rsp.headers)
+        if body is not None and body.streamed:
+            response.encoding = get_encoding_from_headers(response.headers)
+            await read_body_async(response, rsp.content.iter_chunked(CHUNK_SIZE), body)
+        else:
+            response._content = await rsp.read()
+            response.encoding = rsp.get_encoding() if response._content else None
+
+        jar = RequestsCookieJar()
+        for morsel in rsp.cookies.values():
+            cookie = morsel_to_cookie(morsel)
+            if not cookie.domain:
+                cookie.domain = urlparse(response.url).hostname
+            jar.set_cookie(cookie)
+        response.cookies = jar
+        return response
+
+    @staticmethod
+    def _trace_config() -> 'aiohttp.TraceConfig':
+        """Measures the connection setup of each request in its `trace_request_ctx`."""
+        async def on_connection_create_start(session, context, params) -> None:
+            context.trace_request_ctx.connect_start = time.perf_counter()
+
+        async def on_connection_create_end(session, context, params) -> None:
+            timing = context.trace_request_ctx
+            timing.connect += time.perf_counter() - timing.connect_start
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_start.append(on_connection_create_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        return trace_config
+
+    def _connector(self) -> 'aiohttp.TCPConnector':
+        # pool sizes apply to the sync engine, aiohttp limits the number of open connections instead
+        return aiohttp.TCPConnector(force_close=not self.pool.keep_alive)
+
+    def _get_session(self, requires_auth: bool) -> 'aiohttp.ClientSession':
+        if requires_auth:
+            if self.session is None:
+                self.session = aiohttp.ClientSession(connector=self._connector(), trace_configs=[self._trace_config()])
+            return self.session
+        if self.unauthenticated_session is None:
+            # behave like a fresh session for each request, without storing received cookies
+            self.unauthenticated_session = aiohttp.ClientSession(
+                connector=self._connector(), cookie_jar=aiohttp.DummyCookieJar(), trace_configs=[self._trace_config()]
+            )
+        return self.unauthenticated_session
+
+    async def _request(self, method: str, path: str, requires_auth: bool = True, **kwargs) -> Response:
+        url, kwargs = self._build_url(path), self._enhance_kwargs(kwargs)
+        headers = kwargs.pop('headers', None)
+        if requires_auth and self.headers:
+            headers = {**self.headers, **headers} if headers else self.headers
+        key = request_key(method, url, kwargs) if self.cassette is not None else None
+        if self.cassette is not None and self.cassette.replaying:
+            return self.cassette.play(key)
+
+        kwargs = self._translate_kwargs(kwargs)
+        session = self._get_session(requires_auth)
+        async with self.limiter.limit_async() if self.limiter is not None else nullcontext():
+            timing = SimpleNamespace(connect=0.)
+            start = time.perf_counter()
+            async with session.request(method.upper(), url, headers=headers,
+                                       trace_request_ctx=timing, **kwargs) as rsp:
+                headers_received = time.perf_counter() - start
+                response = await self._to_response(rsp, self.body)
+            total = time.perf_counter() - start
+        response.timings = RequestTimings(
+            connect=timing.connect, ttfb=max(0., headers_received - timing.connect),
+            download=total - max(headers_received, timing.connect), total=total
+        )
+        if self.cassette is not None:
+            self.cassette.record(key, response)
+        return response
+
+    async def close(self) -> None:
+        for session in (self.session, self.unauthenticated_session):
+            if session is not None:
+                await session.close()
+        self.session = None
+        self.unauthenticated_session = None
@@ -0,0 +1,135 @@
+import mmap
+import tempfile
+from typing import AsyncIterable, BinaryIO, Iterable, List, Mapping, Optional, Union
+
+from requests import RequestException, Response
+
+from .config import BodyConfig
+
+CHUNK_SIZE = 64 * 1024
+# leading bytes of a spilled body inspected to tell JSON apart from other bodies
+JSON_SNIFF_BYTES = 1024
+
+
+class BodyTooLarge(RequestException):
+    """The response body exceeds `max_body_bytes`."""
+
+
+class SpilledBody(mmap.mmap):
+    """
+    Response body spilled to an anonymous temporary file, mapped read-only into memory.
+
+    Membership tests of strings and integers search the mapped bytes, e.g. `'foo' in body`,
+    without creating a Python string of the body. The file is removed once the body is closed.
+    """
+    def __new__(cls, file: BinaryIO, size: int, encoding: Optional[str] = None) -> 'SpilledBody':
+        body = super().__new__(cls, file.fileno(), size, access=mmap.ACCESS_READ)
+        body.file = file
+        body.size = size
+        body.encoding = encoding or 'utf-8'
+        return body
+
+    def __contains__(self, value: Union[str, int, bytes]) -> bool:
+        if not isinstance(value, bytes):
+            value = str(value).encode(self.encoding)
+        return self.find(value) != -1
+
+    def is_json(self, headers: Mapping[str, str]) -> bool:
+        """Whether the body is JSON according to the Content-Type `headers` or its first non-blank byte."""
+        if 'json' in headers.get('Content-Type', '').lower():
+            return True
+        start = self[:JSON_SNIFF_BYTES].lstrip()
+        return start[:1] in (b'{', b'[', b'"')
+
+    def decode(self, encoding: str = 'utf-8', errors: str = 'strict') -> str:
+        return self[:].decode(encoding, errors)
+
+    def close(self) -> None:
+        super().close()
+        self.file.close()
+
+    def __repr__(self) -> str:
+        return f'<response body of {self.size} bytes>'
+
+    __str__ = __repr__
+
+
+class BodyReader:
+    """
+    Collects the chunks of a streamed body, in memory up to `spill_threshold` bytes and in a temporary file beyond.
+    Raises `BodyTooLarge` as soon as more than `max_body_bytes` were received.
+    """
+    def __init__(self, config: BodyConfig, encoding: Optional[str] = None) -> None:
+        self.config: BodyConfig = config
+        self.encoding: Optional[str] = encoding
+        self.size: int = 0
+        self.chunks: List[bytes] = list()
+        self.file: Optional[BinaryIO] = None
+
+    def check_length(self, content_length: Optional[Union[str, int]]) -> None:
+        """Rejects bodies announcing more than `max_body_bytes` before reading them."""
+        if content_length is not None and str(content_length).isdigit():
+            self._check_size(int(content_length))
+
+    def _check_size(self, size: int) -> None:
+        if self.config.max_body_bytes is not None and size > self.config.max_body_bytes:
+            self.discard()
+            raise BodyTooLarge(f'Response body exceeds max_body_bytes of {self.config.max_body_bytes} bytes.')
+
+    def feed(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        self._check_size(self.size)
+        if self.file is not None:
+            self.file.write(chunk)
+            return
+        self.chunks.append(chunk)
+        if self.config.spill_threshold is not None and self.size > self.config.spill_threshold:
+            self.file = tempfile.TemporaryFile(dir=self.config.spill_dir)
+            self.file.writelines(self.chunks)
+            self.chunks = list()
+
+    def finish(self) -> Union[bytes, SpilledBody]:
+        if self.file is None:
+            return b''.join(self.chunks)
+        self.file.flush()
+        return SpilledBody(self.file, self.size, self.encoding)
+
+    def discard(self) -> None:
+        self.chunks = list()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def _reader(rsp: Response, config: BodyConfig) -> BodyReader:
+    reader = BodyReader(config, encoding=rsp.encoding)
+    reader.check_length(rsp.headers.get('Content-Length'))
+    return reader
+
+
+def read_body(rsp: Response, config: BodyConfig) -> None:
+    """Reads the body of the streamed response `rsp` according to `config` and releases its connection."""
+    try:
+        reader = _reader(rsp, config)
+        chunks: Iterable[bytes] = rsp.iter_content(CHUNK_SIZE)
+        try:
+            for chunk in chunks:
+                reader.feed(chunk)
+        except BaseException:
+            reader.discard()
+            raise
+    finally:
+        rsp.close()
+    rsp._content = reader.finish()
+
+
+async def read_body_async(rsp: Response, chunks: AsyncIterable[bytes], config: BodyConfig) -> None:
+    """Asynchronous equivalent of `read_body`, reading the `chunks` of the already converted response `rsp`."""
+    reader = _reader(rsp, config)
+    try:
+        async for chunk in chunks:
+            reader.feed(chunk)
+    except BaseException:
+        reader.discard()
+        raise
+    rsp._content = reader.finish()
@@ -0,0 +1,62 @@
+import hashlib
+import os
+import tempfile
+from typing import Optional
+
+import pydantic
+import yaml
+
+from . import __version__
+from .config import TestCaseConfig
+
+
+class ConfigCache:
+    """
+    On-disk cache of validated `TestCaseConfig`s.
+
+    Entries are stored as JSON and keyed by the content hash of the test file and the chain-smoker and
+    pydantic versions, so changed files and new releases never load stale configurations.
+    """
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(content: bytes) -> str:
+        versions = f'{__version__}\0{pydantic.VERSION}\0'.encode()
+        return hashlib.sha256(versions + content).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}.json')
+
+    def get(self, key: str) -> Optional[TestCaseConfig]:
+        # validating the entry also validates environment variables, which are runtime state
+        try:
+            with open(self._path(key), 'rb') as stream:
+                return TestCaseConfig.model_validate_json(stream.read())
+        except Exception:
+            # unreadable, corrupt and invalid entries are parsed again like missing ones
+            return None
+
+    def set(self, key: str, config: TestCaseConfig) -> None:
+        # write to a temporary file first, concurrent readers never see partial entries
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as stream:
+                stream.write(config.model_dump_json())
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def load(self, filename: str) -> TestCaseConfig:
+        """Loads the configuration of `filename`, parsing and validating the file only on a cache miss."""
+        with open(filename, 'rb') as stream:
+            content = stream.read()
+
+        key = self.key(content)
+        config = self.get(key)
+        if config is None:
+            config = TestCaseConfig.from_dict(next(yaml.full_load_all(content)))
+            self.set(key, config)
+        return config
@@ -0,0 +1,149 @@
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from enum import Enum
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
+
+from pydantic import BaseModel, Field, PrivateAttr
+from requests import Response
+from requests.cookies import RequestsCookieJar
+from requests.structures import CaseInsensitiveDict
+
+from .results import RequestTimings
+
+
+class CassetteMode(str, Enum):
+    RECORD = 'record'
+    REPLAY = 'replay'
+
+
+def cassette_path(filename: str) -> str:
+    """Path of the cassette belonging to the test file `filename`, stored next to it."""
+    return os.path.splitext(filename)[0] + '.cassette.json'
+
+
+def request_key(method: str, url: str, kwargs: Dict) -> str:
+    """
+    Lookup key of a request, made of its method, its URL including the query parameters and the hash of its body.
+    Bodies are serialized before hashing, so multipart boundaries and key order don't change the key.
+    """
+    params = kwargs.get('params')
+    if params:
+        url += ('&' if '?' in url else '?') + (params if isinstance(params, str) else urlencode(params, doseq=True))
+    key = f'{method.upper()} {url}'
+
+    body = kwargs.get('json', kwargs.get('data'))
+    if body is None:
+        return key
+    if isinstance(body, str):
+        body = body.encode()
+    elif not isinstance(body, bytes):
+        body = json.dumps(body, sort_keys=True, separators=(',', ':'), default=str).encode()
+    return f'{key} {hashlib.sha256(body).hexdigest()[:16]}'
+
+
+class RecordedCookie(BaseModel):
+    name: str = Field(..., description='Name of the cookie')
+    value: Optional[str] = Field(None, description='Value of the cookie')
+    domain: str = Field('', description='Domain of the cookie')
+    path: str = Field('/', description='Path of the cookie')
+    expires: Optional[int] = Field(None, description='Expiration as UNIX timestamp, `None` for session cookies')
+    secure: bool = Field(False, description='Whether the cookie is restricted to HTTPS')
+
+
+class Interaction(BaseModel):
+    """A recorded response."""
+    status_code: int = Field(..., description='Status code of the response')
+    reason: str = Field('', description='Reason phrase of the response')
+    url: str = Field(..., description='Final URL of the response')
+    headers: Dict[str, str] = Field({}, description='Headers of the response')
+    body: str = Field('', description='Body of the response, base64 encoded in case it is not valid UTF-8')
+    base64: bool = Field(False, description='Whether `body` is base64 encoded')
+    encoding: Optional[str] = Field(None, description='Encoding used to decode the text of the response')
+    cookies: List[RecordedCookie] = Field([], description='Cookies set by the response')
+
+    @classmethod
+    def from_response(cls, rsp: Response) -> 'Interaction':
+        content = rsp.content or b''
+        try:
+            body, is_base64 = content.decode(), False
+        except UnicodeDecodeError:
+            body, is_base64 = base64.b64encode(content).decode(), True
+        return cls(
+            status_code=rsp.status_code, reason=rsp.reason or '', url=rsp.url or '', headers=dict(rsp.headers),
+            body=body, base64=is_base64, encoding=rsp.encoding,
+            cookies=[
+                RecordedCookie(name=cookie.name, value=cookie.value, domain=cookie.domain, path=cookie.path,
+                               expires=cookie.expires, secure=cookie.secure)
+                for cookie in rsp.cookies
+            ]
+        )
+
+    def to_response(self) -> Response:
+        response = Response()
+        response.status_code = self.status_code
+        response.reason = self.reason
+        response.url = self.url
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = base64.b64decode(self.body) if self.base64 else self.body.encode()
+        response.encoding = self.encoding
+        jar = RequestsCookieJar()
+        for cookie in self.cookies:
+            jar.set(cookie.name, cookie.value, domain=cookie.domain, path=cookie.path, expires=cookie.expires,
+                    secure=cookie.secure)
+        response.cookies = jar
+        response.timings = RequestTimings()
+        return response
+
+
+class Cassette(BaseModel):
+    """
+    Recorded responses of a test file, looked up by `request_key`.
+
+    Repeated requests, e.g. retries, are recorded in order and replayed in the same order,
+    once exhausted, the last response is served again.
+    """
+    interactions: Dict[str, List[Interaction]] = Field({}, description='Recorded responses by request key')
+    _mode: CassetteMode = PrivateAttr(CassetteMode.RECORD)
+    _played: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @classmethod
+    def open(cls, filename: str, mode: CassetteMode) -> 'Cassette':
+        """Creates an empty cassette to record to, or loads the cassette `filename` to replay from."""
+        if mode == CassetteMode.RECORD:
+            cassette = cls()
+        else:
+            with open(filename, 'r') as stream:
+                cassette = cls.model_validate_json(stream.read())
+        cassette._mode = mode
+        return cassette
+
+    @property
+    def replaying(self) -> bool:
+        return self._mode == CassetteMode.REPLAY
+
+    def save(self, filename: str) -> None:
+        directory = os.path.dirname(os.path.abspath(filename))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as stream:
+            stream.write(self.model_dump_json(exclude_defaults=True))
+        os.replace(tmp_path, filename)
+
+    def record(self, key: str, rsp: Response) -> None:
+        interaction = Interaction.from_response(rsp)
+        with self._lock:
+            self.interactions.setdefault(key, list()).append(interaction)
+
+    def play(self, key: str) -> Response:
+        interactions = self.interactions.get(key)
+        if not interactions:
+            raise LookupError(f'No recorded response for "{key}".')
+        with self._lock:
+            position = self._played.get(key, 0)
+            self._played[key] = position + 1
+        return interactions[min(position, len(interactions) - 1)].to_response()
@@ -1,8 +1,9 @@
 import os
+import random
 from enum import Enum
 from typing import List, Union, Dict, Optional
 
-from pydantic import BaseModel, Field, field_validator, ValidationInfo
+from pydantic import BaseModel, Field, field_validator, model_validator, ValidationInfo
 
 
 PayloadType = Union[str, Dict, int, List, bytes]
@@ -12,6 +13,16 @@ class ConfigType(str, Enum):
     API_TEST = 'api-test'
 
 
+class Engine(str, Enum):
+    SYNC = 'sync'
+    ASYNC = 'async'
+
+
+class Transport(str, Enum):
+    REQUESTS = 'requests'
+    URLLIB3 = 'urllib3'
+
+
 class AuthHeader(BaseModel):
     Authorization: str = Field(
         ..., description='"Authorization" Header value'
@@ -35,6 +46,39 @@ class Cookie(BaseModel):
     max_age: Optional[str] = Field(None, description='Expiration time of cookie, can be datetime string or "Session"')
 
 
+class RetryPolicy(BaseModel):
+    retries: int = Field(0, ge=0, description='Number of times a failing request is retried')
+    retry_on: List[Union[int, str]] = Field(
+        [502, 503, 504, 'error'],
+        description='Response status codes, status classes like "5xx" or "error" for connection errors and timeouts, '
+                    'which cause a retry'
+    )
+    backoff: float = Field(0.5, ge=0, description='Maximum delay in seconds before the first retry')
+    max_backoff: float = Field(10., ge=0, description='Upper bound of the delay between two attempts in seconds')
+
+    def override(self, retries: Optional[int] = None, retry_on: Optional[List] = None) -> 'RetryPolicy':
+        """Copy of the policy, overriding the given values."""
+        update = {'retries': retries, 'retry_on': retry_on}
+        return self.model_copy(update={key: value for key, value in update.items() if value is not None})
+
+    def retries_status(self, status_code: int) -> bool:
+        for value in self.retry_on:
+            if isinstance(value, int) and value == status_code:
+                return True
+            if isinstance(value, str) and len(value) == 3 and value[1:].lower() == 'xx' \
+                    and str(status_code)[:1] == value[0]:
+                return True
+        return False
+
+    @property
+    def retries_errors(self) -> bool:
+        return 'error' in self.retry_on
+
+    def delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter, after the `attempt`-th failed attempt."""
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+
+
 class TestConfig(BaseModel):
     name: str = Field(..., description='A verbose name for the test')
     method: str = Field('get', description='Method to use when calling endpoint')
@@ -51,6 +95,7 @@ class TestConfig(BaseModel):
 
     # output tests
     expects_status_code: Optional[int] = Field(None, description='The expected response status code')
+    max_latency_ms: Optional[float] = Field(None, gt=0, description='Maximum total duration of the request in ms')
     expected: Optional[PayloadType] = Field(
         None, description='Exact comparison values, can be Dict or Dict/JSON-string'
     )
@@ -70,6 +115,11 @@ class TestConfig(BaseModel):
         False, description='Determines if this configuration is used to perform an authentication request'
     )
     multi_step: bool = Field(False, description='Determines if test consists of single or multiple steps.')
+    tags: List[str] = Field([], description='Tags used to select tests')
+    retries: Optional[int] = Field(None, ge=0, description='Number of retries of a failing request, overrides client')
+    retry_on: Optional[List[Union[int, str]]] = Field(
+        None, description='Status codes, status classes or "error" causing a retry, overrides client'
+    )
 
     @classmethod
     def from_dict(cls, cfg: Dict) -> 'TestConfig':
@@ -100,12 +150,66 @@ class TestConfig(BaseModel):
         return field_value
 
 
+class RateLimitConfig(BaseModel):
+    requests_per_second: Optional[float] = Field(None, gt=0, description='Maximum number of requests per second')
+    burst: int = Field(1, ge=1, description='Number of requests which can be sent at once after being idle')
+    max_in_flight: Optional[int] = Field(None, ge=1, description='Maximum number of concurrent requests')
+
+
+class PoolConfig(BaseModel):
+    pool_connections: int = Field(10, ge=1, description='Number of hosts to keep connection pools for')
+    pool_maxsize: int = Field(10, ge=1, description='Maximum number of idle connections kept per host')
+    keep_alive: bool = Field(True, description='Reuse connections for subsequent requests')
+
+
+class BodyConfig(BaseModel):
+    max_body_bytes: Optional[int] = Field(
+        None, ge=0, description='Maximum size of response bodies in bytes, larger responses fail the test'
+    )
+    spill_threshold: Optional[int] = Field(
+        None, ge=0, description='Size in bytes above which bodies are kept in a memory-mapped temporary file'
+    )
+    spill_dir: Optional[str] = Field(None, description='Directory of spilled bodies [default: system temp directory]')
+
+    @property
+    def streamed(self) -> bool:
+        return self.max_body_bytes is not None or self.spill_threshold is not None
+
+
+# request kwargs supported by the `urllib3` transport
+URLLIB3_KWARGS = frozenset({
+    'params', 'data', 'json', 'headers', 'cookies', 'timeout', 'verify', 'allow_redirects', 'stream'
+})
+
+
 class ClientConfig(BaseModel):
     base_url: str = Field(..., description='Base URL for the client')
     auth_header: Optional[AuthHeaderTemplate] = Field(
         None, description='Header configuration for authentication when performing requests.'
     )
     kwargs: Optional[Dict] = Field({}, description='Default request kwargs for all tests.')
+    retry: RetryPolicy = Field(RetryPolicy(), description='Default retry policy of all tests.')
+    pool: PoolConfig = Field(PoolConfig(), description='Connection pooling of the client.')
+    transport: Transport = Field(
+        Transport.REQUESTS, description='HTTP library sending the requests of the synchronous engine.'
+    )
+    body: BodyConfig = Field(BodyConfig(), description='Size limit and buffering of response bodies.')
+    rate_limit: Optional[RateLimitConfig] = Field(
+        None, description='Limits of requests to the host of `base_url`, shared by all tests and files.'
+    )
+
+    @model_validator(mode='after')
+    def kwargs_supported_by_transport(self) -> 'ClientConfig':
+        if self.transport == Transport.URLLIB3:
+            unsupported = sorted(set(self.kwargs or {}) - URLLIB3_KWARGS)
+            if unsupported:
+                raise ValueError(f'The urllib3 transport doesn\'t support the kwargs {", ".join(unsupported)}, '
+                                 f'use the requests transport instead.')
+        return self
+
+    def with_transport(self, transport: Transport) -> 'ClientConfig':
+        """Copy using `transport`, validated like the configuration itself."""
+        return self.model_copy(update={'transport': transport}).kwargs_supported_by_transport()
 
     @classmethod
     def from_dict(cls, cfg: Dict) -> 'ClientConfig':
@@ -132,6 +236,12 @@ class EnvVar(BaseModel):
 class TestFileConfig(BaseModel):
     client: ClientConfig = Field(..., description='Configuration of the client used in each test.')
     env: Optional[List[EnvVar]] = Field(None, description='List of environment variables to use.')
+    concurrency: int = Field(
+        1, ge=1, description='Number of independent tests executed concurrently, 1 runs all tests in order.'
+    )
+    interval: Optional[float] = Field(
+        None, gt=0, description='Seconds between two runs of this file in monitor mode.'
+    )
 
     @classmethod
     def from_dict(cls, cfg: Dict) -> 'TestFileConfig':
@@ -142,7 +252,9 @@ class TestFileConfig(BaseModel):
             client=ClientConfig.from_dict(cfg.get('client', {})) if cfg else None,
             env=[EnvVar(internal_key=key, external_key=value) for key, value in cfg.get('env', {}).items()]
             if isinstance(cfg.get('env'), dict) else cfg.get('env')
-            if 'env' in cfg else []
+            if 'env' in cfg else [],
+            concurrency=cfg.get('concurrency', 1),
+            interval=cfg.get('interval')
         )
 
     @field_validator('client', mode='before')
@@ -0,0 +1,41 @@
+import os
+from fnmatch import fnmatch
+from typing import Iterable, Iterator
+
+DEFAULT_INCLUDE = ('*.yaml', '*.yml')
+
+
+def _matches(path: str, name: str, patterns: Iterable[str]) -> bool:
+    return any(fnmatch(path, pattern) or fnmatch(name, pattern) for pattern in patterns)
+
+
+def discover(directory: str, include: Iterable[str] = DEFAULT_INCLUDE, exclude: Iterable[str] = ()) -> Iterator[str]:
+    """
+    Recursively yields test files below `directory`, in sorted order per directory.
+
+    Patterns are matched against the file name and the path relative to `directory`.
+    Directories matching an `exclude` pattern are not entered.
+    Files are yielded while walking the tree, so consumers can start before the whole tree was read.
+    """
+    include, exclude = tuple(include), tuple(exclude)
+    stack = [directory]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except FileNotFoundError:
+            # removed while walking the tree
+            continue
+
+        subdirectories = []
+        for entry in entries:
+            path = os.path.relpath(entry.path, directory)
+            if _matches(path, entry.name, exclude):
+                continue
+            if entry.is_dir():
+                subdirectories.append(entry.path)
+            elif entry.is_file() and _matches(path, entry.name, include):
+                yield entry.path
+        # files of a directory come first, followed by its subdirectories in sorted order
+        stack.extend(reversed(subdirectories))
@@ -1,28 +1,60 @@
+import asyncio
 import os
-from typing import List, Optional, Dict, Any, Union
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Dict, Any, Union, Iterator, Tuple
+from urllib.parse import urlparse
 
 import yaml
 
 from .api_client import APIClient
-from .config import TestCaseConfig, ConfigType
+from .async_api_client import AsyncAPIClient
+from .cache import ConfigCache
+from .cassette import Cassette, CassetteMode, cassette_path
+from .config import TestCaseConfig, ConfigType, Engine, Transport
 from .logger import logger
 from .mixins import EvaluationMixin
+from .results import TestResult, FileResult, Status
+from .selection import TestSelector
 from .test_clients import SmokeTest, ChainedSmokeTest
+from .timings import Timings
+
+# result, raised exception and duration of a single test run
+Outcome = Tuple[Any, Optional[Exception], float]
+# receives the result of every test as soon as it finished
+ResultCallback = Callable[[TestResult], None]
 
 
 class TestFileLoader(EvaluationMixin):
-    def __init__(self, filename: Optional[str] = None, cfg: Optional[Dict] = None):
+    def __init__(self, filename: Optional[str] = None, cfg: Optional[Dict] = None,
+                 concurrency: Optional[int] = None, engine: Engine = Engine.SYNC,
+                 cache: Optional[ConfigCache] = None, selector: Optional[TestSelector] = None,
+                 timings: Optional[Timings] = None, cassette: Optional[CassetteMode] = None,
+                 transport: Optional[Transport] = None):
         if filename:
             self.filename = filename
-            content = self._load_content(filename)
+            if cache is not None:
+                config = cache.load(filename)
+            else:
+                config = TestCaseConfig.from_dict(self._load_content(filename))
         else:
             assert cfg, 'Requires `cfg` in case no `filename` provided.'
-            content = cfg
+            config = TestCaseConfig.from_dict(cfg)
 
-        self.config: TestCaseConfig = TestCaseConfig.from_dict(content)
-        self.client: Optional[APIClient] = self._get_client(self.config)
+        self.config: TestCaseConfig = config
+        self.client: Optional[APIClient] = self._get_client(self.config, engine, transport)
         self.env_vars: Dict[str, Any] = self._get_env_vars(self.config)
+        self.concurrency: int = concurrency or self.config.config.concurrency
+        self.selector: Optional[TestSelector] = selector
+        self.timings: Optional[Timings] = timings
+        self.cassette: Optional[Cassette] = None
+        if cassette is not None and self.client is not None:
+            assert filename, 'Cassettes require a `filename`.'
+            self.cassette = Cassette.open(cassette_path(filename), cassette)
+            self.client.cassette = self.cassette
         self.test_methods: List[Union[SmokeTest, ChainedSmokeTest]] = list()
+        # results of the tests finished by the current or last run, including a failure raised with `fail_fast`
+        self.results: List[TestResult] = list()
         self._build_tests()
 
     @staticmethod
@@ -32,9 +64,20 @@ class TestFileLoader(EvaluationMixin):
         return data_loaded
 
     @staticmethod
-    def _get_client(config: TestCaseConfig) -> Optional[APIClient]:
+    def _get_client(config: TestCaseConfig, engine: Engine = Engine.SYNC,
+                    transport: Optional[Transport] = None) -> Optional[APIClient]:
+        """Client of the test file, `transport` overrides the transport configured by the file."""
         if config.type == ConfigType.API_TEST:
-            return APIClient(config.config.client)
+            if engine == Engine.ASYNC:
+                return AsyncAPIClient(config.config.client)
+            client_config = config.config.client
+            if transport is not None:
+                client_config = client_config.with_transport(transport)
+            return APIClient(client_config)
+
+    @property
+    def host(self) -> Optional[str]:
+        return urlparse(self.client.base_url).netloc if self.client is not None else None
 
     @staticmethod
     def _get_env_vars(config: TestCaseConfig) -> Dict[str, Any]:
@@ -45,19 +88,156 @@ class TestFileLoader(EvaluationMixin):
 
     def _build_tests(self) -> None:
         self.test_methods = list()
+        filename = getattr(self, 'filename', None)
         for test_config in self.config.tests:
+            if self.selector is not None and not self.selector.matches_test(test_config, filename):
+                continue
             if test_config.multi_step:
                 test_case = ChainedSmokeTest.build(test_config, self.client)
             else:
                 test_case = SmokeTest.build(test_config, self.client)
             self.test_methods.append(test_case)
 
-    def run(self) -> None:
-        logger.info(f'Running for {self.filename}:')
+    @staticmethod
+    def _is_independent(test: Union[SmokeTest, ChainedSmokeTest]) -> bool:
+        # the steps of chained tests depend on each other, the client is safe to share
+        return isinstance(test, SmokeTest)
+
+    def _batches(self) -> Iterator[List[Union[SmokeTest, ChainedSmokeTest]]]:
+        """
+        Groups consecutive independent tests into batches which can be executed concurrently,
+        every other test forms a batch on its own to keep the order of execution.
+        With recorded `timings`, batches start with their longest running tests.
+        """
+        batch = list()
         for test in self.test_methods:
-            res = test.run(env=self.env_vars)
-            if res is None:
-                raise AssertionError(f'Failure for test "{test.name}".')
-            elif isinstance(test, ChainedSmokeTest) and None in res.values():
-                failed_tests = [k for k, v in res.items() if v is None]
-                raise AssertionError('Failure for tests:\n' + '\n\t'.join(failed_tests))
+            if self._is_independent(test):
+                batch.append(test)
+                continue
+            if batch:
+                yield self._longest_first(batch)
+                batch = list()
+            yield [test]
+        if batch:
+            yield self._longest_first(batch)
+
+    def _longest_first(self,
+                       batch: List[Union[SmokeTest, ChainedSmokeTest]]) -> List[Union[SmokeTest, ChainedSmokeTest]]:
+        if self.timings is None:
+            return batch
+        filename = getattr(self, 'filename', None)
+        return sorted(batch, key=lambda test: -self.timings.test_duration(filename, test.name))
+
+    @staticmethod
+    def _check_result(test: Union[SmokeTest, ChainedSmokeTest], res: Any) -> None:
+        if res is None:
+            raise AssertionError(f'Failure for test "{test.name}".')
+        elif isinstance(test, ChainedSmokeTest) and None in res.values():
+            failed_tests = [k for k, v in res.items() if v is None]
+            raise AssertionError('Failure for tests:\n' + '\n\t'.join(failed_tests))
+
+    @staticmethod
+    def _failure_message(test: Union[SmokeTest, ChainedSmokeTest], error: AssertionError) -> str:
+        if isinstance(test, ChainedSmokeTest):
+            details = [step.error for step in test.tests.values() if getattr(step, 'error', None)]
+        else:
+            details = [test.error] if getattr(test, 'error', None) else []
+        return '\n'.join([str(error), *details])
+
+    def _run_test(self, test: Union[SmokeTest, ChainedSmokeTest]) -> Outcome:
+        start = time.perf_counter()
+        try:
+            return test.run(env=self.env_vars), None, time.perf_counter() - start
+        except Exception as e:
+            return None, e, time.perf_counter() - start
+
+    async def _run_test_async(self, test: Union[SmokeTest, ChainedSmokeTest]) -> Outcome:
+        start = time.perf_counter()
+        try:
+            return await test.run_async(env=self.env_vars), None, time.perf_counter() - start
+        except Exception as e:
+            return None, e, time.perf_counter() - start
+
+    def _record(self, test: Union[SmokeTest, ChainedSmokeTest], outcome: Outcome, fail_fast: bool,
+                on_result: Optional[ResultCallback] = None) -> TestResult:
+        """
+        Turns the outcome of a test run into a `TestResult`, which is added to `results` and passed to `on_result`.
+        With `fail_fast`, failures and errors are raised afterwards.
+        """
+        res, exception, duration = outcome
+        status, error = Status.PASSED, None
+        if exception is not None:
+            status, error = Status.ERROR, f'{type(exception).__name__}: {exception}'
+        else:
+            try:
+                self._check_result(test, res)
+            except AssertionError as e:
+                exception = e
+                status, error = Status.FAILED, self._failure_message(test, e)
+        result = TestResult(name=test.name, file=getattr(self, 'filename', None), status=status,
+                            duration=duration, error=error, attempts=max(getattr(test, 'attempts', 1), 1),
+                            timings=getattr(test, 'timings', None),
+                            response_bytes=getattr(test, 'response_bytes', None))
+        self.results.append(result)
+        if on_result is not None:
+            on_result(result)
+        if fail_fast and exception is not None:
+            raise exception
+        return result
+
+    def _file_result(self, start: float) -> FileResult:
+        return FileResult(file=self.filename, host=self.host, tests=list(self.results),
+                          duration=time.perf_counter() - start)
+
+    def run(self, fail_fast: bool = True, on_result: Optional[ResultCallback] = None) -> FileResult:
+        """
+        Runs all tests of the file.
+
+        With `fail_fast` the first failing test raises an `AssertionError`, errors are raised as they are,
+        otherwise all tests are executed and failures are collected in the returned result.
+        `on_result` receives the result of every test as soon as it finished, including the failing one.
+        """
+        logger.info(f'Running for {self.filename}:')
+        start = time.perf_counter()
+        self.results = list()
+        try:
+            if self.concurrency <= 1:
+                for test in self.test_methods:
+                    self._record(test, self._run_test(test), fail_fast, on_result)
+            else:
+                with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                    for batch in self._batches():
+                        for test, outcome in zip(batch, list(executor.map(self._run_test, batch))):
+                            self._record(test, outcome, fail_fast, on_result)
+        finally:
+            self._save_cassette()
+        return self._file_result(start)
+
+    async def run_async(self, fail_fast: bool = True, on_result: Optional[ResultCallback] = None) -> FileResult:
+        """Asynchronous equivalent of `run`, requires the loader to be created using `Engine.ASYNC`."""
+        logger.info(f'Running for {self.filename}:')
+        start = time.perf_counter()
+        self.results = list()
+        semaphore = asyncio.Semaphore(max(self.concurrency, 1))
+
+        async def run_test(test: Union[SmokeTest, ChainedSmokeTest]) -> Outcome:
+            async with semaphore:
+                return await self._run_test_async(test)
+
+        try:
+            if self.concurrency <= 1:
+                for test in self.test_methods:
+                    self._record(test, await self._run_test_async(test), fail_fast, on_result)
+            else:
+                for batch in self._batches():
+                    outcomes = await asyncio.gather(*(run_test(test) for test in batch))
+                    for test, outcome in zip(batch, outcomes):
+                        self._record(test, outcome, fail_fast, on_result)
+        finally:
+            self._save_cassette()
+        return self._file_result(start)
+
+    def _save_cassette(self) -> None:
+        """Writes the recorded responses next to the test file, replayed cassettes are left untouched."""
+        if self.cassette is not None and not self.cassette.replaying:
+            self.cassette.save(cassette_path(self.filename))
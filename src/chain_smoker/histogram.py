@@ -0,0 +1,69 @@
+import math
+from typing import Dict, Optional
+
+
+class LatencyHistogram:
+    """
+    Compact HDR-style histogram of latencies.
+
+    Values are recorded in microseconds into logarithmic buckets, each split into `2 ** precision` linear
+    sub-buckets, which bounds the relative error of every reported value by `2 ** -(precision - 1)`.
+    Only non-empty buckets are stored, hence memory does not depend on the number of recorded values.
+    """
+    def __init__(self, precision: int = 7) -> None:
+        self.precision: int = precision
+        self._sub_buckets: int = 2 ** precision
+        self.counts: Dict[int, int] = dict()
+        self.count: int = 0
+        self.total: int = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def _index(self, value: int) -> int:
+        if value < self._sub_buckets:
+            return value
+        shift = value.bit_length() - self.precision
+        return self._sub_buckets + (shift - 1) * (self._sub_buckets // 2) + (value >> shift) - self._sub_buckets // 2
+
+    def _highest_value(self, index: int) -> int:
+        """Highest value stored in the bucket with the given `index`."""
+        if index < self._sub_buckets:
+            return index
+        shift, offset = divmod(index - self._sub_buckets, self._sub_buckets // 2)
+        shift += 1
+        return ((offset + self._sub_buckets // 2 + 1) << shift) - 1
+
+    def record(self, seconds: float) -> None:
+        value = max(0, round(seconds * 1e6))
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        assert other.precision == self.precision, 'Requires histograms of the same precision.'
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def percentile(self, percentile: float) -> float:
+        """Latency in seconds below or equal to which `percentile` percent of all values are."""
+        if not self.count:
+            return 0.
+        rank = max(1, math.ceil(percentile / 100 * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._highest_value(index), self.max) / 1e6
+        return self.max / 1e6
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count / 1e6 if self.count else 0.
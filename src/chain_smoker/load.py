@@ -0,0 +1,176 @@
+import itertools
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Union
+
+from pydantic import BaseModel, Field, model_validator
+
+from .cache import ConfigCache
+from .config import TestCaseConfig, Transport
+from .file_loader import TestFileLoader
+from .histogram import LatencyHistogram
+from .logger import logger
+from .rate_limit import TokenBucket
+from .selection import TestSelector
+from .test_clients import SmokeTest, ChainedSmokeTest
+
+
+class LoadConfig(BaseModel):
+    concurrency: int = Field(1, ge=1, description='Number of workers replaying the tests concurrently')
+    rate: Optional[float] = Field(None, gt=0, description='Target number of test runs per second of all workers')
+    duration: Optional[float] = Field(None, gt=0, description='Seconds to replay the tests for')
+    iterations: Optional[int] = Field(None, ge=1, description='Total number of test runs')
+    sample: float = Field(1., ge=0, le=1, description='Share of responses evaluated by the value tests')
+
+    @model_validator(mode='after')
+    def requires_limit(self) -> 'LoadConfig':
+        if self.duration is None and self.iterations is None:
+            raise ValueError('Requires duration or iterations.')
+        return self
+
+
+class LoadResult:
+    def __init__(self, name: Optional[str] = None) -> None:
+        self.name: Optional[str] = name
+        self.histogram: LatencyHistogram = LatencyHistogram()
+        self.requests: int = 0
+        # requests raising an exception
+        self.errors: int = 0
+        # evaluated responses failing a value test
+        self.failures: int = 0
+        self.evaluated: int = 0
+        self.duration: float = 0.
+
+    def merge(self, other: 'LoadResult') -> None:
+        self.histogram.merge(other.histogram)
+        self.requests += other.requests
+        self.errors += other.errors
+        self.failures += other.failures
+        self.evaluated += other.evaluated
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.duration if self.duration else 0.
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.
+
+    @property
+    def failure_rate(self) -> float:
+        return self.failures / self.evaluated if self.evaluated else 0.
+
+    def summary(self) -> str:
+        h = self.histogram
+        return f'{self.name}: {self.requests} requests in {self.duration:.2f}s ({self.throughput:.1f}/s), ' \
+               f'{self.error_rate:.2%} errors, {self.failure_rate:.2%} of {self.evaluated} evaluated failed, ' \
+               f'latency p50 {h.percentile(50) * 1e3:.1f}ms p90 {h.percentile(90) * 1e3:.1f}ms ' \
+               f'p99 {h.percentile(99) * 1e3:.1f}ms max {h.percentile(100) * 1e3:.1f}ms'
+
+
+class LoadTest:
+    """
+    Replays the tests of a test file to check the capacity of the tested API.
+
+    Each worker owns a client and its own test instances, only the connection pools of the process are shared.
+    Workers run the tests of the file in order until `duration` passed or `iterations` tests ran,
+    optionally throttled to `rate` test runs per second in total.
+    Latencies only cover the requests, value tests are evaluated on a `sample` of the responses.
+    Chained tests always run all steps and are measured as a whole.
+    """
+    def __init__(self, config: TestCaseConfig, load: LoadConfig, name: Optional[str] = None,
+                 selector: Optional[TestSelector] = None, clock: Callable[[], float] = time.perf_counter,
+                 transport: Optional[Transport] = None) -> None:
+        if load.concurrency > config.config.client.pool.pool_maxsize:
+            # the clients of all workers share the connection pools, each worker keeps a connection alive
+            config = config.model_copy(deep=True)
+            config.config.client.pool.pool_maxsize = load.concurrency
+        self.config: TestCaseConfig = config
+        self.load: LoadConfig = load
+        self.name: Optional[str] = name
+        self.selector: Optional[TestSelector] = selector
+        self.transport: Optional[Transport] = transport
+        self.env_vars = TestFileLoader._get_env_vars(config)
+        self._clock = clock
+        self._counter = itertools.count()
+        self._bucket: Optional[TokenBucket] = TokenBucket(load.rate) if load.rate else None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, filename: str, load: LoadConfig, cache: Optional[ConfigCache] = None,
+                  selector: Optional[TestSelector] = None, transport: Optional[Transport] = None) -> 'LoadTest':
+        config = cache.load(filename) if cache is not None else TestCaseConfig.from_dict(
+            TestFileLoader._load_content(filename)
+        )
+        return cls(config, load, name=filename, selector=selector, transport=transport)
+
+    def _build_tests(self) -> List[Union[SmokeTest, ChainedSmokeTest]]:
+        client = TestFileLoader._get_client(self.config, transport=self.transport)
+        return [
+            ChainedSmokeTest.build(test, client) if test.multi_step else SmokeTest.build(test, client)
+            for test in self.config.tests
+            if self.selector is None or self.selector.matches_test(test, self.name)
+        ]
+
+    def _next(self, deadline: Optional[float]) -> bool:
+        """Claims the next test run, `False` once the load test is over."""
+        if self.load.iterations is not None:
+            with self._lock:
+                if next(self._counter) >= self.load.iterations:
+                    return False
+        if self._bucket is not None:
+            time.sleep(self._bucket.reserve())
+        return deadline is None or self._clock() < deadline
+
+    def _run_test(self, test: Union[SmokeTest, ChainedSmokeTest], result: LoadResult) -> None:
+        evaluate = isinstance(test, ChainedSmokeTest) or random.random() < self.load.sample
+        start = self._clock()
+        try:
+            if isinstance(test, ChainedSmokeTest):
+                values = test.run(env=self.env_vars)
+                passed = None not in values.values()
+            else:
+                response = test._request(env=self.env_vars)
+        except Exception as e:
+            result.histogram.record(self._clock() - start)
+            result.requests += 1
+            result.errors += 1
+            logger.debug(f'Error in {test.name}: {e}')
+            return
+        result.histogram.record(self._clock() - start)
+        result.requests += 1
+        if not evaluate:
+            return
+        if not isinstance(test, ChainedSmokeTest):
+            passed = test._evaluate(response) is not None
+        result.evaluated += 1
+        result.failures += not passed
+
+    def _work(self, deadline: Optional[float]) -> LoadResult:
+        result = LoadResult()
+        tests = self._build_tests()
+        for test in itertools.cycle(tests):
+            if not self._next(deadline):
+                break
+            self._run_test(test, result)
+        return result
+
+    def run(self) -> LoadResult:
+        logger.info(f'Load testing {self.name} with {self.load.concurrency} worker(s).')
+        start = self._clock()
+        deadline = start + self.load.duration if self.load.duration is not None else None
+        result = LoadResult(self.name)
+        # silence the success messages of every single test run
+        level = logger.level
+        logger.setLevel(max(level, logging.WARNING))
+        try:
+            with ThreadPoolExecutor(max_workers=self.load.concurrency) as executor:
+                for worker_result in executor.map(self._work, [deadline] * self.load.concurrency):
+                    result.merge(worker_result)
+        finally:
+            logger.setLevel(level)
+        result.duration = self._clock() - start
+        return result
@@ -1,5 +1,10 @@
+import atexit
 import logging
+import os
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Optional, Sequence
 
 
 class CustomFormatter(logging.Formatter):
@@ -10,29 +15,110 @@ class CustomFormatter(logging.Formatter):
     green = '\x1b[1;32m'
     bold_red = '\x1b[31;1m'
     reset = '\x1b[0m'
-    format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s (%(filename)s:%(lineno)d)'
+    fmt = '%(asctime)s - %(name)s - %(levelname)s - %(message)s (%(filename)s:%(lineno)d)'
 
     FORMATS = {
-        logging.DEBUG: grey + format + reset,
-        logging.INFO: green + format + reset,
-        logging.WARNING: yellow + format + reset,
-        logging.ERROR: red + format + reset,
-        logging.CRITICAL: bold_red + format + reset
+        logging.DEBUG: grey + fmt + reset,
+        logging.INFO: green + fmt + reset,
+        logging.WARNING: yellow + fmt + reset,
+        logging.ERROR: red + fmt + reset,
+        logging.CRITICAL: bold_red + fmt + reset
     }
 
+    def __init__(self, colors: bool = True) -> None:
+        super().__init__(self.fmt)
+        # formatters are created once per level instead of once per record
+        self.formatters = {
+            level: logging.Formatter(fmt if colors else self.fmt) for level, fmt in self.FORMATS.items()
+        }
+
     def format(self, record):
-        log_fmt = self.FORMATS.get(record.levelno)
-        formatter = logging.Formatter(log_fmt)
-        return formatter.format(record)
+        formatter = self.formatters.get(record.levelno)
+        return formatter.format(record) if formatter is not None else super().format(record)
+
+
+# sinks writing to the terminal, every other sink is a file path
+STREAMS = {'stdout': lambda: sys.stdout, 'stderr': lambda: sys.stderr}
+
+
+def create_handler(sink: str) -> logging.Handler:
+    """Handler of a single sink, `stdout`, `stderr` or the path of a file to append to."""
+    if sink in STREAMS:
+        handler = logging.StreamHandler(stream=STREAMS[sink]())
+        handler.setFormatter(CustomFormatter())
+    else:
+        handler = logging.FileHandler(filename=sink, delay=True)
+        handler.setFormatter(CustomFormatter(colors=False))
+    return handler
+
+
+class LogQueue:
+    """
+    Sends all records of the logger through a queue to the handlers of the sinks.
+
+    Logging threads only put records into the queue, a background listener formats and writes them,
+    hence slow terminals or disks never block test execution. Pending records are written by `stop_logging`,
+    which runs at exit. Forked processes start a listener of their own, as threads don't survive a fork.
+    """
+    def __init__(self, handlers: List[logging.Handler]) -> None:
+        self.handlers: List[logging.Handler] = handlers
+        self.queue_handler = QueueHandler(queue.SimpleQueue())
+        self.listener: Optional[QueueListener] = None
+
+    def start(self) -> None:
+        self.listener = QueueListener(self.queue_handler.queue, *self.handlers, respect_handler_level=True)
+        self.listener.start()
+
+    def stop(self) -> None:
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+        for handler in self.handlers:
+            handler.close()
 
+    def _after_fork(self) -> None:
+        # the listener thread of the parent doesn't exist in the child, records would be queued forever
+        self.queue_handler.queue = queue.SimpleQueue()
+        self.listener = None
+        self.start()
 
-file_handler = logging.FileHandler(filename='tmp.log')
-stdout_handler = logging.StreamHandler(stream=sys.stdout)
-stdout_handler.setFormatter(CustomFormatter())
-handlers = [file_handler, stdout_handler]
 
-logging.basicConfig(
-    level=logging.INFO,
-    handlers=handlers
-)
 logger = logging.getLogger('SMOKE_TESTER')
+logger.setLevel(logging.INFO)
+# until logging is configured, records are written to stdout synchronously, importing doesn't create any file
+_default_handler = create_handler('stdout')
+logger.addHandler(_default_handler)
+_log_queue: Optional[LogQueue] = None
+
+
+def _after_fork() -> None:
+    if _log_queue is not None:
+        _log_queue._after_fork()
+
+
+os.register_at_fork(after_in_child=_after_fork)
+
+
+def configure_logging(sinks: Sequence[str] = ('stdout', ), level: int = logging.INFO) -> LogQueue:
+    """
+    Routes the records of the logger through a `LogQueue` to the given sinks, replacing any previous configuration.
+    Sinks are `stdout`, `stderr` or file paths, an empty sequence disables logging.
+    """
+    global _log_queue
+    if _log_queue is not None:
+        logger.removeHandler(_log_queue.queue_handler)
+        _log_queue.stop()
+    logger.removeHandler(_default_handler)
+
+    _log_queue = LogQueue([create_handler(sink) for sink in sinks])
+    _log_queue.start()
+    logger.addHandler(_log_queue.queue_handler)
+    logger.setLevel(level)
+    return _log_queue
+
+
+@atexit.register
+def stop_logging() -> None:
+    """Writes all pending records and stops the listener, records logged afterwards are dropped."""
+    if _log_queue is not None:
+        _log_queue.stop()
@@ -0,0 +1,195 @@
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from .results import FileResult
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+DURATION_BUCKETS = (.005, .01, .025, .05, .1, .25, .5, 1., 2.5, 5., 10.)
+SIZE_BUCKETS = (128, 512, 2048, 8192, 32768, 131072, 524288, 2097152)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: Labels, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Metric:
+    """Counter or gauge, holding a value per combination of label values."""
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...], kind: str = 'counter') -> None:
+        self.name: str = name
+        self.documentation: str = documentation
+        self.label_names: Tuple[str, ...] = labels
+        self.kind: str = kind
+        self.values: Dict[Labels, float] = dict()
+        # rendered sample names by label values, label sets repeat across exports
+        self._names: Dict[Labels, str] = dict()
+
+    def inc(self, labels: Labels, value: float = 1.) -> None:
+        self.values[labels] = self.values.get(labels, 0.) + value
+
+    def set(self, labels: Labels, value: float) -> None:
+        self.values[labels] = value
+
+    def samples(self) -> List[str]:
+        out = list()
+        for labels, value in self.values.items():
+            name = self._names.get(labels)
+            if name is None:
+                name = self._names[labels] = self.name + _labels(self.label_names, labels)
+            out.append(f'{name} {_number(value)}')
+        return out
+
+
+class Histogram:
+    """Cumulative histogram in the Prometheus format, counts are stored per bucket and accumulated on export."""
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...], buckets: Tuple[float, ...]) -> None:
+        self.name: str = name
+        self.documentation: str = documentation
+        self.label_names: Tuple[str, ...] = labels
+        self.buckets: Tuple[float, ...] = buckets
+        # per label values: counts of each bucket, with a trailing +Inf bucket, and the sum of all values
+        self.values: Dict[Labels, Tuple[List[int], List[float]]] = dict()
+        self._names: Dict[Labels, Tuple[List[str], str, str]] = dict()
+
+    def observe(self, labels: Labels, value: float) -> None:
+        entry = self.values.get(labels)
+        if entry is None:
+            entry = self.values[labels] = ([0] * (len(self.buckets) + 1), [0.])
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1][0] += value
+
+    def samples(self) -> List[str]:
+        out = list()
+        for labels, (counts, total) in self.values.items():
+            names = self._names.get(labels)
+            if names is None:
+                names = self._names[labels] = self._render(labels)
+            buckets, sum_name, count_name = names
+            cumulative = 0
+            for name, count in zip(buckets, counts):
+                cumulative += count
+                out.append(f'{name} {cumulative}')
+            out.append(f'{sum_name} {_number(total[0])}')
+            out.append(f'{count_name} {cumulative}')
+        return out
+
+    def _render(self, labels: Labels) -> Tuple[List[str], str, str]:
+        bounds = [_number(bound) for bound in self.buckets] + ['+Inf']
+        label_string = _labels(self.label_names, labels)
+        return (
+            [f'{self.name}_bucket' + _labels(self.label_names, labels, 'le="' + bound + '"') for bound in bounds],
+            f'{self.name}_sum{label_string}', f'{self.name}_count{label_string}'
+        )
+
+
+class Metrics:
+    """
+    Registry of the metrics of test runs, exported in the Prometheus text format.
+
+    Results are observed once per file run, each test costs a few dictionary updates.
+    Export is thread-safe and can be served over HTTP using `serve_metrics` or written
+    to a file for the textfile collector of the node exporter using `write`.
+    """
+    def __init__(self, textfile: Optional[str] = None) -> None:
+        self.textfile: Optional[str] = textfile
+        self._lock = threading.Lock()
+        self.tests = Metric('chain_smoker_tests_total', 'Test runs by outcome.', ('file', 'test', 'host', 'status'))
+        self.files = Metric('chain_smoker_files_total', 'Test file runs by outcome.', ('file', 'host', 'status'))
+        self.retries = Metric('chain_smoker_retries_total', 'Retried requests.', ('file', 'test', 'host'))
+        self.last_run = Metric('chain_smoker_last_run_timestamp_seconds', 'End of the last run of a test file.',
+                               ('file', 'host'), kind='gauge')
+        self.latency = Histogram('chain_smoker_request_duration_seconds', 'Duration of the requests of a test.',
+                                 ('file', 'test', 'host'), DURATION_BUCKETS)
+        self.response_size = Histogram('chain_smoker_response_size_bytes', 'Size of the response bodies of a test.',
+                                       ('file', 'test', 'host'), SIZE_BUCKETS)
+
+    def observe(self, result: FileResult) -> None:
+        file, host = result.file or '', result.host or ''
+        status = 'error' if result.error is not None else 'passed' if result.passed else 'failed'
+        with self._lock:
+            self.files.inc((file, host, status))
+            self.last_run.set((file, host), time.time())
+            for test in result.tests:
+                labels = (file, test.name, host)
+                self.tests.inc((*labels, test.status.value))
+                if test.attempts > 1:
+                    self.retries.inc(labels, test.attempts - 1)
+                if test.timings is not None:
+                    self.latency.observe(labels, test.timings.total)
+                if test.response_bytes is not None:
+                    self.response_size.observe(labels, test.response_bytes)
+
+    def export(self) -> str:
+        lines = list()
+        with self._lock:
+            for metric in (self.tests, self.files, self.retries, self.last_run, self.latency, self.response_size):
+                lines.append(f'# HELP {metric.name} {metric.documentation}')
+                lines.append(f'# TYPE {metric.name} {metric.kind}')
+                lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+    def write(self, filename: Optional[str] = None) -> None:
+        """Writes all metrics to `filename`, defaulting to `textfile`, replacing the file atomically."""
+        filename = filename or self.textfile
+        if filename is None:
+            return
+        directory = os.path.dirname(os.path.abspath(filename))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as stream:
+            stream.write(self.export())
+        # the collector usually runs as a different user
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, filename)
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    server: 'MetricsServer'
+
+    def do_GET(self) -> None:
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = self.server.metrics.export().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        # scrapes aren't worth a log line
+        pass
+
+
+class MetricsServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], metrics: Metrics) -> None:
+        super().__init__(address, MetricsHandler)
+        self.metrics: Metrics = metrics
+
+
+def serve_metrics(metrics: Metrics, port: int, host: str = '') -> MetricsServer:
+    """Serves `metrics` on `/metrics` from a background thread."""
+    server = MetricsServer((host, port), metrics)
+    threading.Thread(target=server.serve_forever, name='metrics', daemon=True).start()
+    return server
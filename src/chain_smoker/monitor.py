@@ -0,0 +1,99 @@
+import heapq
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .file_loader import TestFileLoader
+from .logger import logger
+from .metrics import Metrics
+from .results import FileResult, log_failures
+
+
+class Monitor:
+    """
+    Long-running scheduler, re-running test files on their own interval.
+
+    Loaders are created once and kept alive between runs, hence configurations are parsed
+    a single time and client sessions keep their connections open.
+    Runs are scheduled on absolute deadlines, so slow runs don't make the schedule drift.
+    A run that is still in progress when it is due again skips that slot.
+    With `metrics`, the result of every run is observed and the metrics are written to their textfile, if any.
+    """
+    def __init__(self, loaders: Iterable[TestFileLoader], default_interval: float = 60., workers: int = 1,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep,
+                 metrics: Optional[Metrics] = None) -> None:
+        self.default_interval: float = default_interval
+        self.workers: int = workers
+        self.metrics: Optional[Metrics] = metrics
+        self._clock = clock
+        self._sleep = sleep
+        self._counter = itertools.count()
+        self._running: Dict[int, Future] = dict()
+        self._executor: Optional[ThreadPoolExecutor] = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+
+        now = self._clock()
+        self._queue: List[Tuple[float, int, TestFileLoader]] = [
+            (now, next(self._counter), loader) for loader in loaders
+        ]
+        heapq.heapify(self._queue)
+
+    def interval(self, loader: TestFileLoader) -> float:
+        return loader.config.config.interval or self.default_interval
+
+    @staticmethod
+    def run_loader(loader: TestFileLoader, metrics: Optional[Metrics] = None) -> bool:
+        """Runs all tests of a single loader, failures are logged instead of stopping the monitor."""
+        try:
+            result = loader.run(fail_fast=False)
+        except Exception as e:
+            logger.exception(f'Error running {loader.filename}: {e}')
+            result = FileResult(file=loader.filename, host=loader.host, error=f'{type(e).__name__}: {e}')
+        else:
+            log_failures(result)
+        if metrics is not None:
+            metrics.observe(result)
+            metrics.write()
+        return result.passed
+
+    def _submit(self, loader: TestFileLoader) -> None:
+        if self._executor is None:
+            self.run_loader(loader, self.metrics)
+            return
+
+        key = id(loader)
+        if key in self._running and not self._running[key].done():
+            logger.warning(f'Skipping run of {loader.filename}, previous run still in progress.')
+            return
+        self._running[key] = self._executor.submit(self.run_loader, loader, self.metrics)
+
+    def run_pending(self) -> float:
+        """
+        Runs all due loaders and reschedules them.
+
+        Returns the number of seconds until the next loader is due.
+        """
+        while self._queue and self._queue[0][0] <= self._clock():
+            deadline, _, loader = heapq.heappop(self._queue)
+            self._submit(loader)
+
+            interval = self.interval(loader)
+            next_deadline = deadline + interval
+            now = self._clock()
+            if next_deadline <= now:
+                missed = int((now - next_deadline) // interval) + 1
+                logger.warning(f'{loader.filename} is behind schedule, skipping {missed} run(s).')
+                next_deadline += missed * interval
+            heapq.heappush(self._queue, (next_deadline, next(self._counter), loader))
+
+        if not self._queue:
+            return self.default_interval
+        return max(0., self._queue[0][0] - self._clock())
+
+    def run_forever(self) -> None:
+        try:
+            while True:
+                self._sleep(self.run_pending())
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
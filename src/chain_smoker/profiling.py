@@ -0,0 +1,90 @@
+import cProfile
+import os
+import pstats
+import re
+import time
+import tracemalloc
+from typing import Callable, List, Optional
+
+from pydantic import BaseModel, Field
+
+from .logger import logger
+from .results import FileResult, FileProfile
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# functions whose cumulative CPU time is reported separately, by (module, function name)
+BREAKDOWN = {
+    'load': ('file_loader.py', '__init__'),
+    'requests': ('api_client.py', '_request'),
+    'value tests': ('test_methods.py', 'test'),
+}
+
+
+class ProfileConfig(BaseModel):
+    directory: Optional[str] = Field(None, description='Directory to dump the cProfile stats of each file to')
+    trace_malloc: int = Field(0, ge=0, description='Number of top allocations to report per file, 0 disables it')
+
+
+def _stats_path(directory: str, filename: str) -> str:
+    return os.path.join(directory, re.sub(r'[^\w.-]+', '_', os.path.normpath(filename)).strip('_') + '.pstats')
+
+
+def _analyze(profiler: cProfile.Profile, profile: FileProfile) -> None:
+    stats = pstats.Stats(profiler)
+    profile.package_cpu = sum(
+        stat[2] for (filename, _, _), stat in stats.stats.items()
+        if os.path.abspath(filename).startswith(PACKAGE_DIR + os.sep)
+    )
+    for label, (module, function) in BREAKDOWN.items():
+        profile.breakdown[label] = sum(
+            stat[3] for (filename, _, name), stat in stats.stats.items()
+            if name == function and os.path.abspath(filename) == os.path.join(PACKAGE_DIR, module)
+        )
+
+
+def profile_file(filename: str, config: ProfileConfig, run: Callable[[], FileResult]) -> FileResult:
+    """
+    Executes `run` profiling the current thread, attaching the `FileProfile` to the returned result.
+
+    Functions are profiled by CPU time, so blocking network I/O does not show up in the stats,
+    it is reported as the difference of wall-clock and CPU time instead.
+    """
+    profile = FileProfile()
+    profiler = cProfile.Profile(time.process_time) if config.directory is not None else None
+    if config.trace_malloc:
+        tracemalloc.start()
+    wall, cpu = time.perf_counter(), time.process_time()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        result = run()
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        profile.wall, profile.cpu = time.perf_counter() - wall, time.process_time() - cpu
+        if config.trace_malloc:
+            snapshot = tracemalloc.take_snapshot()
+            profile.peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            profile.allocations = [str(stat) for stat in snapshot.statistics('lineno')[:config.trace_malloc]]
+        if profiler is not None:
+            os.makedirs(config.directory, exist_ok=True)
+            profile.stats_file = _stats_path(config.directory, filename)
+            profiler.dump_stats(profile.stats_file)
+            _analyze(profiler, profile)
+    result.profile = profile
+    return result
+
+
+def report_profiles(results: List[FileResult]) -> None:
+    total = FileProfile()
+    for result in results:
+        if result.profile is None:
+            continue
+        logger.info(f'Profile of {result.file}: {result.profile.summary()}')
+        for allocation in result.profile.allocations:
+            logger.info(f'\t{allocation}')
+        total.wall += result.profile.wall
+        total.cpu += result.profile.cpu
+    logger.info(f'Profile of all files: {total.summary()}')
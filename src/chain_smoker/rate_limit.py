@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Callable, Dict, Iterator, Optional
+from urllib.parse import urlparse
+
+from .config import ClientConfig, RateLimitConfig
+from .logger import logger
+
+# number of processes sharing the configured limits, see `set_process_share`
+_share: int = 1
+_limiters: Dict[str, 'RateLimiter'] = dict()
+_lock = threading.Lock()
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket, refilled with `rate` tokens per second up to `burst` tokens.
+
+    Tokens are reserved instead of waited for, callers sleep for the returned delay themselves.
+    This allows using the same bucket from threads and event loops.
+    `burst` may be a fraction, the first request after being idle then waits for the missing part of its token.
+    """
+    def __init__(self, rate: float, burst: float = 1, clock: Callable[[], float] = time.monotonic) -> None:
+        self.rate: float = rate
+        self.burst: float = burst
+        self._clock = clock
+        self._tokens: float = burst
+        self._updated: float = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Takes a token, returns the seconds to wait until it is available."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0., -self._tokens / self.rate)
+
+
+class RateLimiter:
+    """
+    Limits requests per second and requests in flight of a single host.
+
+    With a `share` greater than 1, the limiter is one of `share` processes limiting the same host,
+    it receives the according fraction of the rate, the burst and the requests in flight.
+    """
+    def __init__(self, config: RateLimitConfig, share: int = 1) -> None:
+        if config.max_in_flight is not None and config.max_in_flight < share:
+            raise ValueError(f'max_in_flight of {config.max_in_flight} can\'t be shared by {share} worker processes, '
+                             f'use at most {config.max_in_flight} workers or raise max_in_flight.')
+        self.config: RateLimitConfig = config
+        self.bucket: Optional[TokenBucket] = TokenBucket(
+            config.requests_per_second / share, config.burst / share
+        ) if config.requests_per_second else None
+        self.max_in_flight: Optional[int] = config.max_in_flight // share if config.max_in_flight else None
+        self._semaphore: Optional[threading.BoundedSemaphore] = threading.BoundedSemaphore(
+            self.max_in_flight
+        ) if self.max_in_flight else None
+        self._async_semaphores: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = dict()
+
+    @contextmanager
+    def limit(self) -> Iterator[None]:
+        if self._semaphore is not None:
+            self._semaphore.acquire()
+        try:
+            if self.bucket is not None:
+                time.sleep(self.bucket.reserve())
+            yield
+        finally:
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+    @asynccontextmanager
+    async def limit_async(self) -> AsyncIterator[None]:
+        if self.max_in_flight is None:
+            semaphore = None
+        else:
+            # asyncio primitives are bound to the event loop using them
+            loop = asyncio.get_running_loop()
+            semaphore = self._async_semaphores.setdefault(loop, asyncio.Semaphore(self.max_in_flight))
+        if semaphore is not None:
+            await semaphore.acquire()
+        try:
+            if self.bucket is not None:
+                await asyncio.sleep(self.bucket.reserve())
+            yield
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+
+
+def set_process_share(processes: int) -> None:
+    """
+    Splits the configured limits between `processes` processes, used as initializer of process pools.
+    Every process then limits its requests to its share, keeping the total within the configured limits.
+    Limiters of `max_in_flight` below the number of processes can't be shared and raise a `ValueError`.
+    """
+    global _share
+    with _lock:
+        _share = max(1, processes)
+        _limiters.clear()
+
+
+def get_limiter(config: ClientConfig) -> Optional[RateLimiter]:
+    """Rate limiter of the host of `config.base_url`, shared by all clients of this process."""
+    if config.rate_limit is None:
+        return None
+    host = urlparse(config.base_url).netloc or config.base_url
+    with _lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = _limiters[host] = RateLimiter(config.rate_limit, _share)
+        elif limiter.config != config.rate_limit:
+            logger.warning(f'Different rate limits configured for {host}, using {limiter.config}.')
+        return limiter
@@ -0,0 +1,117 @@
+import json
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, TextIO
+from xml.sax.saxutils import escape, quoteattr
+
+from .results import FileResult, Status, TestResult
+
+# characters not allowed in XML 1.0 documents
+_INVALID_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+class Reporter:
+    """
+    Writes the results of a run as machine-readable report.
+
+    Results are passed test by test as soon as a test finished, followed by the result of its file,
+    and flushed right away, so reporters hold at most the results of a file in memory
+    and reports of interrupted runs keep all finished tests or files.
+    """
+    def __init__(self, filename: str, max_error: Optional[int] = 2000) -> None:
+        self.filename: str = filename
+        self.max_error: Optional[int] = max_error
+        self.stream: TextIO = open(filename, 'w')
+
+    def _error(self, error: Optional[str]) -> Optional[str]:
+        if error is None or self.max_error is None or len(error) <= self.max_error:
+            return error
+        return error[:self.max_error] + f'... ({len(error) - self.max_error} more characters)'
+
+    def _write(self, result: FileResult) -> None:
+        raise NotImplementedError()
+
+    def report_test(self, result: TestResult) -> None:
+        """Reports a finished test, reporters writing whole files only do so in `report_file`."""
+        pass
+
+    def report_file(self, result: FileResult) -> None:
+        self._write(result)
+        self.stream.flush()
+
+    def close(self) -> None:
+        self.stream.close()
+
+    def __enter__(self) -> 'Reporter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class JSONLinesReporter(Reporter):
+    """One JSON object per test and line written as soon as the test finished, broken files are reported
+    with a `test` of `null`."""
+    def _record(self, file: Optional[str], test: Optional[TestResult], result: Optional[FileResult] = None) -> Dict:
+        if test is None:
+            return {'file': file, 'test': None, 'status': Status.ERROR.value, 'duration': result.duration,
+                    'attempts': 0, 'error': self._error(result.error)}
+        return {'file': file, 'test': test.name, 'status': test.status.value, 'duration': test.duration,
+                'attempts': test.attempts, 'error': self._error(test.error)}
+
+    def _line(self, record: Dict) -> str:
+        return json.dumps(record, separators=(',', ':')) + '\n'
+
+    def report_test(self, result: TestResult) -> None:
+        self.stream.write(self._line(self._record(result.file, result)))
+        self.stream.flush()
+
+    def _write(self, result: FileResult) -> None:
+        if result.error is not None:
+            self.stream.write(self._line(self._record(result.file, None, result)))
+
+
+class JUnitXMLReporter(Reporter):
+    """JUnit XML report with a `testsuite` per test file, broken files are reported as a single erroneous test case."""
+    def __init__(self, filename: str, max_error: Optional[int] = 2000) -> None:
+        super().__init__(filename, max_error=max_error)
+        self.stream.write('<?xml version="1.0" encoding="utf-8"?>\n<testsuites>\n')
+
+    def _text(self, text: str) -> str:
+        return escape(_INVALID_XML.sub('', self._error(text)))
+
+    def _attr(self, text: str) -> str:
+        return quoteattr(_INVALID_XML.sub('', text))
+
+    def _test_case(self, classname: str, name: str, duration: float, status: Status, error: Optional[str]) -> str:
+        out = f'    <testcase classname={self._attr(classname)} name={self._attr(name)} time="{duration:.3f}"'
+        if status == Status.PASSED:
+            return out + '/>\n'
+        tag = 'failure' if status == Status.FAILED else 'error'
+        error = error or ''
+        message = self._attr(error.splitlines()[0][:200] if error else '')
+        return out + f'>\n      <{tag} message={message}>{self._text(error)}</{tag}>\n    </testcase>\n'
+
+    def _write(self, result: FileResult) -> None:
+        name = result.file or ''
+        cases: List[str] = [
+            self._test_case(name, test.name, test.duration, test.status, test.error) for test in result.tests
+        ]
+        failures = sum(1 for test in result.tests if test.status == Status.FAILED)
+        errors = sum(1 for test in result.tests if test.status == Status.ERROR)
+        if result.error is not None:
+            cases.append(self._test_case(name, name, result.duration, Status.ERROR, result.error))
+            errors += 1
+        start = datetime.now(timezone.utc) - timedelta(seconds=result.duration)
+        timestamp = start.isoformat(timespec='seconds')
+        self.stream.write(
+            f'  <testsuite name={self._attr(name)} tests="{len(cases)}" failures="{failures}" errors="{errors}" '
+            f'skipped="0" time="{result.duration:.3f}" timestamp="{timestamp}">\n'
+        )
+        self.stream.writelines(cases)
+        self.stream.write('  </testsuite>\n')
+
+    def close(self) -> None:
+        if not self.stream.closed:
+            self.stream.write('</testsuites>\n')
+        super().close()
@@ -0,0 +1,119 @@
+from enum import Enum
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from .logger import logger
+
+
+class Status(str, Enum):
+    PASSED = 'passed'
+    FAILED = 'failed'
+    ERROR = 'error'
+
+
+class RequestTimings(BaseModel):
+    """Durations of the phases of a request in seconds, adding up to `total`."""
+    connect: float = Field(0., description='Connection setup including TLS handshake, 0 for reused connections')
+    ttfb: float = Field(0., description='Time from sending the request until the response headers arrived')
+    download: float = Field(0., description='Download of the response body')
+    total: float = Field(0., description='Total duration of the request')
+
+    def summary(self) -> str:
+        return f'connect {self.connect * 1e3:.1f}ms, ttfb {self.ttfb * 1e3:.1f}ms, ' \
+               f'download {self.download * 1e3:.1f}ms, total {self.total * 1e3:.1f}ms'
+
+    def __add__(self, other: 'RequestTimings') -> 'RequestTimings':
+        return RequestTimings(connect=self.connect + other.connect, ttfb=self.ttfb + other.ttfb,
+                              download=self.download + other.download, total=self.total + other.total)
+
+
+class TestResult(BaseModel):
+    name: str = Field(..., description='Name of the test')
+    file: Optional[str] = Field(None, description='Test file containing the test')
+    status: Status = Field(..., description='Outcome of the test')
+    duration: float = Field(0., description='Duration of the test in seconds')
+    error: Optional[str] = Field(None, description='Failure message in case the test did not pass')
+    attempts: int = Field(1, description='Highest number of attempts needed by a request of the test')
+    timings: Optional[RequestTimings] = Field(None, description='Timings of the last request, summed up for chains')
+    response_bytes: Optional[int] = Field(None, description='Size of the last response body, summed up for chains')
+
+    @property
+    def passed(self) -> bool:
+        return self.status == Status.PASSED
+
+
+class FileProfile(BaseModel):
+    wall: float = Field(0., description='Wall-clock duration in seconds')
+    cpu: float = Field(0., description='CPU time of the process in seconds')
+    package_cpu: Optional[float] = Field(None, description='CPU time spent inside chain-smoker code in seconds')
+    breakdown: Dict[str, float] = Field({}, description='Cumulative CPU time of selected steps in seconds')
+    stats_file: Optional[str] = Field(None, description='Path of the dumped cProfile stats')
+    allocations: List[str] = Field([], description='Top memory allocations')
+    peak_memory: Optional[int] = Field(None, description='Peak traced memory in bytes')
+
+    @property
+    def io_wait(self) -> float:
+        """Time not spent on the CPU, mostly waiting for responses."""
+        return max(0., self.wall - self.cpu)
+
+    def summary(self) -> str:
+        out = f'wall {self.wall:.3f}s, io wait {self.io_wait:.3f}s, cpu {self.cpu:.3f}s'
+        if self.package_cpu is not None:
+            out += f' (chain-smoker code {self.package_cpu:.3f}s; including callees: '
+            out += ', '.join(f'{key} {value:.3f}s' for key, value in self.breakdown.items()) + ')'
+        if self.peak_memory is not None:
+            out += f', peak memory {self.peak_memory / 1024:.1f} KiB'
+        if self.stats_file is not None:
+            out += f', stats: {self.stats_file}'
+        return out
+
+
+class FileResult(BaseModel):
+    file: Optional[str] = Field(None, description='The executed test file')
+    host: Optional[str] = Field(None, description='Host the tests of the file were sent to')
+    tests: List[TestResult] = Field([], description='Results of the executed tests')
+    duration: float = Field(0., description='Duration of the file run in seconds')
+    error: Optional[str] = Field(None, description='Error preventing the execution of the file')
+    stopped: bool = Field(False, description='Whether fail-fast stopped the file at its first failing test')
+    profile: Optional[FileProfile] = Field(None, description='Profile of the file run, if profiling is enabled')
+
+    @property
+    def passed(self) -> bool:
+        return self.error is None and all(test.passed for test in self.tests)
+
+
+class RunResult(BaseModel):
+    files: List[FileResult] = Field([], description='Results of the executed test files')
+    duration: float = Field(0., description='Duration of the whole run in seconds')
+
+    @property
+    def passed(self) -> bool:
+        return all(file.passed for file in self.files)
+
+    @property
+    def tests(self) -> List[TestResult]:
+        return [test for file in self.files for test in file.tests]
+
+    def count(self, status: Status) -> int:
+        return sum(1 for test in self.tests if test.status == status)
+
+    def summary(self) -> str:
+        broken_files = sum(1 for file in self.files if file.error is not None)
+        out = f'{self.count(Status.PASSED)} passed, {self.count(Status.FAILED)} failed, ' \
+              f'{self.count(Status.ERROR)} errors'
+        if broken_files:
+            out += f', {broken_files} broken files'
+        retried = sum(1 for test in self.tests if test.attempts > 1)
+        if retried:
+            out += f', {retried} retried'
+        return out + f' in {len(self.files)} files ({self.duration:.2f}s)'
+
+
+def log_failures(result: FileResult) -> None:
+    if result.error is not None:
+        logger.error(f'Failure for {result.file}:\n{result.error}')
+    for test in result.tests:
+        if not test.passed:
+            details = f'{test.duration:.2f}s' + (f', {test.attempts} attempts' if test.attempts > 1 else '')
+            logger.error(f'{test.status.value.title()} for {result.file}::{test.name} ({details}):\n{test.error}')
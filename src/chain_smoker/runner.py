@@ -0,0 +1,235 @@
+import asyncio
+import time
+from multiprocessing.util import Finalize
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from .config import Engine
+from .file_loader import ResultCallback, TestFileLoader
+from .load import LoadConfig, LoadResult, LoadTest
+from .logger import logger, stop_logging
+from .metrics import Metrics
+from .monitor import Monitor
+from .profiling import ProfileConfig, profile_file, report_profiles
+from .rate_limit import set_process_share
+from .reporters import Reporter
+from .results import FileResult, RunResult, TestResult, log_failures
+
+
+def _file_error(filename: str, error: Exception, start: float, fail_fast: bool) -> FileResult:
+    if isinstance(error, AssertionError):
+        return FileResult(file=filename, error=str(error), duration=time.perf_counter() - start)
+    if fail_fast:
+        raise error
+    return FileResult(file=filename, error=f'{type(error).__name__}: {error}', duration=time.perf_counter() - start)
+
+
+def _stopped_file(filename: str, loader: TestFileLoader, error: Exception, start: float,
+                  fail_fast: bool) -> FileResult:
+    if loader.results and not loader.results[-1].passed:
+        # with `fail_fast`, the failing test stops the file and is part of the results
+        return FileResult(file=filename, host=loader.host, tests=loader.results, duration=time.perf_counter() - start,
+                          stopped=True)
+    return _file_error(filename, error, start, fail_fast)
+
+
+def run_file(filename: str, fail_fast: bool = True, profile: Optional[ProfileConfig] = None,
+             on_result: Optional[ResultCallback] = None, **loader_kwargs) -> FileResult:
+    """
+    Runs all tests of a single test file, `loader_kwargs` are passed on to the `TestFileLoader`.
+
+    Failures are returned as part of the result, with `fail_fast` the file stops at the first failing test.
+    Errors, e.g. invalid configurations, are raised with `fail_fast` and returned otherwise.
+    `on_result` receives the result of every test as soon as it finished.
+    With `profile`, the tests run one after another to profile all of them.
+    """
+    if profile is not None:
+        return profile_file(filename, profile, partial(
+            run_file, filename, fail_fast, on_result=on_result, **{**loader_kwargs, 'concurrency': 1}
+        ))
+    start = time.perf_counter()
+    try:
+        loader = TestFileLoader(filename, **loader_kwargs)
+    except Exception as e:
+        return _file_error(filename, e, start, fail_fast)
+    try:
+        return loader.run(fail_fast=fail_fast, on_result=on_result)
+    except Exception as e:
+        return _stopped_file(filename, loader, e, start, fail_fast)
+
+
+async def run_file_async(filename: str, fail_fast: bool = True, on_result: Optional[ResultCallback] = None,
+                         **loader_kwargs) -> FileResult:
+    """Asynchronous equivalent of `run_file`, using the async engine."""
+    start = time.perf_counter()
+    try:
+        loader = TestFileLoader(filename, engine=Engine.ASYNC, **loader_kwargs)
+    except Exception as e:
+        return _file_error(filename, e, start, fail_fast)
+    try:
+        return await loader.run_async(fail_fast=fail_fast, on_result=on_result)
+    except Exception as e:
+        return _stopped_file(filename, loader, e, start, fail_fast)
+    finally:
+        await loader.client.close()
+
+
+def _file_kwargs(filename: str, loader_kwargs: Dict) -> Dict:
+    """`loader_kwargs` sent along with `filename` to a worker process, holding only the selected tests of the file."""
+    selector = loader_kwargs.get('selector')
+    if selector is None:
+        return loader_kwargs
+    return {**loader_kwargs, 'selector': selector.for_file(filename)}
+
+
+def _init_worker(workers: int) -> None:
+    set_process_share(workers)
+    # worker processes exit without running `atexit` handlers, pending log records are written by a finalizer
+    Finalize(None, stop_logging, exitpriority=0)
+
+
+def _report_test(reporters: Sequence[Reporter]) -> Optional[ResultCallback]:
+    """Callback passing the result of every test to the `reporters` as soon as it finished."""
+    if not reporters:
+        return None
+
+    def report_test(result: TestResult) -> None:
+        for reporter in reporters:
+            reporter.report_test(result)
+    return report_test
+
+
+def _report_file(result: FileResult, reporters: Sequence[Reporter], tests: bool = False) -> FileResult:
+    """Passes `result` to the `reporters`, with `tests` along with its tests, which weren't reported yet."""
+    for reporter in reporters:
+        if tests:
+            for test in result.tests:
+                reporter.report_test(test)
+        reporter.report_file(result)
+    return result
+
+
+async def _run_files_async(files: Iterable[str], workers: int, fail_fast: bool, reporters: Sequence[Reporter] = (),
+                           **loader_kwargs) -> List[FileResult]:
+    semaphore = asyncio.Semaphore(workers)
+    on_result = _report_test(reporters)
+
+    async def run(filename: str) -> FileResult:
+        async with semaphore:
+            return _report_file(await run_file_async(filename, fail_fast, on_result, **loader_kwargs), reporters)
+
+    tasks = list()
+    for file in files:
+        tasks.append(asyncio.create_task(run(file)))
+        # let the task start while the remaining files are discovered
+        await asyncio.sleep(0)
+    return await asyncio.gather(*tasks)
+
+
+def report(result: RunResult) -> None:
+    """Logs the failures of a run, followed by a summary."""
+    for file in result.files:
+        log_failures(file)
+    if result.passed:
+        logger.info(result.summary())
+    else:
+        logger.error(result.summary())
+
+
+class RunFailed(AssertionError):
+    """Raised by fail-fast runs once all results were reported, holding the `result` of the run."""
+    def __init__(self, message: str, result: RunResult) -> None:
+        super().__init__(message)
+        self.result: RunResult = result
+
+
+def _report_fail_fast(result: RunResult) -> None:
+    failed_files = []
+    for file in result.files:
+        if file.passed:
+            logger.info(f'Success for {file.file}!')
+        else:
+            log_failures(file)
+            failed_files.append(file.file)
+
+    if failed_files:
+        raise RunFailed('Failure for files:\n\t' + '\n\t'.join(failed_files), result)
+
+
+def _run_files_serial(files: Iterable[str], fail_fast: bool, profile: Optional[ProfileConfig],
+                      reporters: Sequence[Reporter], **loader_kwargs) -> List[FileResult]:
+    on_result = _report_test(reporters)
+    results = list()
+    for file in files:
+        result = _report_file(
+            run_file(file, fail_fast, profile=profile, on_result=on_result, **loader_kwargs), reporters
+        )
+        results.append(result)
+        if fail_fast and profile is None and not result.passed:
+            break
+    return results
+
+
+def run_files(files: Iterable[str], workers: int = 1, engine: Engine = Engine.SYNC, fail_fast: bool = True,
+              profile: Optional[ProfileConfig] = None, reporters: Sequence[Reporter] = (),
+              **loader_kwargs) -> RunResult:
+    """
+    Runs the given test files, either one after another or distributed to `workers` processes.
+    Using `Engine.ASYNC`, all files are executed on a single event loop with up to `workers` files in flight.
+    `files` is consumed lazily, execution starts with the first file.
+
+    With `fail_fast`, each file stops at its first failing test and serial runs stop at the first failing file.
+    Parallel and async runs execute all files. All runs report the outcome of their files in the order of `files`
+    and raise a `RunFailed` holding the result of the run afterwards in case any of them failed.
+    Without `fail_fast`, all tests are executed and the collected results are returned.
+    With `profile`, each file is profiled, requiring `Engine.SYNC`. Profiles are reported once all files finished.
+    The `reporters` receive the result of every test as soon as it finished, followed by the result of its file.
+    Tests of files run on worker processes are reported along with their file.
+    """
+    assert profile is None or engine == Engine.SYNC, 'Profiling requires `Engine.SYNC`.'
+    start = time.perf_counter()
+    if engine == Engine.ASYNC:
+        results = asyncio.run(_run_files_async(files, workers, fail_fast, reporters, **loader_kwargs))
+    elif workers <= 1:
+        results = _run_files_serial(files, fail_fast, profile, reporters, **loader_kwargs)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(workers, )) as executor:
+            # submit while iterating, `executor.map` would consume all files before the first one starts
+            futures = [
+                executor.submit(
+                    run_file, file, fail_fast=fail_fast, profile=profile, **_file_kwargs(file, loader_kwargs)
+                ) for file in files
+            ]
+            results = [_report_file(future.result(), reporters, tests=True) for future in futures]
+
+    if profile is not None:
+        report_profiles(results)
+    result = RunResult(files=results, duration=time.perf_counter() - start)
+    if fail_fast:
+        _report_fail_fast(result)
+    return result
+
+
+def monitor_files(files: Iterable[str], default_interval: float = 60., workers: int = 1,
+                  metrics: Optional[Metrics] = None, **loader_kwargs) -> None:
+    """
+    Loads the given test files once and re-runs them on their interval until interrupted.
+    With `workers` greater than 1, due files run on a thread pool. Results of all runs are observed by `metrics`.
+    """
+    loaders = [TestFileLoader(file, **loader_kwargs) for file in files]
+    logger.info(f'Monitoring {len(loaders)} file(s).')
+    Monitor(loaders, default_interval=default_interval, workers=workers, metrics=metrics).run_forever()
+
+
+def load_files(files: Iterable[str], load: LoadConfig, **loader_kwargs) -> List[LoadResult]:
+    """
+    Load tests the given test files one after another and logs a summary for each of them.
+    `loader_kwargs` are passed on to `LoadTest.from_file`.
+    """
+    results = list()
+    for file in files:
+        result = LoadTest.from_file(file, load, **loader_kwargs).run()
+        logger.info(result.summary())
+        results.append(result)
+    return results
@@ -0,0 +1,93 @@
+import heapq
+from typing import Callable, Iterable, List
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class Shard(BaseModel):
+    index: int = Field(..., ge=1, description='1-based index of the shard')
+    count: int = Field(..., ge=1, description='Total number of shards')
+
+    @model_validator(mode='after')
+    def index_within_count(self) -> 'Shard':
+        if self.index > self.count:
+            raise ValueError(f'Shard index {self.index} exceeds the number of shards {self.count}.')
+        return self
+
+    @classmethod
+    def parse(cls, value: str) -> 'Shard':
+        """Parses shards given as `i/n`, e.g. `2/4`."""
+        index, separator, count = value.partition('/')
+        if not separator or not index.isdigit() or not count.isdigit():
+            raise ValueError(f'Invalid shard "{value}", expected "i/n".')
+        return cls(index=int(index), count=int(count))
+
+    def __str__(self) -> str:
+        return f'{self.index}/{self.count}'
+
+
+def partition(units: Iterable[str], count: int, duration: Callable[[str], float]) -> List[List[str]]:
+    """
+    Splits `units` into `count` partitions of about the same total duration.
+
+    Units are assigned longest first to the partition with the lowest total duration so far.
+    Ties are broken by name and partition index, so the assignment is the same on every node.
+    Partitions keep the order of `units`.
+    """
+    units = list(units)
+    position = {unit: i for i, unit in enumerate(units)}
+    loads = [(0., i) for i in range(count)]
+    partitions: List[List[str]] = [list() for _ in range(count)]
+    for unit in sorted(units, key=lambda u: (-duration(u), u)):
+        load, i = heapq.heappop(loads)
+        partitions[i].append(unit)
+        heapq.heappush(loads, (load + duration(unit), i))
+    return [sorted(p, key=position.__getitem__) for p in partitions]
+
+
+def shard(units: Iterable[str], selected: Shard, duration: Callable[[str], float]) -> List[str]:
+    """Units of the `selected` shard."""
+    return partition(units, selected.count, duration)[selected.index - 1]
+
+
+def longest_first(units: Iterable[str], duration: Callable[[str], float]) -> List[str]:
+    """Orders `units` by descending duration, the LPT heuristic for parallel execution."""
+    return sorted(units, key=lambda u: (-duration(u), u))
+
+
+class PlanEntry(BaseModel):
+    unit: str = Field(..., description='Test file or node ID of a test')
+    worker: int = Field(..., description='Index of the worker executing the unit')
+    start: float = Field(..., description='Estimated start in seconds after the start of the run')
+    duration: float = Field(..., description='Estimated duration in seconds')
+
+    @property
+    def end(self) -> float:
+        return self.start + self.duration
+
+
+class Plan(BaseModel):
+    workers: int = Field(..., description='Number of workers executing the plan')
+    entries: List[PlanEntry] = Field([], description='Units in order of execution')
+
+    @classmethod
+    def create(cls, units: Iterable[str], workers: int, duration: Callable[[str], float]) -> 'Plan':
+        """Simulates running `units` in order, each on the first worker to become idle."""
+        workers = max(workers, 1)
+        idle = [(0., i) for i in range(workers)]
+        entries = list()
+        for unit in units:
+            start, worker = heapq.heappop(idle)
+            entries.append(PlanEntry(unit=unit, worker=worker, start=start, duration=duration(unit)))
+            heapq.heappush(idle, (entries[-1].end, worker))
+        return cls(workers=workers, entries=entries)
+
+    @property
+    def makespan(self) -> float:
+        return max((entry.end for entry in self.entries), default=0.)
+
+    def summary(self) -> str:
+        lines = [f'{i:>4}. [worker {e.worker}] {e.start:8.2f}s +{e.duration:.2f}s {e.unit}'
+                 for i, e in enumerate(self.entries, 1)]
+        lines.append(f'{len(self.entries)} units on {self.workers} workers, estimated makespan {self.makespan:.2f}s')
+        return '\n'.join(lines)
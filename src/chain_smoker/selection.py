@@ -0,0 +1,168 @@
+import os
+import tempfile
+from fnmatch import fnmatch
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional
+
+import yaml
+from pydantic import BaseModel, Field, field_validator
+
+from . import __version__
+from .config import TestConfig
+
+NODE_SEPARATOR = '::'
+
+
+def node_id(filename: str, name: str) -> str:
+    """Identifier of a test within a test file, e.g. `tests.yaml::test_name`."""
+    return f'{filename}{NODE_SEPARATOR}{name}'
+
+
+class TestSelector(BaseModel):
+    """
+    Selects tests by name, tag, endpoint and method.
+
+    Values of the same criterion are alternatives, different criteria all have to match.
+    Chained tests are selected as a whole, in case the chain or any of its steps matches.
+    """
+    keywords: List[str] = Field([], description='Case-insensitive substrings of test names')
+    tags: List[str] = Field([], description='Test tags')
+    endpoints: List[str] = Field([], description='Glob patterns of endpoints')
+    methods: List[str] = Field([], description='HTTP methods')
+    nodes: Optional[Dict[str, FrozenSet[str]]] = Field(
+        None, description='Names of the selected tests by test file, given as node IDs, e.g. `tests.yaml::test_name`'
+    )
+
+    @field_validator('nodes', mode='before')
+    @classmethod
+    def _group_nodes(cls, nodes):
+        if nodes is None or isinstance(nodes, dict):
+            return nodes
+        grouped = dict()
+        for node in nodes:
+            filename, _, name = node.partition(NODE_SEPARATOR)
+            grouped.setdefault(filename, set()).add(name)
+        return {filename: frozenset(names) for filename, names in grouped.items()}
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.keywords or self.tags or self.endpoints or self.methods or self.nodes is not None)
+
+    def with_nodes(self, nodes: Iterable[str]) -> 'TestSelector':
+        """Copy selecting the given node IDs among the tests matching the other criteria."""
+        return self.model_copy(update={'nodes': self._group_nodes(nodes)})
+
+    def for_file(self, filename: str) -> 'TestSelector':
+        """Copy holding only the nodes of `filename`, e.g. to keep the selector sent to worker processes small."""
+        if self.nodes is None:
+            return self
+        return self.model_copy(update={'nodes': {filename: self.nodes.get(filename, frozenset())}})
+
+    def matches(self, names: Iterable[str], tags: Iterable[str], endpoints: Iterable[Optional[str]],
+                methods: Iterable[str], filename: Optional[str] = None) -> bool:
+        names, endpoints = list(names), [e for e in endpoints if e is not None]
+        if self.nodes is not None and names[0] not in self.nodes.get(filename, ()):
+            return False
+        names = [n.lower() for n in names]
+        if self.keywords and not any(k.lower() in n for k in self.keywords for n in names):
+            return False
+        if self.tags and not set(self.tags).intersection(tags):
+            return False
+        if self.endpoints and not any(fnmatch(e, pattern) for pattern in self.endpoints for e in endpoints):
+            return False
+        if self.methods and not {m.lower() for m in self.methods}.intersection(m.lower() for m in methods):
+            return False
+        return True
+
+    def matches_test(self, test: TestConfig, filename: Optional[str] = None) -> bool:
+        tests = [test, *test.steps]
+        return self.matches(
+            [t.name for t in tests], test.tags, [t.endpoint for t in tests], [t.method for t in tests], filename
+        )
+
+    def matches_entry(self, entry: 'IndexEntry', filename: Optional[str] = None) -> bool:
+        return self.matches([entry.name, *entry.steps], entry.tags, entry.endpoints, entry.methods, filename)
+
+
+class IndexEntry(BaseModel):
+    name: str = Field(..., description='Name of the test')
+    steps: List[str] = Field([], description='Names of the steps of a chained test')
+    tags: List[str] = Field([], description='Tags of the test')
+    endpoints: List[Optional[str]] = Field([], description='Endpoints requested by the test')
+    methods: List[str] = Field([], description='Methods used by the test')
+
+    @classmethod
+    def from_dict(cls, cfg: Dict) -> 'IndexEntry':
+        steps = cfg.get('steps') or []
+        tests = [cfg, *steps]
+        return cls(
+            name=cfg['name'],
+            steps=[step.get('name', '') for step in steps],
+            tags=cfg.get('tags') or [],
+            endpoints=[t.get('endpoint') for t in tests],
+            methods=[t.get('method', 'get') for t in tests]
+        )
+
+
+class FileIndex(BaseModel):
+    mtime_ns: int = Field(..., description='Modification time of the indexed file')
+    size: int = Field(..., description='Size of the indexed file')
+    tests: List[IndexEntry] = Field([], description='Tests defined in the file')
+
+
+class TestIndex(BaseModel):
+    """
+    Index of the tests defined in test files, used to select files without parsing all of them.
+
+    Files are re-indexed when their modification time or size changed.
+    Indexing only reads the raw YAML content, configurations are validated when running the file.
+    """
+    version: str = Field(__version__, description='chain-smoker version which created the index')
+    files: Dict[str, FileIndex] = Field({}, description='Indexed files by path')
+
+    @classmethod
+    def load(cls, filename: str) -> 'TestIndex':
+        try:
+            with open(filename, 'r') as stream:
+                index = cls.model_validate_json(stream.read())
+        except (OSError, ValueError):
+            return cls()
+        return index if index.version == __version__ else cls()
+
+    def save(self, filename: str) -> None:
+        directory = os.path.dirname(os.path.abspath(filename))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as stream:
+            stream.write(self.model_dump_json())
+        os.replace(tmp_path, filename)
+
+    @staticmethod
+    def _index_file(filename: str, stat: os.stat_result) -> FileIndex:
+        with open(filename, 'r') as stream:
+            content = next(yaml.full_load_all(stream)) or {}
+        tests = content.get('tests') or []
+        if isinstance(tests, dict):
+            tests = [{'name': name, **(elem or {})} for name, elem in tests.items()]
+        return FileIndex(
+            mtime_ns=stat.st_mtime_ns, size=stat.st_size, tests=[IndexEntry.from_dict(test) for test in tests]
+        )
+
+    def get(self, filename: str) -> FileIndex:
+        """Returns the index of `filename`, (re-)indexing it if it changed."""
+        stat = os.stat(filename)
+        entry = self.files.get(filename)
+        if entry is None or entry.mtime_ns != stat.st_mtime_ns or entry.size != stat.st_size:
+            entry = self.files[filename] = self._index_file(filename, stat)
+        return entry
+
+    def select(self, files: Iterable[str], selector: TestSelector) -> Iterator[str]:
+        """Yields the files containing at least one test matching `selector`."""
+        for filename in files:
+            if any(selector.matches_entry(test, filename) for test in self.get(filename).tests):
+                yield filename
+
+    def select_tests(self, files: Iterable[str], selector: Optional[TestSelector] = None) -> Iterator[str]:
+        """Yields the node IDs of all tests matching `selector`."""
+        for filename in files:
+            for test in self.get(filename).tests:
+                if selector is None or selector.matches_entry(test, filename):
+                    yield node_id(filename, test.name)
@@ -1,14 +1,20 @@
+import asyncio
+import time
 from collections import OrderedDict
-from typing import Union, Dict, List, Optional
+from typing import Union, Dict, List, Optional, Awaitable
 from functools import partial
 
 from requests import Response
 
 from .api_client import APIClient
-from .config import TestConfig, Cookie
+from .body import SpilledBody
+from .config import TestConfig, Cookie, RetryPolicy
 from .logger import logger
 from .mixins import EvaluationMixin
-from .test_methods import TestValueType, ExpectedTest, ContainsTest, ContainsCookiesTest, ExpectedStatusCodeTest
+from .results import RequestTimings
+from .test_methods import (
+    TestValueType, ValueTest, ExpectedTest, ContainsTest, ContainsCookiesTest, ExpectedStatusCodeTest, MaxLatencyTest
+)
 
 
 class SmokeTest(EvaluationMixin):
@@ -20,7 +26,8 @@ class SmokeTest(EvaluationMixin):
                  headers: Optional[Dict] = None, expects_status_code: Optional[int] = None,
                  expected_result: Optional[TestValueType] = None, contains_result: Optional[TestValueType] = None,
                  contains_not_result: Optional[TestValueType] = None, response_cookies: Optional[List[Cookie]] = None,
-                 response_headers: Optional[Dict] = None, request_cookies: Optional[List[Cookie]] = None) -> None:
+                 response_headers: Optional[Dict] = None, request_cookies: Optional[List[Cookie]] = None,
+                 retry: Optional[RetryPolicy] = None, max_latency_ms: Optional[float] = None) -> None:
         self.name: str = name
         self.client: APIClient = client
         self.method: str = method
@@ -41,13 +48,69 @@ class SmokeTest(EvaluationMixin):
         self.expects_status_code: ExpectedStatusCodeTest = ExpectedStatusCodeTest(
             expects_status_code, name=name, method=method
         ) if expects_status_code else None
+        self.max_latency: MaxLatencyTest = MaxLatencyTest(
+            max_latency_ms, name=name, method=method
+        ) if max_latency_ms else None
         self.contains_not_result: ContainsTest = ContainsTest(
             contains_not_result, inverse=True, name=name, method=method
         ) if contains_not_result else None
         self.headers = headers
+        # failure message of the last run
+        self.error: Optional[str] = None
         self.response_headers: ContainsTest = ContainsTest(
             response_headers, name=name, method=method
         ) if response_headers else None
+        self.retry: RetryPolicy = retry or RetryPolicy()
+        # number of attempts needed by the last run
+        self.attempts: int = 0
+        # timings and body size of the last response
+        self.timings: Optional[RequestTimings] = None
+        self.response_bytes: Optional[int] = None
+        # spilled bodies are searched in place if all value tests are string or integer searches,
+        # JSON bodies are parsed unless the search decides the outcome, see `_search_spilled_json`
+        search_tests = [value_test for value_test in (self.contains_result, self.contains_not_result) if value_test]
+        self.parses_body: bool = self.expected_result is not None or not search_tests or not all(
+            self._is_search(value_test.value) for value_test in search_tests
+        )
+
+    @staticmethod
+    def _is_search(value: TestValueType) -> bool:
+        if isinstance(value, list):
+            return all(isinstance(item, (str, int)) for item in value)
+        return isinstance(value, (str, int))
+
+    @staticmethod
+    def _is_verbatim(value: TestValueType) -> bool:
+        """Whether keys and strings equal to `value` appear in JSON documents as they are, without escapes."""
+        if isinstance(value, list):
+            return all(SmokeTest._is_verbatim(item) for item in value)
+        return isinstance(value, str) and value.isascii() and value.isprintable() and not set(value) & set('"\\/')
+
+    def _search_spilled_json(self, body: SpilledBody) -> Optional[bool]:
+        """
+        Outcome of the value tests decided by searching the raw bytes of the spilled JSON `body`,
+        `None` if the body has to be parsed.
+
+        Keys and values can't be part of the parsed body unless they appear in its bytes, hence `contains` values
+        missing in the bytes fail and `contains_not` values missing in the bytes pass without parsing the body.
+        """
+        search_tests = [value_test for value_test in (self.contains_result, self.contains_not_result) if value_test]
+        if not search_tests or not all(self._is_verbatim(value_test.value) for value_test in search_tests):
+            return None
+        if 'a'.encode(body.encoding) != b'a':
+            # searching encodings other than ASCII-compatible ones isn't supported
+            return None
+
+        def values(value_test: ContainsTest) -> List[str]:
+            return value_test.value if isinstance(value_test.value, list) else [value_test.value]
+
+        if self.contains_result is not None:
+            if all(value in body for value in values(self.contains_result)):
+                return None
+            return self._test(self.contains_result, body)
+        if any(value in body for value in values(self.contains_not_result)):
+            return None
+        return True
 
     def _get_response(self, *args, **kwargs) -> Response:
         endpoint = self.endpoint
@@ -65,10 +128,11 @@ class SmokeTest(EvaluationMixin):
 
         if self.payload_cookies is not None:
             request_kwargs.update({'cookies': {c.key: c.value for c in self.payload_cookies}})
+        if self.headers:
+            # merged into the headers of the client by the request, the client itself stays untouched
+            request_kwargs['headers'] = self.headers
 
         kwargs.pop('values', None)
-        # set temporary headers
-        self.client.set_headers(self.headers)
 
         if self.payload is not None:
             method = partial(
@@ -82,37 +146,129 @@ class SmokeTest(EvaluationMixin):
 
         return method(requires_auth=self.requires_auth, *args, **kwargs)
 
+    def _retry_reason(self, attempt: int, response: Optional[Response] = None,
+                      exception: Optional[Exception] = None) -> Optional[str]:
+        """Reason to retry the request after the `attempt`-th attempt, `None` if it must not be retried."""
+        if attempt > self.retry.retries:
+            return None
+        if exception is not None:
+            if self.retry.retries_errors and isinstance(exception, self.client.RETRYABLE_ERRORS):
+                return f'{type(exception).__name__}: {exception}'
+            return None
+        if self.retry.retries_status(response.status_code):
+            return f'status code {response.status_code}'
+        return None
+
+    def _retry_delay(self, attempt: int, reason: str) -> float:
+        delay = self.retry.delay(attempt)
+        logger.warning(f'Retrying {self.name} after attempt {attempt} of {self.retry.retries + 1} '
+                       f'({reason}) in {delay:.2f}s.')
+        return delay
+
+    def _request(self, *args, **kwargs) -> Response:
+        """Performs the request, retrying it according to the retry policy."""
+        attempt = 1
+        while True:
+            self.attempts = attempt
+            try:
+                response = self._get_response(*args, **kwargs)
+            except Exception as e:
+                if (reason := self._retry_reason(attempt, exception=e)) is None:
+                    raise
+            else:
+                if (reason := self._retry_reason(attempt, response=response)) is None:
+                    return response
+            time.sleep(self._retry_delay(attempt, reason))
+            attempt += 1
+
+    async def _request_async(self, *args, **kwargs) -> Response:
+        """Asynchronous equivalent of `_request`, requests of an `AsyncAPIClient` return awaitables."""
+        attempt = 1
+        while True:
+            self.attempts = attempt
+            try:
+                response = await self._get_response(*args, **kwargs)
+            except Exception as e:
+                if (reason := self._retry_reason(attempt, exception=e)) is None:
+                    raise
+            else:
+                if (reason := self._retry_reason(attempt, response=response)) is None:
+                    return response
+            await asyncio.sleep(self._retry_delay(attempt, reason))
+            attempt += 1
+
     @staticmethod
-    def _get_response_content(res: Response) -> TestValueType:
+    def _get_response_content(res: Response, parse: bool = True) -> Union[TestValueType, SpilledBody]:
+        """
+        Parsed body of `res`. Without `parse`, bodies spilled to disk are returned as they are unless they are JSON,
+        searching them gives the same results as searching the decoded string.
+        """
+        if not parse and isinstance(res.content, SpilledBody) and not res.content.is_json(res.headers):
+            return res.content
         try:
             return res.json()
         except ValueError:
             return res.content.decode('utf-8')
 
-    def run(self, *args, **kwargs) -> Optional[TestValueType]:
+    def _test(self, value_test: ValueTest, value: TestValueType) -> bool:
+        if value_test.test(value):
+            return True
+        self.error = '\n'.join(value_test.error) if isinstance(value_test.error, list) else value_test.error
+        return False
 
-        result = self._get_response(*args, **kwargs)
+    def _evaluate(self, result: Response) -> Optional[TestValueType]:
+        value = None
+        try:
+            value = self._evaluate_response(result)
+            return value
+        finally:
+            # a spilled body returned as value stays mapped until it is garbage collected
+            body = getattr(result, '_content', None)
+            if isinstance(body, SpilledBody) and body is not value:
+                body.close()
 
-        if self.expects_status_code and not self.expects_status_code.test(result):
+    def _evaluate_response(self, result: Response) -> Optional[TestValueType]:
+        self.error = None
+        self.timings = getattr(result, 'timings', None)
+        self.response_bytes = len(result.content) if isinstance(result.content, (bytes, SpilledBody)) else None
+        if self.expects_status_code and not self._test(self.expects_status_code, result):
             return
-        if self.response_cookies is not None and not self.response_cookies.test(result.cookies):
+        if self.max_latency is not None and not self._test(self.max_latency, result):
             return
-        if self.response_headers is not None and not self.response_headers.test(result.headers):
+        if self.response_cookies is not None and not self._test(self.response_cookies, result.cookies):
             return
+        if self.response_headers is not None and not self._test(self.response_headers, result.headers):
+            return
+
+        body = result.content
+        if not self.parses_body and isinstance(body, SpilledBody) and body.is_json(result.headers):
+            passed = self._search_spilled_json(body)
+            if passed is not None:
+                if passed:
+                    logger.info(f'Success for {self.name}!')
+                    return body
+                return
 
-        result = self._get_response_content(result)
+        result = self._get_response_content(result, parse=self.parses_body)
 
-        if self.expected_result is not None and not self.expected_result.test(result):
+        if self.expected_result is not None and not self._test(self.expected_result, result):
             return
-        if self.contains_result is not None and not self.contains_result.test(result):
+        if self.contains_result is not None and not self._test(self.contains_result, result):
             return
-        if self.contains_not_result is not None and not self.contains_not_result.test(result):
+        if self.contains_not_result is not None and not self._test(self.contains_not_result, result):
             return
         logger.info(f'Success for {self.name}!')
         return result
 
+    def run(self, *args, **kwargs) -> Optional[TestValueType]:
+        return self._evaluate(self._request(*args, **kwargs))
+
+    async def run_async(self, *args, **kwargs) -> Optional[TestValueType]:
+        return self._evaluate(await self._request_async(*args, **kwargs))
+
     @classmethod
-    def build(cls, step: TestConfig, client: APIClient) -> 'SmokeTest':
+    def build(cls, step: TestConfig, client: APIClient, headers: Optional[Dict] = None) -> 'SmokeTest':
+        """Test of the configuration `step`, `headers` are sent along with the headers of the step."""
         return cls(
             name=step.name,
             client=client,
@@ -123,12 +279,14 @@ class SmokeTest(EvaluationMixin):
             contains_result=step.contains,
             contains_not_result=step.contains_not,
             payload=step.payload,
-            headers=step.headers,
+            headers={**headers, **(step.headers or {})} if headers else step.headers,
             uses=step.uses,
             requires_auth=step.requires_auth,
             response_cookies=step.response_cookies,
             response_headers=step.response_headers,
-            request_cookies=step.payload_cookies
+            request_cookies=step.payload_cookies,
+            retry=client.retry.override(step.retries, step.retry_on),
+            max_latency_ms=step.max_latency_ms
         )
 
 
@@ -138,6 +296,8 @@ class ChainedSmokeTest(EvaluationMixin):
 
     Chained tests can reuse values of previous tests using the "uses" keyword.
     Additionally, an authentication step can be inserted, marked using the "is_authentication" keyword.
+    Authentication steps run first, their header is sent by all authenticated steps of the chain,
+    other tests using the same client aren't affected.
     """
     def __init__(self, name: str, steps: List[TestConfig], client: APIClient):
         self.name: str = name
@@ -145,26 +305,63 @@ class ChainedSmokeTest(EvaluationMixin):
         self.client: APIClient = client
         self.tests: Dict[str, SmokeTest] = dict()
         self.values = dict()
+        # authentication header of the last run
+        self.headers: Dict = dict()
+
+    @property
+    def attempts(self) -> int:
+        """Highest number of attempts needed by a step of the last run."""
+        return max((test.attempts for test in self.tests.values()), default=0)
+
+    @property
+    def timings(self) -> Optional[RequestTimings]:
+        """Summed up timings of the steps of the last run."""
+        timings = [test.timings for test in self.tests.values() if test.timings is not None]
+        return sum(timings[1:], timings[0]) if timings else None
+
+    @property
+    def response_bytes(self) -> Optional[int]:
+        """Summed up body sizes of the responses of the last run."""
+        sizes = [test.response_bytes for test in self.tests.values() if test.response_bytes is not None]
+        return sum(sizes) if sizes else None
+
+    def _request_authentication(self, step: TestConfig) -> Union[Response, Awaitable[Response]]:
+        # TODO: include "uses" here
+        kwargs = {'headers': self.headers} if self.headers else {}
+        return getattr(self.client, step.method)(step.endpoint, data=self.evaluate_value(step.payload), **kwargs)
+
+    def _authenticate(self, step: TestConfig, res: Response) -> None:
+        # NOTE: do NOT rename `res`, it is a magic value for users
+        auth_key, auth_value = list(step.auth_header_template.auth_header.model_dump().items())[0]
+        auth_value = auth_value.format(token=eval(step.auth_header_template.token_position))
+        self.headers = {auth_key: auth_value}
+        self.values[step.name] = SmokeTest._get_response_content(res)
+        if isinstance(getattr(res, '_content', None), SpilledBody):
+            res._content.close()
+
+    def _build_steps(self) -> Dict[str, SmokeTest]:
+        tests = OrderedDict(
+            (step.name, SmokeTest.build(step, self.client, headers=self.headers if step.requires_auth else None))
+            for step in self.steps if not step.is_authentication
+        )
+        for test in tests.values():
+            # values of steps are used by later steps, spilled bodies must not stay a memory-mapped file
+            test.parses_body = True
+        return tests
 
     def _build_test(self):
-        tests = list()
+        self.headers = dict()
         for step in self.steps:
             if step.is_authentication:
-                # TODO: include "uses" here
-                # NOTE: do NOT remove this assignment, `res` is a magic value for users
-                res = getattr(self.client, step.method)(step.endpoint, data=self.evaluate_value(step.payload))
-                auth_key, auth_value = list(step.auth_header_template.auth_header.model_dump().items())[0]
-                auth_value = auth_value.format(token=eval(step.auth_header_template.token_position))
-                auth_header = {auth_key: auth_value}
-                self.client.session.headers = auth_header
-                self.client.default_headers = auth_header.copy()
-                self.values[step.name] = SmokeTest._get_response_content(res)
-            else:
-                tests.append(
-                    (step.name, SmokeTest.build(step, self.client))
-                )
+                self._authenticate(step, self._request_authentication(step))
+        self.tests = self._build_steps()
 
-        self.tests = OrderedDict(tests)
+    async def _build_test_async(self):
+        self.headers = dict()
+        for step in self.steps:
+            if step.is_authentication:
+                self._authenticate(step, await self._request_authentication(step))
+        self.tests = self._build_steps()
 
     def run(self, env=None):
         logger.info(f'Running chained test case {self.name}:')
@@ -174,6 +371,14 @@ class ChainedSmokeTest(EvaluationMixin):
             self.values[test_name] = test.run(values=self.values, env=env)
         return self.values
 
+    async def run_async(self, env=None):
+        logger.info(f'Running chained test case {self.name}:')
+        self.values = dict()
+        await self._build_test_async()
+        for test_name, test in self.tests.items():
+            self.values[test_name] = await test.run_async(values=self.values, env=env)
+        return self.values
+
     @classmethod
     def build(cls, step: TestConfig, client: APIClient) -> 'ChainedSmokeTest':
         return cls(step.name, step.steps, client)
@@ -93,6 +93,18 @@ class ExpectedStatusCodeTest(ValueTest):
             self.found_error = True
 
 
+class MaxLatencyTest(ValueTest):
+    """
+    Tests if the total duration of the request stays within the budget in milliseconds
+    """
+    def _run_test(self, other_value: Response) -> None:
+        latency = other_value.timings.total * 1000
+        if latency > self.value:
+            self.error = f'Latency budget exceeded for {self.name}!\n{latency:.1f}ms > {self.value}ms\n' \
+                         f'{other_value.timings.summary()}\n{self.method}'
+            self.found_error = True
+
+
 class ContainsTest(ValueTest):
     """
     Tests if value member of received value.
@@ -0,0 +1,76 @@
+import os
+import tempfile
+from statistics import mean
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field, PrivateAttr
+
+from .results import RunResult
+from .selection import NODE_SEPARATOR
+
+
+class Timings(BaseModel):
+    """
+    Durations of test files and tests recorded by previous runs.
+
+    Durations of unknown files and tests are estimated by the mean of the recorded ones,
+    computed once and renewed whenever durations are recorded by `update`.
+    """
+    files: Dict[str, float] = Field({}, description='Duration of each test file in seconds')
+    tests: Dict[str, Dict[str, float]] = Field({}, description='Duration of each test in seconds, by test file')
+    _mean_file: Optional[float] = PrivateAttr(None)
+    _mean_test: Optional[float] = PrivateAttr(None)
+
+    @classmethod
+    def load(cls, filename: str) -> 'Timings':
+        try:
+            with open(filename, 'r') as stream:
+                return cls.model_validate_json(stream.read())
+        except (OSError, ValueError):
+            return cls()
+
+    def save(self, filename: str) -> None:
+        directory = os.path.dirname(os.path.abspath(filename))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as stream:
+            stream.write(self.model_dump_json(indent=2))
+        os.replace(tmp_path, filename)
+
+    def update(self, result: RunResult) -> None:
+        """
+        Records the durations of all files and tests of `result`. Broken files and files stopped by fail-fast
+        are ignored, their durations would underestimate complete runs.
+        """
+        for file in result.files:
+            if file.file is None or file.error is not None or file.stopped:
+                continue
+            self.files[file.file] = file.duration
+            self.tests.setdefault(file.file, dict()).update({test.name: test.duration for test in file.tests})
+        self._mean_file = self._mean_test = None
+
+    def _mean_file_duration(self) -> float:
+        if self._mean_file is None:
+            self._mean_file = mean(self.files.values()) if self.files else 1.
+        return self._mean_file
+
+    def _mean_test_duration(self) -> float:
+        if self._mean_test is None:
+            known = [duration for file in self.tests.values() for duration in file.values()]
+            self._mean_test = mean(known) if known else 1.
+        return self._mean_test
+
+    def file_duration(self, filename: str) -> float:
+        if filename in self.files:
+            return self.files[filename]
+        return self._mean_file_duration()
+
+    def test_duration(self, filename: str, name: str) -> float:
+        tests = self.tests.get(filename, dict())
+        if name in tests:
+            return tests[name]
+        return self._mean_test_duration()
+
+    def duration(self, node: str) -> float:
+        """Duration of a test file or a test, given its node ID."""
+        filename, separator, name = node.partition(NODE_SEPARATOR)
+        return self.test_duration(filename, name) if separator else self.file_duration(filename)
@@ -0,0 +1,280 @@
+import json as complexjson
+import os
+import threading
+import time
+from datetime import timedelta
+from http.cookiejar import DefaultCookiePolicy
+from typing import MutableMapping, Optional, Protocol, Union, Dict, Tuple
+from urllib.parse import urlencode, urljoin
+
+from requests import Session, Response, PreparedRequest, ConnectionError, ConnectTimeout, ReadTimeout
+from requests.adapters import HTTPAdapter
+from requests.cookies import RequestsCookieJar, extract_cookies_to_jar, get_cookie_header, merge_cookies
+from requests.structures import CaseInsensitiveDict
+from requests.utils import default_headers, get_encoding_from_headers
+from urllib3 import PoolManager
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, HTTPError, MaxRetryError, ReadTimeoutError
+from urllib3.util import Retry, Timeout
+
+from .config import PoolConfig, Transport
+
+# connection setup time of the current request of each thread
+_connect_time = threading.local()
+
+
+def reset_connect_time() -> None:
+    """Starts measuring the connection setup time of a new request in the current thread."""
+    _connect_time.value = 0.
+
+
+def connect_time() -> float:
+    """Seconds spent on establishing connections since the last `reset_connect_time` in the current thread."""
+    return getattr(_connect_time, 'value', 0.)
+
+
+def _add_connect_time(start: float) -> None:
+    _connect_time.value = connect_time() + time.perf_counter() - start
+
+
+class TimedHTTPConnection(HTTPConnection):
+    def connect(self) -> None:
+        start = time.perf_counter()
+        super().connect()
+        _add_connect_time(start)
+
+
+class TimedHTTPSConnection(HTTPSConnection):
+    def connect(self) -> None:
+        start = time.perf_counter()
+        super().connect()
+        _add_connect_time(start)
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+TIMED_POOL_CLASSES = {'http': TimedHTTPConnectionPool, 'https': TimedHTTPSConnectionPool}
+
+
+class TimingAdapter(HTTPAdapter):
+    """Adapter measuring the time spent on establishing new connections."""
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = TIMED_POOL_CLASSES
+
+
+# adapters by pool sizes and pool managers by pool sizes and certificate verification,
+# shared by all sessions of the process
+_adapters: Dict[Tuple[int, int], TimingAdapter] = dict()
+_pool_managers: Dict[Tuple[int, int, Union[bool, str]], PoolManager] = dict()
+_adapters_lock = threading.Lock()
+
+
+def _reset_adapters() -> None:
+    # connections of the parent process must not be used by forked children
+    global _adapters_lock
+    _adapters_lock = threading.Lock()
+    _adapters.clear()
+    _pool_managers.clear()
+
+
+os.register_at_fork(after_in_child=_reset_adapters)
+
+
+def get_adapter(pool: PoolConfig) -> TimingAdapter:
+    """
+    Adapter shared by all sessions of the process with the same pool sizes.
+
+    Its pool manager keeps a connection pool per scheme, host, port and TLS settings, hence clients
+    of different test files reuse each other's connections. Headers and cookies stay with each session.
+    """
+    key = (pool.pool_connections, pool.pool_maxsize)
+    with _adapters_lock:
+        if key not in _adapters:
+            _adapters[key] = TimingAdapter(pool_connections=pool.pool_connections, pool_maxsize=pool.pool_maxsize)
+        return _adapters[key]
+
+
+def get_pool_manager(pool: PoolConfig, verify: Union[bool, str] = True) -> PoolManager:
+    """
+    Pool manager of the `urllib3` transport shared by all sessions of the process, like `get_adapter`.
+    `verify` is either a flag or the path of a CA bundle.
+    """
+    key = (pool.pool_connections, pool.pool_maxsize, verify)
+    with _adapters_lock:
+        if key not in _pool_managers:
+            if verify is False:
+                tls = {'cert_reqs': 'CERT_NONE'}
+            elif isinstance(verify, str):
+                tls = {'cert_reqs': 'CERT_REQUIRED', 'ca_certs' if os.path.isfile(verify) else 'ca_cert_dir': verify}
+            else:
+                tls = {'cert_reqs': 'CERT_REQUIRED'}
+            manager = PoolManager(num_pools=pool.pool_connections, maxsize=pool.pool_maxsize, **tls)
+            manager.pool_classes_by_scheme = TIMED_POOL_CLASSES
+            _pool_managers[key] = manager
+        return _pool_managers[key]
+
+
+class HTTPSession(Protocol):
+    """Interface of the sessions of all transports, implemented by `requests.Session` and `Urllib3Session`."""
+    headers: MutableMapping[str, str]
+    cookies: RequestsCookieJar
+
+    def get(self, url: str, **kwargs) -> Response: ...
+
+    def post(self, url: str, **kwargs) -> Response: ...
+
+    def put(self, url: str, **kwargs) -> Response: ...
+
+    def patch(self, url: str, **kwargs) -> Response: ...
+
+
+class Urllib3Session:
+    """
+    Lean replacement of `requests.Session`, sending requests straight through a shared `urllib3.PoolManager`.
+
+    It skips hooks, environment lookups, proxies and the preparation of requests, and supports
+    the request kwargs `params`, `json`, `data`, `headers`, `cookies`, `timeout`, `verify`, `allow_redirects`
+    and `stream`.
+    Session headers and cookies behave like those of `requests`, responses are `requests.Response`s
+    and errors are raised as the corresponding `requests` exceptions.
+    """
+    # requests doesn't retry by itself and follows up to 30 redirects
+    RETRIES = Retry(total=None, connect=0, read=False, redirect=30, status=0, other=0)
+
+    def __init__(self, pool: PoolConfig = PoolConfig()) -> None:
+        self.pool: PoolConfig = pool
+        self.headers: CaseInsensitiveDict = default_headers()
+        self.cookies: RequestsCookieJar = RequestsCookieJar()
+
+    @staticmethod
+    def _encode_body(headers: CaseInsensitiveDict, data=None, json=None) -> Optional[bytes]:
+        if json is not None and not data:
+            headers.setdefault('Content-Type', 'application/json')
+            return complexjson.dumps(json, allow_nan=False).encode()
+        if data is None or isinstance(data, bytes):
+            return data
+        if isinstance(data, str):
+            return data.encode()
+        headers.setdefault('Content-Type', 'application/x-www-form-urlencoded')
+        return urlencode(data, doseq=True).encode()
+
+    def request(self, method: str, url: str, params: Optional[Union[Dict, str]] = None, data=None, json=None,
+                headers: Optional[Dict] = None, cookies: Optional[Dict] = None, timeout=None,
+                verify: Union[bool, str] = True, allow_redirects: bool = True, stream: bool = False) -> Response:
+        if params:
+            if not isinstance(params, str):
+                params = urlencode({key: value for key, value in params.items() if value is not None}, doseq=True)
+            url += ('&' if '?' in url else '?') + params
+        merged = CaseInsensitiveDict(self.headers)
+        if headers:
+            merged.update(headers)
+            for key in [key for key, value in headers.items() if value is None]:
+                del merged[key]
+        request = PreparedRequest()
+        request.method, request.url, request.headers = method.upper(), url, merged
+        request.body = self._encode_body(merged, data=data, json=json)
+        jar = self.cookies
+        if cookies:
+            # cookies of the request are sent along with those of the session, without being stored
+            jar = merge_cookies(merge_cookies(RequestsCookieJar(), self.cookies), cookies)
+        if len(jar):
+            cookie = get_cookie_header(jar, request)
+            if cookie:
+                merged['Cookie'] = cookie
+        if isinstance(timeout, tuple):
+            timeout = Timeout(connect=timeout[0], read=timeout[1])
+        elif timeout is not None:
+            timeout = Timeout(connect=timeout, read=timeout)
+
+        start = time.perf_counter()
+        try:
+            raw = get_pool_manager(self.pool, verify).request(
+                request.method, url, body=request.body, headers=dict(merged), timeout=timeout, retries=self.RETRIES,
+                redirect=allow_redirects, preload_content=False
+            )
+            elapsed = time.perf_counter() - start
+            # streamed bodies are read through `Response.iter_content`, closing the response releases the connection
+            content = False
+            if not stream:
+                try:
+                    content = raw.read()
+                finally:
+                    raw.release_conn()
+        except MaxRetryError as e:
+            if isinstance(e.reason, ConnectTimeoutError):
+                raise ConnectTimeout(e) from e
+            if isinstance(e.reason, ReadTimeoutError):
+                raise ReadTimeout(e) from e
+            raise ConnectionError(e) from e
+        except ReadTimeoutError as e:
+            raise ReadTimeout(e) from e
+        except HTTPError as e:
+            raise ConnectionError(e) from e
+        return self._to_response(request, raw, content, elapsed)
+
+    def _to_response(self, request: PreparedRequest, raw, content: Union[bytes, bool], elapsed: float) -> Response:
+        response = Response()
+        response.raw = raw
+        response.status_code = raw.status
+        response.reason = raw.reason
+        # the URL of the last response of redirects, relative to the host
+        response.url = urljoin(request.url, raw.url) if raw.url else request.url
+        response.headers = CaseInsensitiveDict(raw.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = content
+        response.elapsed = timedelta(seconds=elapsed)
+        response.request = request
+        if 'Set-Cookie' in response.headers:
+            extract_cookies_to_jar(response.cookies, request, raw)
+            extract_cookies_to_jar(self.cookies, request, raw)
+        return response
+
+    def get(self, url: str, **kwargs) -> Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> Response:
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> Response:
+        return self.request('PUT', url, **kwargs)
+
+    def patch(self, url: str, **kwargs) -> Response:
+        return self.request('PATCH', url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> Response:
+        return self.request('DELETE', url, **kwargs)
+
+    def close(self) -> None:
+        # connections belong to the shared pool manager
+        pass
+
+
+def timed_session(pool: PoolConfig = PoolConfig(),
+                  transport: Transport = Transport.REQUESTS) -> HTTPSession:
+    """Session of the given `transport`, whose connections are timed and shared with all sessions of the process."""
+    if transport == Transport.URLLIB3:
+        session = Urllib3Session(pool)
+    else:
+        session = Session()
+        adapter = get_adapter(pool)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+    if not pool.keep_alive:
+        session.headers['Connection'] = 'close'
+    return session
+
+
+def unauthenticated_session(pool: PoolConfig = PoolConfig(),
+                            transport: Transport = Transport.REQUESTS) -> HTTPSession:
+    """Session without default headers of the client, which doesn't store received cookies."""
+    session = timed_session(pool, transport)
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
@@ -142,6 +142,7 @@ class TestFileWriter(BaseModel, EvaluationMixin):
         ))
         obj_dict = config.model_dump()
         obj_dict['type'] = obj_dict['type'].value
+        obj_dict['config']['client']['transport'] = obj_dict['config']['client']['transport'].value
         return obj_dict
 
     def write(self):
@@ -0,0 +1,49 @@
+import json
+import threading
+from unittest import TestCase
+
+import requests
+
+from benchmarks.run import BENCHMARKS, run_case
+from benchmarks.stub_server import StubServer
+from src.chain_smoker.config import Transport
+
+
+class BenchmarkTestCase(TestCase):
+    def setUp(self) -> None:
+        self.server = StubServer(size=256)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_stub_server(self):
+        rsp = requests.get(self.server.url + 'foo', params={'size': 2048})
+
+        self.assertEqual(rsp.status_code, 200)
+        self.assertGreaterEqual(len(rsp.content), 2048)
+        self.assertEqual(rsp.json()['token'], 'benchmark-token')
+        self.assertLess(len(requests.post(self.server.url, json={}).content), 512)
+
+    def test_run_case(self):
+        for benchmark in BENCHMARKS:
+            with self.subTest(benchmark):
+                result = run_case(benchmark, 6, self.server.url, tests_per_file=4, response_size=256)
+
+                self.assertGreater(result['tests_per_sec'], 0)
+                self.assertGreater(result['peak_rss_kib'], 0)
+                json.dumps(result)
+
+        self.assertEqual(run_case('SmokeTest', 6, self.server.url, 4, 256)['files'], 2)
+        self.assertEqual(run_case('ChainedSmokeTest', 6, self.server.url, 4, 256)['requests'], 6)
+
+    def test_transports(self):
+        for transport in Transport:
+            with self.subTest(transport):
+                result = run_case('APIClient', 6, self.server.url, 4, 256, transport)
+
+                self.assertEqual(result['transport'], transport.value)
+                self.assertEqual(result['requests'], 6)
+                self.assertGreater(result['cpu_per_request_us'], 0)
+        self.assertIsNone(run_case('ContainsTest', 6, self.server.url, 4, 256)['transport'])
@@ -1,8 +1,12 @@
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest import TestCase, mock
 from parameterized import parameterized
 
 from src.chain_smoker.api_client import APIClient, PayloadType
-from src.chain_smoker.config import ClientConfig, AuthHeaderTemplate, AuthHeader
+from src.chain_smoker.transports import get_adapter
+from src.chain_smoker.config import ClientConfig, AuthHeaderTemplate, AuthHeader, PoolConfig
 
 
 class APIClientTestCase(TestCase):
@@ -20,15 +24,18 @@ class APIClientTestCase(TestCase):
     def test_build_url(self, input_value, expected_url):
         self.assertEqual(self.client._build_url(input_value), expected_url)
 
-    @parameterized.expand([
-        ({'foo': 'bar'}, {'foo': 'bar'}),
-        (None, {})
-    ])
-    def test_set_header(self, input_value, expected_value):
-        client = APIClient(ClientConfig(base_url='https://example.com'))
-        old_val = client.session.headers.copy()
-        client.set_headers(input_value)
-        self.assertEqual(client.session.headers, expected_value or old_val)
+    @mock.patch('requests.Session.get')
+    def test_request_headers(self, get_mock):
+        client = APIClient(ClientConfig(base_url='https://example.com', kwargs={'headers': {'X-Default': 'foo'}}))
+        session_headers = client.session.headers.copy()
+
+        client.get('foo', headers={'X-Test': 'bar'})
+        client.get('foo')
+
+        first, second = get_mock.call_args_list
+        self.assertEqual(first.kwargs['headers'], {'X-Default': 'foo', 'X-Test': 'bar'})
+        self.assertEqual(second.kwargs['headers'], {'X-Default': 'foo'})
+        self.assertEqual(client.session.headers, session_headers)
 
     def test_auth_header_set_when_auth_header_passed(self):
         expected_value = 'bar'
@@ -110,3 +117,96 @@ class APIClientTestCase(TestCase):
 
         new_kwargs = client._enhance_kwargs({'timeout': 20})
         self.assertEqual(new_kwargs['timeout'], 20)
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = b'{"key": "value"}'
+        self.send_response(200)
+        if getattr(self, 'cookie', None):
+            self.send_header('Set-Cookie', self.cookie)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class APIClientTimingsTestCase(TestCase):
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.client = APIClient(ClientConfig(base_url=f'http://127.0.0.1:{self.server.server_port}/'))
+
+    def tearDown(self) -> None:
+        self.client.session.close()
+        if self.client.unauthenticated_session is not None:
+            self.client.unauthenticated_session.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_timings(self):
+        first = self.client.get('foo')
+        second = self.client.get('foo')
+
+        self.assertEqual(first.json(), {'key': 'value'})
+        self.assertGreater(first.timings.connect, 0.)
+        self.assertEqual(second.timings.connect, 0.)
+        for timings in (first.timings, second.timings):
+            self.assertAlmostEqual(timings.connect + timings.ttfb + timings.download, timings.total)
+
+    def test_unauthenticated_session_is_reused(self):
+        self.client.session.headers['Authorization'] = 'Bearer foo'
+        first = self.client.get('foo', requires_auth=False)
+        second = self.client.get('foo', requires_auth=False)
+
+        self.assertGreater(first.timings.connect, 0.)
+        self.assertEqual(second.timings.connect, 0.)
+        self.assertNotIn('Authorization', second.request.headers)
+
+    def test_unauthenticated_session_ignores_cookies(self):
+        session = self.client._get_session(requires_auth=False)
+        with mock.patch.object(KeepAliveHandler, 'cookie', 'foo=bar', create=True):
+            self.client.get('foo', requires_auth=False)
+
+        self.assertIs(self.client._get_session(requires_auth=False), session)
+        self.assertEqual(len(session.cookies), 0)
+
+    def test_without_keep_alive(self):
+        client = APIClient(ClientConfig(base_url=self.client.base_url, pool={'keep_alive': False}))
+
+        client.get('foo')
+
+        self.assertGreater(client.get('foo').timings.connect, 0.)
+
+    def test_clients_share_connections(self):
+        config = ClientConfig(
+            base_url=self.client.base_url,
+            auth_header=AuthHeaderTemplate(auth_header=AuthHeader(Authorization='Bearer foo'))
+        )
+        other = APIClient(config)
+        self.client.get('foo')
+
+        rsp = other.get('foo')
+
+        self.assertIs(other.session.get_adapter(other.base_url), self.client.session.get_adapter(other.base_url))
+        self.assertEqual(rsp.timings.connect, 0.)
+        self.assertEqual(rsp.request.headers['Authorization'], 'Bearer foo')
+        self.assertNotIn('Authorization', self.client.get('foo').request.headers)
+
+    def test_adapters_by_pool_size(self):
+        self.assertIs(get_adapter(PoolConfig()), get_adapter(PoolConfig(keep_alive=False)))
+        self.assertIsNot(get_adapter(PoolConfig()), get_adapter(PoolConfig(pool_maxsize=20)))
+
+    def test_timings_phases(self):
+        rsp = mock.Mock(elapsed=timedelta(seconds=0.3))
+        with mock.patch('src.chain_smoker.api_client.connect_time', return_value=0.1):
+            timings = APIClient._timings(rsp, 0.5)
+
+        self.assertAlmostEqual(timings.connect, 0.1)
+        self.assertAlmostEqual(timings.ttfb, 0.2)
+        self.assertAlmostEqual(timings.download, 0.2)
+        self.assertEqual(timings.total, 0.5)
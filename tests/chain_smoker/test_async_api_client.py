@@ -0,0 +1,108 @@
+from http.cookies import SimpleCookie
+from unittest import IsolatedAsyncioTestCase, mock
+
+from src.chain_smoker.async_api_client import AsyncAPIClient
+from src.chain_smoker.config import ClientConfig, AuthHeaderTemplate, AuthHeader
+
+
+class AsyncResponseMock:
+    def __init__(self, status=200, content=b'{"key": "value"}', headers=None, cookies=None):
+        self.status = status
+        self.reason = 'OK'
+        self.url = 'https://example.com/foo/bar'
+        self.headers = headers or {'Content-Type': 'application/json'}
+        self.cookies = cookies or SimpleCookie()
+        self.content = content
+
+    async def read(self):
+        return self.content
+
+    def get_encoding(self):
+        return 'utf-8'
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+
+class AsyncAPIClientTestCase(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        config = ClientConfig(
+            base_url='https://example.com/foo/',
+            auth_header=AuthHeaderTemplate(auth_header=AuthHeader(Authorization='Bearer foo'))
+        )
+        self.client = AsyncAPIClient(config)
+        self.client.session = mock.Mock()
+        self.client.session.request.return_value = AsyncResponseMock()
+        self.client.unauthenticated_session = mock.Mock()
+        self.client.unauthenticated_session.request.return_value = AsyncResponseMock()
+
+    async def test_get(self):
+        rsp = await self.client.get('bar')
+
+        self.client.session.request.assert_called_once_with(
+            'GET', 'https://example.com/foo/bar', headers={'Authorization': 'Bearer foo'}, params=None,
+            trace_request_ctx=mock.ANY
+        )
+        self.assertEqual(rsp.status_code, 200)
+        self.assertDictEqual(rsp.json(), {'key': 'value'})
+        self.assertGreaterEqual(rsp.timings.total, rsp.timings.ttfb)
+
+    async def test_post(self):
+        await self.client.post('bar', {'foo': 'bar'})
+
+        self.client.session.request.assert_called_once_with(
+            'POST', 'https://example.com/foo/bar', headers={'Authorization': 'Bearer foo'}, json={'foo': 'bar'},
+            trace_request_ctx=mock.ANY
+        )
+
+    async def test_unauthenticated_request(self):
+        await self.client.get('bar', requires_auth=False)
+
+        self.client.session.request.assert_not_called()
+        self.client.unauthenticated_session.request.assert_called_once_with(
+            'GET', 'https://example.com/foo/bar', headers=None, params=None, trace_request_ctx=mock.ANY
+        )
+
+    async def test_request_headers(self):
+        await self.client.get('bar', headers={'X-Foo': 'bar'})
+        await self.client.get('bar', headers={'Authorization': 'JWT bar'})
+        await self.client.get('bar')
+        await self.client.get('bar', requires_auth=False, headers={'X-Foo': 'bar'})
+
+        first, second, third = self.client.session.request.call_args_list
+        self.assertEqual(first.kwargs['headers'], {'Authorization': 'Bearer foo', 'X-Foo': 'bar'})
+        self.assertEqual(second.kwargs['headers'], {'Authorization': 'JWT bar'})
+        self.assertEqual(third.kwargs['headers'], {'Authorization': 'Bearer foo'})
+        self.assertEqual(self.client.unauthenticated_session.request.call_args.kwargs['headers'], {'X-Foo': 'bar'})
+
+    async def test_to_response_cookies(self):
+        cookies = SimpleCookie()
+        cookies.load('foo=bar; Path=/')
+
+        rsp = await AsyncAPIClient._to_response(AsyncResponseMock(cookies=cookies))
+
+        cookie = next(iter(rsp.cookies))
+        self.assertEqual(cookie.name, 'foo')
+        self.assertEqual(cookie.value, 'bar')
+        self.assertEqual(cookie.domain, 'example.com')
+
+    def test_translate_kwargs(self):
+        kwargs = AsyncAPIClient._translate_kwargs({'timeout': 10, 'verify': False, 'stream': True})
+
+        self.assertEqual(kwargs['timeout'].total, 10)
+        self.assertFalse(kwargs['ssl'])
+        self.assertNotIn('verify', kwargs)
+        self.assertNotIn('stream', kwargs)
+
+    async def test_close(self):
+        session = mock.AsyncMock()
+        self.client.session = session
+        self.client.unauthenticated_session = None
+
+        await self.client.close()
+
+        session.close.assert_awaited_once()
+        self.assertIsNone(self.client.session)
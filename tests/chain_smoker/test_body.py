@@ -0,0 +1,202 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import IsolatedAsyncioTestCase, TestCase, mock
+
+from parameterized import parameterized
+from requests import Response
+
+from src.chain_smoker.api_client import APIClient
+from src.chain_smoker.body import BodyReader, BodyTooLarge, SpilledBody, read_body_async
+from src.chain_smoker.config import BodyConfig, ClientConfig, TestConfig, Transport
+from src.chain_smoker.test_clients import ChainedSmokeTest, SmokeTest
+
+EXPORT = json.dumps({'items': [{'id': i, 'name': f'item-{i}'} for i in range(5000)], 'token': 'needle'}).encode()
+TEXT = '\n'.join(f'item-{i}' for i in range(5000)).encode()
+
+
+class BodyReaderTestCase(TestCase):
+    def test_in_memory(self):
+        reader = BodyReader(BodyConfig(spill_threshold=10))
+        reader.feed(b'foo')
+        reader.feed(b'bar')
+
+        self.assertEqual(reader.finish(), b'foobar')
+
+    def test_spills(self):
+        reader = BodyReader(BodyConfig(spill_threshold=4))
+        for chunk in (b'{"foo": ', b'"needle", ', b'"bar": 42}'):
+            reader.feed(chunk)
+
+        body = reader.finish()
+
+        self.assertIsInstance(body, SpilledBody)
+        self.assertEqual(len(body), 28)
+        self.assertEqual(body.decode(), '{"foo": "needle", "bar": 42}')
+        self.assertIn('needle', body)
+        self.assertIn(42, body)
+        self.assertNotIn('missing', body)
+        self.assertEqual(str(body), '<response body of 28 bytes>')
+        body.close()
+        self.assertTrue(body.file.closed)
+
+    def test_max_body_bytes(self):
+        reader = BodyReader(BodyConfig(max_body_bytes=5, spill_threshold=2))
+        reader.feed(b'foo')
+
+        with self.assertRaises(BodyTooLarge):
+            reader.feed(b'bar')
+        self.assertIsNone(reader.file)
+        with self.assertRaises(BodyTooLarge):
+            BodyReader(BodyConfig(max_body_bytes=5)).check_length('6')
+        BodyReader(BodyConfig(max_body_bytes=5)).check_length(None)
+
+
+class ExportHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.send_response(200)
+        if self.path.startswith('/text'):
+            self.send_header('Content-Type', 'text/plain')
+            self.send_header('Content-Length', str(len(TEXT)))
+            self.end_headers()
+            self.wfile.write(TEXT)
+            return
+        self.send_header('Content-Type', 'application/json')
+        if self.path.startswith('/chunked'):
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for start in range(0, len(EXPORT), 30000):
+                chunk = EXPORT[start:start + 30000]
+                self.wfile.write(f'{len(chunk):x}\r\n'.encode() + chunk + b'\r\n')
+            self.wfile.write(b'0\r\n\r\n')
+            return
+        self.send_header('Content-Length', str(len(EXPORT)))
+        self.end_headers()
+        self.wfile.write(EXPORT)
+
+    def log_message(self, *args):
+        pass
+
+
+class StreamedBodyTestCase(TestCase):
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), ExportHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f'http://127.0.0.1:{self.server.server_port}/'
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _client(self, transport: Transport, **body) -> APIClient:
+        return APIClient(ClientConfig(base_url=self.base_url, transport=transport, body=body,
+                                      pool={'pool_maxsize': 4}))
+
+    @parameterized.expand([(Transport.REQUESTS, ), (Transport.URLLIB3, )])
+    def test_spills(self, transport):
+        client = self._client(transport, spill_threshold=1024)
+
+        rsp = client.get('export')
+
+        self.assertIsInstance(rsp.content, SpilledBody)
+        self.assertEqual(len(rsp.content), len(EXPORT))
+        self.assertIn('item-4999', rsp.content)
+        self.assertEqual(rsp.json()['token'], 'needle')
+        self.assertEqual(client.get('export').timings.connect, 0.)
+
+    @parameterized.expand([(Transport.REQUESTS, 'export'), (Transport.URLLIB3, 'export'),
+                           (Transport.REQUESTS, 'chunked'), (Transport.URLLIB3, 'chunked')])
+    def test_max_body_bytes(self, transport, path):
+        client = self._client(transport, max_body_bytes=len(EXPORT) - 1)
+
+        with self.assertRaises(BodyTooLarge):
+            client.get(path)
+        self.assertEqual(self._client(transport, max_body_bytes=len(EXPORT)).get(path).content, EXPORT)
+
+    @parameterized.expand([
+        ('contains', 'token', True), ('contains', 'needle', False), ('contains', 'item-42', False),
+        ('contains_not', 'items', False), ('contains_not', 'needle', True),
+    ])
+    def test_smoke_test_parses_spilled_json(self, test, value, passes):
+        for client in (self._client(Transport.REQUESTS), self._client(Transport.REQUESTS, spill_threshold=1024)):
+            smoke_test = SmokeTest.build(TestConfig(name='export', endpoint='export', **{test: value}), client)
+
+            self.assertEqual(smoke_test.run() is not None, passes)
+            self.assertEqual(smoke_test.response_bytes, len(EXPORT))
+
+    @parameterized.expand([
+        ('contains', 'missing', False, False), ('contains_not', 'missing', True, False),
+        ('contains', ['token', 'missing'], False, False), ('contains', 'token', True, True),
+        ('contains_not', 'needle', True, True), ('contains_not', 'items', False, True),
+    ])
+    def test_smoke_test_searches_spilled_json_before_parsing(self, test, value, passes, parses):
+        client = self._client(Transport.REQUESTS, spill_threshold=1024)
+        smoke_test = SmokeTest.build(TestConfig(name='export', endpoint='export', **{test: value}), client)
+
+        with mock.patch.object(Response, 'json', autospec=True, side_effect=Response.json) as m:
+            self.assertEqual(smoke_test.run() is not None, passes)
+
+        self.assertEqual(m.called, parses)
+
+    def test_smoke_test_searches_spilled_text(self):
+        client = self._client(Transport.REQUESTS, spill_threshold=1024)
+        found = SmokeTest.build(TestConfig(name='found', endpoint='text', contains=['item-42', 'item-4999']), client)
+        missing = SmokeTest.build(TestConfig(name='missing', endpoint='text', contains='item-5000'), client)
+        absent = SmokeTest.build(TestConfig(name='absent', endpoint='text', contains_not='item-5000'), client)
+        unchecked = SmokeTest.build(TestConfig(name='unchecked', endpoint='text'), client)
+
+        body = found.run()
+
+        self.assertIsInstance(body, SpilledBody)
+        self.assertFalse(body.closed)
+        self.assertEqual(body[:], TEXT)
+        self.assertIsNone(missing.run())
+        self.assertIn('<response body of', missing.error)
+        self.assertIsNotNone(absent.run())
+        self.assertTrue(unchecked.parses_body)
+        self.assertEqual(unchecked.run(), TEXT.decode())
+
+    def test_chain_uses_spilled_body(self):
+        client = self._client(Transport.REQUESTS, spill_threshold=1024)
+        chain = ChainedSmokeTest.build(TestConfig(name='chain', steps=[
+            TestConfig(name='a', endpoint='export'),
+            TestConfig(name='b', endpoint='export?token={token}', uses={'token': "values['a']['token']"},
+                       contains='token'),
+        ]), client)
+
+        values = chain.run()
+
+        self.assertEqual(values['a']['token'], 'needle')
+        self.assertEqual(values['b']['token'], 'needle')
+
+    def test_chain_closes_spilled_authentication_response(self):
+        client = self._client(Transport.REQUESTS, spill_threshold=1024)
+        rsp = client.get('export')
+        chain = ChainedSmokeTest.build(TestConfig(name='chain', steps=[
+            TestConfig(name='auth', endpoint='export', method='post', payload={'user': 'foo'}, is_authentication=True,
+                       auth_header_template={'auth_header': {'Authorization': 'Bearer {token}'},
+                                             'token_position': "res.json()['token']"}),
+        ]), client)
+
+        chain._authenticate(chain.steps[0], rsp)
+
+        self.assertEqual(chain.headers, {'Authorization': 'Bearer needle'})
+        self.assertEqual(chain.values['auth']['token'], 'needle')
+        self.assertTrue(rsp.content.closed)
+
+
+class ReadBodyAsyncTestCase(IsolatedAsyncioTestCase):
+    async def test_read_body_async(self):
+        async def chunks():
+            for chunk in (b'foo', b'bar', b'baz'):
+                yield chunk
+
+        rsp = Response()
+        await read_body_async(rsp, chunks(), BodyConfig(spill_threshold=4))
+
+        self.assertIsInstance(rsp.content, SpilledBody)
+        self.assertIn('obarb', rsp.content)
+        with self.assertRaises(BodyTooLarge):
+            await read_body_async(Response(), chunks(), BodyConfig(max_body_bytes=8))
@@ -0,0 +1,79 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase, mock
+
+from pydantic import ValidationError
+
+from src.chain_smoker.cache import ConfigCache
+from src.chain_smoker.config import TestCaseConfig
+from src.chain_smoker.file_loader import TestFileLoader
+
+
+class ConfigCacheTestCase(TestCase):
+    sample_file_name = os.path.join(os.path.dirname(__file__), 'fixtures/sample.yaml')
+
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.cache = ConfigCache(os.path.join(self.directory, 'cache'))
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def test_key(self):
+        self.assertEqual(ConfigCache.key(b'foo'), ConfigCache.key(b'foo'))
+        self.assertNotEqual(ConfigCache.key(b'foo'), ConfigCache.key(b'bar'))
+
+        with mock.patch('src.chain_smoker.cache.__version__', '0.0.0'):
+            old_key = ConfigCache.key(b'foo')
+        self.assertNotEqual(ConfigCache.key(b'foo'), old_key)
+
+        with mock.patch('src.chain_smoker.cache.pydantic.VERSION', '0.0.0'):
+            old_key = ConfigCache.key(b'foo')
+        self.assertNotEqual(ConfigCache.key(b'foo'), old_key)
+
+    def test_get_missing_or_corrupt(self):
+        self.assertIsNone(self.cache.get('foo'))
+
+        with open(self.cache._path('foo'), 'wb') as stream:
+            stream.write(b'not json')
+        self.assertIsNone(self.cache.get('foo'))
+
+        with open(self.cache._path('foo'), 'wb') as stream:
+            stream.write(b'{"config": {}}')
+        self.assertIsNone(self.cache.get('foo'))
+
+    @mock.patch.dict(os.environ, {'bar': 'baz'})
+    def test_stores_json(self):
+        config = self.cache.load(self.sample_file_name)
+
+        [path] = [os.path.join(self.cache.directory, name) for name in os.listdir(self.cache.directory)]
+        with open(path, encoding='utf-8') as stream:
+            self.assertEqual(TestCaseConfig.model_validate_json(stream.read()), config)
+
+    @mock.patch.dict(os.environ, {'bar': 'baz'})
+    def test_load(self):
+        with mock.patch('src.chain_smoker.cache.TestCaseConfig.from_dict', wraps=TestCaseConfig.from_dict) as from_dict:
+            config = self.cache.load(self.sample_file_name)
+            cached_config = self.cache.load(self.sample_file_name)
+
+        from_dict.assert_called_once()
+        self.assertEqual(config, cached_config)
+        self.assertIsNot(config, cached_config)
+        self.assertEqual(cached_config.tests[1].steps[0].name, 'first_request')
+
+    def test_load_validates_env(self):
+        with mock.patch.dict(os.environ, {'bar': 'baz'}):
+            self.cache.load(self.sample_file_name)
+
+        with self.assertRaises(ValidationError):
+            self.cache.load(self.sample_file_name)
+
+    @mock.patch.dict(os.environ, {'bar': 'baz'})
+    def test_file_loader(self):
+        loader = TestFileLoader(self.sample_file_name, cache=self.cache)
+        cached_loader = TestFileLoader(self.sample_file_name, cache=self.cache)
+
+        self.assertEqual(loader.config, cached_loader.config)
+        self.assertEqual(len(cached_loader.test_methods), 3)
+        self.assertEqual(len(os.listdir(self.cache.directory)), 1)
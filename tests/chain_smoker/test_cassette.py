@@ -0,0 +1,121 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase, mock
+
+import yaml
+from requests import Response
+
+from src.chain_smoker.cassette import Cassette, CassetteMode, cassette_path, request_key
+from src.chain_smoker.file_loader import TestFileLoader
+
+
+def create_response(status_code=200, content=b'{"key": "value"}', url='https://example.com/foo'):
+    rsp = Response()
+    rsp.status_code = status_code
+    rsp.reason = 'OK'
+    rsp.url = url
+    rsp.headers['Content-Type'] = 'application/json'
+    rsp._content = content
+    rsp.encoding = 'utf-8'
+    return rsp
+
+
+class RequestKeyTestCase(TestCase):
+    def test_key(self):
+        self.assertEqual(request_key('get', 'https://example.com/foo', {}), 'GET https://example.com/foo')
+        self.assertEqual(
+            request_key('get', 'https://example.com/foo?a=1', {'params': {'b': [2, 3]}}),
+            'GET https://example.com/foo?a=1&b=2&b=3'
+        )
+
+    def test_body_hash(self):
+        key = request_key('post', 'https://example.com/foo', {'json': {'a': 1, 'b': 2}})
+
+        self.assertTrue(key.startswith('POST https://example.com/foo '))
+        self.assertEqual(key, request_key('post', 'https://example.com/foo', {'json': {'b': 2, 'a': 1}}))
+        self.assertEqual(key, request_key('post', 'https://example.com/foo', {'data': {'b': 2, 'a': 1}}))
+        self.assertNotEqual(key, request_key('post', 'https://example.com/foo', {'json': {'a': 2, 'b': 2}}))
+        self.assertNotEqual(key, request_key('put', 'https://example.com/foo', {'json': {'a': 1, 'b': 2}}))
+
+    def test_cassette_path(self):
+        self.assertEqual(cassette_path('tests/users.yaml'), 'tests/users.cassette.json')
+
+
+class CassetteTestCase(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'test.cassette.json')
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        rsp = create_response(content=b'\xff\x00')
+        rsp.cookies.set('session', 'foo', domain='example.com', path='/')
+        cassette = Cassette.open(self.filename, CassetteMode.RECORD)
+        cassette.record('GET https://example.com/foo', rsp)
+        cassette.save(self.filename)
+
+        cassette = Cassette.open(self.filename, CassetteMode.REPLAY)
+        replayed = cassette.play('GET https://example.com/foo')
+
+        self.assertTrue(cassette.replaying)
+        self.assertEqual(replayed.status_code, 200)
+        self.assertEqual(replayed.content, b'\xff\x00')
+        self.assertEqual(replayed.headers['content-type'], 'application/json')
+        self.assertEqual(replayed.cookies.get('session'), 'foo')
+        self.assertEqual(replayed.timings.total, 0.)
+
+    def test_play_in_order(self):
+        cassette = Cassette()
+        cassette.record('GET foo', create_response(503))
+        cassette.record('GET foo', create_response(200))
+
+        self.assertEqual([cassette.play('GET foo').status_code for _ in range(3)], [503, 200, 200])
+        with self.assertRaises(LookupError):
+            cassette.play('GET bar')
+
+    def test_replay_missing_cassette(self):
+        with self.assertRaises(FileNotFoundError):
+            Cassette.open(self.filename, CassetteMode.REPLAY)
+
+
+class CassetteFileLoaderTestCase(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'test.yaml')
+        with open(self.filename, 'w') as stream:
+            yaml.safe_dump({
+                'type': 'api-test',
+                'config': {'client': {'base_url': 'https://example.com/'}},
+                'tests': {
+                    'get': {'endpoint': 'foo', 'expects': {'key': 'value'}},
+                    'post': {'endpoint': 'foo', 'method': 'post', 'payload': '{"a": 1}', 'contains': {'key': 'value'}},
+                }
+            }, stream)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def test_record_and_replay(self):
+        with mock.patch('requests.Session.request', return_value=create_response()) as request_mock:
+            result = TestFileLoader(self.filename, cassette=CassetteMode.RECORD).run()
+
+        self.assertTrue(result.passed)
+        self.assertEqual(request_mock.call_count, 2)
+        self.assertTrue(os.path.exists(cassette_path(self.filename)))
+
+        with mock.patch('requests.Session.request') as request_mock:
+            result = TestFileLoader(self.filename, cassette=CassetteMode.REPLAY).run()
+
+        self.assertTrue(result.passed)
+        request_mock.assert_not_called()
+
+    def test_replay_unrecorded_request(self):
+        Cassette().save(cassette_path(self.filename))
+
+        result = TestFileLoader(self.filename, cassette=CassetteMode.REPLAY).run(fail_fast=False)
+
+        self.assertFalse(result.passed)
+        self.assertIn('LookupError: No recorded response for "GET https://example.com/foo"', result.tests[0].error)
@@ -3,7 +3,7 @@ from unittest import TestCase, mock
 
 from pydantic import ValidationError
 
-from src.chain_smoker.config import TestCaseConfig, TestFileConfig, ClientConfig, TestConfig
+from src.chain_smoker.config import TestCaseConfig, TestFileConfig, ClientConfig, TestConfig, RetryPolicy, Transport
 
 
 class ConfigTestCase(TestCase):
@@ -41,6 +41,21 @@ class TestFileConfigTestCase(ConfigTestCase):
         config = self.constructor.from_dict({'client': {'base_url': 'example.com'}})
 
         self.assertEqual(config.client.base_url, 'example.com')
+        self.assertEqual(config.concurrency, 1)
+
+    def test_from_dict_interval(self):
+        config = self.constructor.from_dict({'client': {'base_url': 'example.com'}, 'interval': 30})
+        self.assertEqual(config.interval, 30)
+
+        with self.assertRaises(ValidationError):
+            self.constructor.from_dict({'client': {'base_url': 'example.com'}, 'interval': 0})
+
+    def test_from_dict_concurrency(self):
+        config = self.constructor.from_dict({'client': {'base_url': 'example.com'}, 'concurrency': 8})
+        self.assertEqual(config.concurrency, 8)
+
+        with self.assertRaises(ValidationError):
+            self.constructor.from_dict({'client': {'base_url': 'example.com'}, 'concurrency': 0})
 
     @mock.patch.dict(os.environ, {'bar': 'baz'})
     def test_from_dict_with_env(self):
@@ -77,6 +92,53 @@ class ClientConfigTestCase(ConfigTestCase):
         self.assertIsNotNone(config.auth_header.auth_header)
         self.assertEqual(config.auth_header.auth_header.Authorization, 'Bearer Foo')
 
+    def test_from_dict_retry(self):
+        config = self.constructor.from_dict({'base_url': 'https://example.com'})
+        self.assertEqual(config.retry.retries, 0)
+
+        config = self.constructor.from_dict({'base_url': 'https://example.com', 'retry': {'retries': 3, 'backoff': 1}})
+        self.assertEqual(config.retry.retries, 3)
+        self.assertEqual(config.retry.backoff, 1.)
+
+        with self.assertRaises(ValidationError):
+            self.constructor.from_dict({'base_url': 'https://example.com', 'retry': {'retries': -1}})
+
+    def test_urllib3_kwargs(self):
+        kwargs = {'timeout': 5, 'verify': False, 'cert': 'client.pem', 'proxies': {'https': 'http://proxy:3128'}}
+        config = self.constructor.from_dict({'base_url': 'https://example.com', 'kwargs': kwargs})
+
+        with self.assertRaises(ValidationError) as err:
+            self.constructor.from_dict({'base_url': 'https://example.com', 'kwargs': kwargs, 'transport': 'urllib3'})
+        self.assertIn('doesn\'t support the kwargs cert, proxies', str(err.exception))
+        with self.assertRaises(ValueError):
+            config.with_transport(Transport.URLLIB3)
+        self.assertEqual(config.with_transport(Transport.REQUESTS).transport, Transport.REQUESTS)
+
+
+class RetryPolicyTestCase(TestCase):
+    def test_retries_status(self):
+        policy = RetryPolicy(retry_on=[429, '5xx'])
+
+        self.assertTrue(policy.retries_status(429))
+        self.assertTrue(policy.retries_status(500))
+        self.assertFalse(policy.retries_status(404))
+        self.assertFalse(policy.retries_errors)
+        self.assertTrue(RetryPolicy().retries_errors)
+
+    def test_delay(self):
+        policy = RetryPolicy(backoff=1., max_backoff=5.)
+
+        with mock.patch('src.chain_smoker.config.random.uniform', side_effect=lambda a, b: b):
+            self.assertEqual([policy.delay(attempt) for attempt in range(1, 5)], [1., 2., 4., 5.])
+
+    def test_override(self):
+        policy = RetryPolicy(retries=2, backoff=1.)
+
+        self.assertEqual(policy.override(), policy)
+        self.assertEqual(policy.override(retries=0).retries, 0)
+        self.assertEqual(policy.override(retry_on=[500]).retry_on, [500])
+        self.assertEqual(policy.retries, 2)
+
 
 class TestConfigTestCase(ConfigTestCase):
     constructor = TestConfig
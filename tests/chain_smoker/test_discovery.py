@@ -0,0 +1,49 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from src.chain_smoker.discovery import discover
+
+
+class DiscoverTestCase(TestCase):
+    files = [
+        'b.yaml', 'a.yml', 'foo.yaml.bak', 'readme.md',
+        'users/test.yaml', 'users/nested/deep.yaml', 'archive/old.yaml', 'orders/test.yaml',
+    ]
+
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        for file in self.files:
+            path = os.path.join(self.directory, file)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, 'w').close()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def discover(self, **kwargs):
+        return [os.path.relpath(file, self.directory) for file in discover(self.directory, **kwargs)]
+
+    def test_discover(self):
+        self.assertEqual(
+            self.discover(),
+            ['a.yml', 'b.yaml', 'archive/old.yaml', 'orders/test.yaml', 'users/test.yaml', 'users/nested/deep.yaml']
+        )
+
+    def test_include(self):
+        self.assertEqual(self.discover(include=['users/*']), ['users/test.yaml', 'users/nested/deep.yaml'])
+        self.assertEqual(self.discover(include=['*.md']), ['readme.md'])
+
+    def test_exclude(self):
+        self.assertEqual(
+            self.discover(exclude=['archive', 'nested', 'b.*']),
+            ['a.yml', 'orders/test.yaml', 'users/test.yaml']
+        )
+
+    def test_is_lazy(self):
+        files = discover(self.directory)
+
+        self.assertEqual(os.path.basename(next(files)), 'a.yml')
+        shutil.rmtree(os.path.join(self.directory, 'users'))
+        self.assertEqual(len(list(files)), 3)
@@ -1,8 +1,13 @@
 import os
-from unittest import TestCase, mock
+from unittest import TestCase, IsolatedAsyncioTestCase, mock
 
 from src.chain_smoker.api_client import APIClient
+from src.chain_smoker.async_api_client import AsyncAPIClient
+from src.chain_smoker.config import TestConfig, Engine
 from src.chain_smoker.file_loader import TestFileLoader
+from src.chain_smoker.results import Status
+from src.chain_smoker.test_clients import SmokeTest
+from src.chain_smoker.timings import Timings
 
 
 class FileLoaderTestCase(TestCase):
@@ -72,8 +77,133 @@ class FileLoaderTestCase(TestCase):
     def test_run(self):
         loader = TestFileLoader(self.sample_file_name)
         test_mock = mock.Mock()
+        test_mock.name = 'test'
+        test_mock.attempts = 1
+        test_mock.timings = None
+        test_mock.response_bytes = None
         loader.test_methods = [test_mock]
 
         loader.run()
 
         test_mock.run.assert_called_once()
+
+    @mock.patch.dict(os.environ, {'bar': 'baz'})
+    def test_concurrency(self):
+        loader = TestFileLoader(self.sample_file_name)
+        self.assertEqual(loader.concurrency, 1)
+
+        loader = TestFileLoader(self.sample_file_name, concurrency=4)
+        self.assertEqual(loader.concurrency, 4)
+
+    @mock.patch.dict(os.environ, {'bar': 'baz'})
+    def test_batches(self):
+        loader = TestFileLoader(self.sample_file_name, concurrency=4)
+        first, chained, last = loader.test_methods
+        with_headers = SmokeTest.build(TestConfig(name='with_headers', headers={'foo': 'bar'}), loader.client)
+        loader.test_methods = [first, last, chained, first, with_headers, last]
+
+        self.assertEqual(
+            list(loader._batches()),
+            [[first, last], [chained], [first, with_headers, last]]
+        )
+
+    @mock.patch.dict(os.environ, {'bar': 'baz'})
+    def test_batches_longest_first(self):
+        timings = Timings(tests={self.sample_file_name: {'test_something': 1., 'test_using_env': 2.}})
+        loader = TestFileLoader(self.sample_file_name, concurrency=4, timings=timings)
+        first, chained, last = loader.test_methods
+        loader.test_methods = [first, last, chained]
+
+        self.assertEqual(list(loader._batches()), [[last, first], [chained]])
+
+    @mock.patch.dict(os.environ, {'bar': 'baz'})
+    def test_run_concurrent(self):
+        loader = TestFileLoader(self.sample_file_name, concurrency=4)
+        tests = [mock.Mock(spec=SmokeTest, headers=None, error=None) for _ in range(3)]
+        for i, test in enumerate(tests):
+            test.name = f'test_{i}'
+        tests[1].name = 'failing'
+        tests[1].run.return_value = None
+        loader.test_methods = tests
+
+        with self.assertRaises(AssertionError) as err:
+            loader.run()
+
+        self.assertIn('failing', str(err.exception))
+        for test in tests:
+            test.run.assert_called_once()
+
+    @mock.patch.dict(os.environ, {'bar': 'baz'})
+    def test_run_continue_on_failure(self):
+        loader = TestFileLoader(self.sample_file_name)
+        tests = [mock.Mock(spec=SmokeTest, headers=None, error=None) for _ in range(3)]
+        for test, name in zip(tests, ['failing', 'erroring', 'passing']):
+            test.name = name
+        tests[0].run.return_value = None
+        tests[0].error = 'Unexpected status_code'
+        tests[1].run.side_effect = ConnectionError('refused')
+        loader.test_methods = tests
+
+        result = loader.run(fail_fast=False)
+
+        self.assertFalse(result.passed)
+        self.assertEqual([test.status for test in result.tests], [Status.FAILED, Status.ERROR, Status.PASSED])
+        self.assertEqual(result.tests[0].error, 'Failure for test "failing".\nUnexpected status_code')
+        self.assertEqual(result.tests[1].error, 'ConnectionError: refused')
+        self.assertEqual(result.tests[2].file, self.sample_file_name)
+
+    @mock.patch.dict(os.environ, {'bar': 'baz'})
+    def test_run_fail_fast_raises_errors(self):
+        loader = TestFileLoader(self.sample_file_name)
+        test_mock = mock.Mock(attempts=1, timings=None, response_bytes=None)
+        test_mock.name = 'test'
+        test_mock.run.side_effect = ConnectionError('refused')
+        loader.test_methods = [test_mock, mock.Mock()]
+        on_result = mock.Mock()
+
+        with self.assertRaises(ConnectionError):
+            loader.run(on_result=on_result)
+
+        self.assertEqual([(result.name, result.status) for result in loader.results], [('test', Status.ERROR)])
+        on_result.assert_called_once_with(loader.results[0])
+
+
+class AsyncFileLoaderTestCase(IsolatedAsyncioTestCase):
+    sample_file_name = FileLoaderTestCase.sample_file_name
+
+    @mock.patch.dict(os.environ, {'bar': 'baz'})
+    def test_get_client(self):
+        loader = TestFileLoader(self.sample_file_name, engine=Engine.ASYNC)
+
+        self.assertTrue(isinstance(loader.client, AsyncAPIClient))
+
+    @mock.patch.dict(os.environ, {'bar': 'baz'})
+    async def test_run_async(self):
+        loader = TestFileLoader(self.sample_file_name, engine=Engine.ASYNC)
+        test_mock = mock.AsyncMock()
+        test_mock.name = 'test'
+        test_mock.attempts = 1
+        test_mock.timings = None
+        test_mock.response_bytes = None
+        loader.test_methods = [test_mock]
+
+        await loader.run_async()
+
+        test_mock.run_async.assert_awaited_once()
+
+    @mock.patch.dict(os.environ, {'bar': 'baz'})
+    async def test_run_async_concurrent(self):
+        loader = TestFileLoader(self.sample_file_name, concurrency=4, engine=Engine.ASYNC)
+        tests = [mock.AsyncMock(spec=SmokeTest, headers=None, error=None) for _ in range(3)]
+        for i, test in enumerate(tests):
+            test.name = f'test_{i}'
+        tests[1].name = 'failing'
+        tests[1].run_async.return_value = None
+        loader.test_methods = tests
+
+        with self.assertRaises(AssertionError) as err:
+            await loader.run_async()
+
+        self.assertIn('failing', str(err.exception))
+        for test in tests:
+            test.run_async.assert_awaited_once()
@@ -0,0 +1,61 @@
+from unittest import TestCase
+
+from src.chain_smoker.histogram import LatencyHistogram
+
+
+class LatencyHistogramTestCase(TestCase):
+    def test_empty(self):
+        histogram = LatencyHistogram()
+
+        self.assertEqual(histogram.percentile(50), 0.)
+        self.assertEqual(histogram.mean, 0.)
+
+    def test_exact_small_values(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 101):
+            histogram.record(value / 1e6)
+
+        self.assertEqual(histogram.percentile(50), 50 / 1e6)
+        self.assertEqual(histogram.percentile(99), 99 / 1e6)
+        self.assertEqual(histogram.percentile(100), 100 / 1e6)
+        self.assertEqual(histogram.min, 1)
+
+    def test_relative_error(self):
+        histogram = LatencyHistogram(precision=7)
+        values = [i * 0.0137 for i in range(1, 1001)]
+        for value in values:
+            histogram.record(value)
+
+        for percentile in (50, 90, 99):
+            expected = values[int(percentile / 100 * len(values)) - 1]
+            self.assertLessEqual(abs(histogram.percentile(percentile) - expected) / expected, 2 ** -6)
+        self.assertAlmostEqual(histogram.percentile(100), values[-1])
+        self.assertAlmostEqual(histogram.mean, sum(values) / len(values))
+
+    def test_buckets_cover_all_values(self):
+        histogram = LatencyHistogram(precision=4)
+
+        for value in range(1, 5000):
+            index = histogram._index(value)
+            self.assertGreaterEqual(histogram._highest_value(index), value)
+            self.assertLess(histogram._highest_value(index - 1), value)
+
+    def test_compact(self):
+        histogram = LatencyHistogram()
+        for i in range(100000):
+            histogram.record(0.001 + i * 1e-5)
+
+        self.assertEqual(histogram.count, 100000)
+        self.assertLess(len(histogram.counts), 1000)
+
+    def test_merge(self):
+        first, second = LatencyHistogram(), LatencyHistogram()
+        first.record(0.001)
+        second.record(0.002)
+        second.record(0.003)
+
+        first.merge(second)
+
+        self.assertEqual(first.count, 3)
+        self.assertEqual((first.min, first.max), (1000, 3000))
+        self.assertAlmostEqual(first.percentile(50), 0.002, places=4)
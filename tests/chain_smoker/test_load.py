@@ -0,0 +1,101 @@
+from unittest import TestCase, mock
+
+from pydantic import ValidationError
+
+from src.chain_smoker.config import TestCaseConfig
+from src.chain_smoker.load import LoadConfig, LoadTest, LoadResult
+from src.chain_smoker.selection import TestSelector
+
+
+CONFIG = {
+    'type': 'api-test',
+    'config': {'client': {'base_url': 'https://example.com'}},
+    'tests': {
+        'test_get': {'endpoint': 'get', 'expects_status_code': 200},
+        'test_other': {'endpoint': 'other', 'expects_status_code': 200},
+    }
+}
+
+
+class LoadConfigTestCase(TestCase):
+    def test_requires_limit(self):
+        with self.assertRaises(ValidationError):
+            LoadConfig(concurrency=2)
+        with self.assertRaises(ValidationError):
+            LoadConfig(iterations=1, sample=2.)
+        LoadConfig(duration=1.)
+
+
+class LoadTestTestCase(TestCase):
+    def setUp(self) -> None:
+        self.config = TestCaseConfig.from_dict({**CONFIG, 'tests': dict(CONFIG['tests'])})
+        patcher = mock.patch('src.chain_smoker.transports.Session')
+        self.session = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.session.get.return_value = mock.Mock(status_code=200, json=mock.Mock(return_value={}))
+
+    def test_iterations(self):
+        result = LoadTest(self.config, LoadConfig(concurrency=3, iterations=10), name='foo.yaml').run()
+
+        self.assertEqual(result.requests, 10)
+        self.assertEqual(result.evaluated, 10)
+        self.assertEqual(result.errors, 0)
+        self.assertEqual(result.histogram.count, 10)
+        self.assertEqual(self.session.get.call_count, 10)
+        self.assertIn('foo.yaml: 10 requests', result.summary())
+
+    def test_failures_and_errors(self):
+        self.session.get.side_effect = [
+            mock.Mock(status_code=500), ValueError('foo'), mock.Mock(status_code=200, json=mock.Mock(return_value={}))
+        ]
+
+        result = LoadTest(self.config, LoadConfig(iterations=3)).run()
+
+        self.assertEqual(result.requests, 3)
+        self.assertEqual(result.errors, 1)
+        self.assertEqual(result.failures, 1)
+        self.assertAlmostEqual(result.error_rate, 1 / 3)
+        self.assertEqual(result.failure_rate, 0.5)
+
+    def test_sample(self):
+        self.session.get.return_value = mock.Mock(status_code=500)
+
+        result = LoadTest(self.config, LoadConfig(iterations=20, sample=0.)).run()
+
+        self.assertEqual(result.requests, 20)
+        self.assertEqual(result.evaluated, 0)
+        self.assertEqual(result.failures, 0)
+
+    def test_duration(self):
+        clock = mock.Mock(side_effect=[0., *range(10), 100., 100.])
+
+        result = LoadTest(self.config, LoadConfig(duration=5.), clock=clock).run()
+
+        self.assertGreater(result.requests, 0)
+        self.assertLess(result.requests, 10)
+
+    def test_pool_covers_concurrency(self):
+        test = LoadTest(self.config, LoadConfig(concurrency=32, iterations=1))
+
+        self.assertEqual(test.config.config.client.pool.pool_maxsize, 32)
+        self.assertEqual(self.config.config.client.pool.pool_maxsize, 10)
+
+    def test_selector(self):
+        test = LoadTest(self.config, LoadConfig(iterations=1), name='foo.yaml',
+                        selector=TestSelector(keywords=['other']))
+
+        self.assertEqual([t.name for t in test._build_tests()], ['test_other'])
+
+
+class LoadResultTestCase(TestCase):
+    def test_merge(self):
+        result, other = LoadResult('foo'), LoadResult()
+        other.requests, other.errors = 4, 1
+        other.histogram.record(0.1)
+
+        result.merge(other)
+        result.duration = 2.
+
+        self.assertEqual(result.throughput, 2.)
+        self.assertEqual(result.error_rate, 0.25)
+        self.assertEqual(result.histogram.count, 1)
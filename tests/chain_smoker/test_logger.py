@@ -0,0 +1,82 @@
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from unittest import TestCase, mock
+
+from src.chain_smoker import logger as logger_module
+from src.chain_smoker.logger import CustomFormatter, configure_logging, logger
+
+
+def create_record(level=logging.INFO, msg='foo'):
+    return logging.LogRecord('SMOKE_TESTER', level, __file__, 1, msg, None, None)
+
+
+class CustomFormatterTestCase(TestCase):
+    def test_format(self):
+        formatter = CustomFormatter()
+
+        self.assertTrue(formatter.format(create_record()).startswith(CustomFormatter.green))
+        self.assertTrue(formatter.format(create_record(logging.ERROR)).startswith(CustomFormatter.red))
+        self.assertTrue(formatter.format(create_record(5)).endswith('foo (test_logger.py:1)'))
+
+    def test_formatters_are_cached(self):
+        formatter = CustomFormatter()
+        formatters = dict(formatter.formatters)
+
+        formatter.format(create_record())
+
+        self.assertIs(formatter.formatters[logging.INFO], formatters[logging.INFO])
+
+    def test_without_colors(self):
+        out = CustomFormatter(colors=False).format(create_record(logging.WARNING))
+
+        self.assertNotIn('\x1b', out)
+        self.assertIn('WARNING - foo', out)
+
+
+class ConfigureLoggingTestCase(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        patches = [
+            mock.patch.object(logger_module, '_log_queue', None),
+            mock.patch.object(logger, 'handlers', list(logger.handlers)),
+            mock.patch.object(logger, 'level', logger.level),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self) -> None:
+        logger_module.stop_logging()
+        shutil.rmtree(self.directory)
+
+    def test_file_sink(self):
+        filename = os.path.join(self.directory, 'smoke.log')
+        log_queue = configure_logging([filename], level=logging.WARNING)
+
+        logger.info('hidden')
+        logger.warning('shown')
+        log_queue.stop()
+
+        with open(filename) as stream:
+            lines = stream.read().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertIn('WARNING - shown', lines[0])
+        self.assertEqual(logger.handlers, [log_queue.queue_handler])
+
+    def test_reconfigure(self):
+        first = configure_logging([os.path.join(self.directory, 'first.log')])
+        second = configure_logging([])
+
+        self.assertIsNone(first.listener)
+        self.assertEqual(logger.handlers, [second.queue_handler])
+
+    def test_import_creates_no_files(self):
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        subprocess.run([sys.executable, '-c', 'import src.chain_smoker.runner'], cwd=self.directory, check=True,
+                       env={**os.environ, 'PYTHONPATH': root})
+
+        self.assertEqual(os.listdir(self.directory), [])
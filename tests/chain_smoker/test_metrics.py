@@ -0,0 +1,82 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import requests
+
+from src.chain_smoker.metrics import Metrics, serve_metrics
+from src.chain_smoker.results import FileResult, RequestTimings, Status, TestResult
+
+
+def create_result():
+    return FileResult(file='u.yaml', host='example.com', tests=[
+        TestResult(name='get', status=Status.PASSED, timings=RequestTimings(total=0.02), response_bytes=1000),
+        TestResult(name='post', status=Status.FAILED, attempts=3, timings=RequestTimings(total=0.5)),
+    ])
+
+
+class MetricsTestCase(TestCase):
+    def test_export(self):
+        metrics = Metrics()
+        metrics.observe(create_result())
+        metrics.observe(create_result())
+
+        out = metrics.export().splitlines()
+
+        self.assertIn('# TYPE chain_smoker_tests_total counter', out)
+        self.assertIn('chain_smoker_tests_total{file="u.yaml",test="get",host="example.com",status="passed"} 2', out)
+        self.assertIn('chain_smoker_files_total{file="u.yaml",host="example.com",status="failed"} 2', out)
+        self.assertIn('chain_smoker_retries_total{file="u.yaml",test="post",host="example.com"} 4', out)
+        self.assertIn('# TYPE chain_smoker_request_duration_seconds histogram', out)
+        self.assertIn(
+            'chain_smoker_request_duration_seconds_bucket{file="u.yaml",test="get",host="example.com",le="0.025"} 2',
+            out
+        )
+        self.assertIn(
+            'chain_smoker_request_duration_seconds_bucket{file="u.yaml",test="post",host="example.com",le="0.25"} 0',
+            out
+        )
+        self.assertIn(
+            'chain_smoker_request_duration_seconds_bucket{file="u.yaml",test="post",host="example.com",le="+Inf"} 2',
+            out
+        )
+        self.assertIn('chain_smoker_request_duration_seconds_sum{file="u.yaml",test="post",host="example.com"} 1',
+                      out)
+        self.assertIn('chain_smoker_response_size_bytes_count{file="u.yaml",test="get",host="example.com"} 2', out)
+        self.assertNotIn('chain_smoker_response_size_bytes_count{file="u.yaml",test="post",host="example.com"} 2',
+                         out)
+
+    def test_escape_labels(self):
+        metrics = Metrics()
+        metrics.observe(FileResult(file='a "b"\\c.yaml', error='broken'))
+
+        self.assertIn('chain_smoker_files_total{file="a \\"b\\"\\\\c.yaml",host="",status="error"} 1',
+                      metrics.export().splitlines())
+
+    def test_write(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        metrics = Metrics(textfile=os.path.join(directory, 'chain_smoker.prom'))
+        metrics.observe(create_result())
+
+        metrics.write()
+
+        with open(metrics.textfile) as stream:
+            self.assertEqual(stream.read(), metrics.export())
+        self.assertEqual(os.listdir(directory), ['chain_smoker.prom'])
+
+    def test_serve_metrics(self):
+        metrics = Metrics()
+        metrics.observe(create_result())
+        server = serve_metrics(metrics, 0, host='127.0.0.1')
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = f'http://127.0.0.1:{server.server_address[1]}'
+
+        rsp = requests.get(f'{url}/metrics')
+
+        self.assertEqual(rsp.status_code, 200)
+        self.assertTrue(rsp.headers['Content-Type'].startswith('text/plain; version=0.0.4'))
+        self.assertEqual(rsp.text, metrics.export())
+        self.assertEqual(requests.get(f'{url}/foo').status_code, 404)
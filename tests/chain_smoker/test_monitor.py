@@ -0,0 +1,113 @@
+from unittest import TestCase, mock
+
+from src.chain_smoker.metrics import Metrics
+from src.chain_smoker.monitor import Monitor
+from src.chain_smoker.results import FileResult, TestResult, Status
+
+
+class ClockMock:
+    def __init__(self):
+        self.now = 0.
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def create_loader(name, interval=None):
+    loader = mock.Mock()
+    loader.filename = name
+    loader.host = 'example.com'
+    loader.config.config.interval = interval
+    loader.run.return_value = FileResult(file=name)
+    return loader
+
+
+class MonitorTestCase(TestCase):
+    def setUp(self) -> None:
+        self.clock = ClockMock()
+
+    def create_monitor(self, loaders, **kwargs):
+        return Monitor(loaders, clock=self.clock, sleep=self.clock.sleep, **kwargs)
+
+    def test_interval(self):
+        monitor = self.create_monitor([], default_interval=30)
+
+        self.assertEqual(monitor.interval(create_loader('a', 5)), 5)
+        self.assertEqual(monitor.interval(create_loader('b')), 30)
+
+    def test_run_pending_schedules_per_file(self):
+        fast, slow = create_loader('fast', 10), create_loader('slow', 25)
+        monitor = self.create_monitor([fast, slow])
+
+        for _ in range(20):
+            self.clock.sleep(monitor.run_pending())
+            if self.clock.now > 50:
+                break
+
+        # runs at 0, 10, 20, 30, 40, 50 and 0, 25, 50
+        self.assertEqual(fast.run.call_count, 6)
+        self.assertEqual(slow.run.call_count, 3)
+
+    def test_run_pending_returns_time_until_next_run(self):
+        monitor = self.create_monitor([create_loader('a', 10)])
+
+        self.assertEqual(monitor.run_pending(), 10)
+        self.clock.now = 4
+        self.assertEqual(monitor.run_pending(), 6)
+
+    def test_no_drift(self):
+        loader = create_loader('a', 10)
+        loader.run.side_effect = lambda fail_fast: self.clock.sleep(3) or FileResult()
+        monitor = self.create_monitor([loader])
+
+        monitor.run_pending()
+        self.assertEqual(self.clock.now, 3)
+        self.assertEqual(monitor.run_pending(), 7)
+
+    def test_skips_missed_runs(self):
+        loader = create_loader('a', 10)
+        loader.run.side_effect = lambda fail_fast: self.clock.sleep(25) or FileResult()
+        monitor = self.create_monitor([loader])
+
+        self.assertEqual(monitor.run_pending(), 5)
+        self.assertEqual(loader.run.call_count, 1)
+
+    def test_failures_keep_monitor_running(self):
+        failing, erroring, ok = create_loader('a', 10), create_loader('b', 10), create_loader('c', 10)
+        failing.run.return_value = FileResult(
+            file='a', tests=[TestResult(name='foo', status=Status.FAILED, error='foo')]
+        )
+        erroring.run.side_effect = ConnectionError('bar')
+        monitor = self.create_monitor([failing, erroring, ok])
+
+        monitor.run_pending()
+
+        ok.run.assert_called_once_with(fail_fast=False)
+        self.assertFalse(Monitor.run_loader(failing))
+        self.assertFalse(Monitor.run_loader(erroring))
+        self.assertTrue(Monitor.run_loader(ok))
+
+    def test_metrics(self):
+        erroring = create_loader('b', 10)
+        erroring.run.side_effect = ConnectionError('bar')
+        metrics = mock.Mock(spec=Metrics)
+        monitor = self.create_monitor([create_loader('a', 10), erroring], metrics=metrics)
+
+        monitor.run_pending()
+
+        self.assertEqual([c.args[0].file for c in metrics.observe.call_args_list], ['a', 'b'])
+        self.assertEqual(metrics.observe.call_args_list[1].args[0].error, 'ConnectionError: bar')
+        self.assertEqual(metrics.write.call_count, 2)
+
+    def test_workers(self):
+        loaders = [create_loader(str(i), 10) for i in range(4)]
+        monitor = self.create_monitor(loaders, workers=2)
+
+        monitor.run_pending()
+        monitor._executor.shutdown(wait=True)
+
+        for loader in loaders:
+            loader.run.assert_called_once()
@@ -0,0 +1,68 @@
+import os
+import pstats
+import shutil
+import tempfile
+import time
+from unittest import TestCase, mock
+
+from src.chain_smoker.profiling import ProfileConfig, profile_file, report_profiles, _stats_path
+from src.chain_smoker.results import FileResult, FileProfile
+from src.chain_smoker.runner import run_file
+
+
+class ProfileFileTestCase(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    @staticmethod
+    def run_test():
+        time.sleep(0.05)
+        data = [str(i) for i in range(10000)]
+        return FileResult(file='foo.yaml', duration=len(data))
+
+    def test_profile(self):
+        result = profile_file('foo.yaml', ProfileConfig(directory=self.directory), self.run_test)
+
+        profile = result.profile
+        self.assertGreaterEqual(profile.wall, 0.05)
+        self.assertGreater(profile.io_wait, 0.04)
+        self.assertLess(profile.cpu, profile.wall)
+        self.assertEqual(profile.stats_file, os.path.join(self.directory, 'foo.yaml.pstats'))
+        self.assertGreater(pstats.Stats(profile.stats_file).total_calls, 0)
+        self.assertEqual(set(profile.breakdown), {'load', 'requests', 'value tests'})
+        self.assertEqual(profile.allocations, [])
+
+    def test_trace_malloc(self):
+        result = profile_file('foo.yaml', ProfileConfig(trace_malloc=3), self.run_test)
+
+        self.assertEqual(len(result.profile.allocations), 3)
+        self.assertGreater(result.profile.peak_memory, 0)
+        self.assertIsNone(result.profile.stats_file)
+        self.assertIsNone(result.profile.package_cpu)
+
+    def test_stats_path(self):
+        self.assertEqual(_stats_path('out', 'smoke_tests/../a b/foo.yaml'), os.path.join('out', 'a_b_foo.yaml.pstats'))
+
+    @mock.patch('src.chain_smoker.runner.TestFileLoader')
+    def test_run_file(self, loader_mock):
+        loader_mock.return_value.run.return_value = FileResult(file='foo.yaml')
+
+        result = run_file('foo.yaml', profile=ProfileConfig(directory=self.directory), concurrency=4)
+
+        loader_mock.assert_called_once_with('foo.yaml', concurrency=1)
+        self.assertIsNotNone(result.profile.package_cpu)
+
+    def test_report_profiles(self):
+        results = [FileResult(file='a.yaml', profile=FileProfile(wall=2., cpu=0.5)), FileResult(file='b.yaml')]
+
+        with mock.patch('src.chain_smoker.profiling.logger') as logger_mock:
+            report_profiles(results)
+
+        self.assertEqual(
+            [c.args[0] for c in logger_mock.info.call_args_list],
+            ['Profile of a.yaml: wall 2.000s, io wait 1.500s, cpu 0.500s',
+             'Profile of all files: wall 2.000s, io wait 1.500s, cpu 0.500s']
+        )
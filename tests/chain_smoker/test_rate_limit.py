@@ -0,0 +1,131 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase, IsolatedAsyncioTestCase, mock
+
+from src.chain_smoker.api_client import APIClient
+from src.chain_smoker.config import ClientConfig, RateLimitConfig
+from src.chain_smoker.rate_limit import TokenBucket, RateLimiter, get_limiter, set_process_share
+
+
+class ClockMock:
+    def __init__(self):
+        self.now = 0.
+
+    def __call__(self):
+        return self.now
+
+
+class TokenBucketTestCase(TestCase):
+    def test_reserve(self):
+        clock = ClockMock()
+        bucket = TokenBucket(rate=2., burst=2, clock=clock)
+
+        self.assertEqual([bucket.reserve() for _ in range(4)], [0., 0., 0.5, 1.])
+
+        clock.now = 2.
+        self.assertEqual(bucket.reserve(), 0.)
+
+    def test_refill_limited_by_burst(self):
+        clock = ClockMock()
+        bucket = TokenBucket(rate=1., clock=clock)
+        bucket.reserve()
+
+        clock.now = 10.
+        self.assertEqual([bucket.reserve() for _ in range(2)], [0., 1.])
+
+    def test_fractional_burst(self):
+        clock = ClockMock()
+        bucket = TokenBucket(rate=1., burst=0.25, clock=clock)
+
+        self.assertEqual([bucket.reserve() for _ in range(2)], [0.75, 1.75])
+
+        clock.now = 10.
+        self.assertEqual(bucket.reserve(), 0.75)
+
+
+class RateLimiterTestCase(TestCase):
+    def setUp(self) -> None:
+        set_process_share(1)
+
+    def tearDown(self) -> None:
+        set_process_share(1)
+
+    def test_max_in_flight(self):
+        limiter = RateLimiter(RateLimitConfig(max_in_flight=2))
+        lock = threading.Lock()
+        in_flight, peak = 0, 0
+
+        def request(_):
+            nonlocal in_flight, peak
+            with limiter.limit():
+                with lock:
+                    in_flight += 1
+                    peak = max(peak, in_flight)
+                time.sleep(0.01)
+                with lock:
+                    in_flight -= 1
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            list(executor.map(request, range(12)))
+
+        self.assertEqual(peak, 2)
+
+    @mock.patch('src.chain_smoker.rate_limit.time.sleep')
+    def test_requests_per_second(self, sleep_mock):
+        limiter = RateLimiter(RateLimitConfig(requests_per_second=10))
+
+        for _ in range(3):
+            with limiter.limit():
+                pass
+
+        delays = [c.args[0] for c in sleep_mock.call_args_list]
+        self.assertAlmostEqual(delays[0], 0.)
+        self.assertAlmostEqual(delays[2], 0.2, places=2)
+
+    def test_get_limiter_shared_by_host(self):
+        config = RateLimitConfig(requests_per_second=5)
+        limiter = get_limiter(ClientConfig(base_url='https://example.com/foo/', rate_limit=config))
+
+        self.assertIs(get_limiter(ClientConfig(base_url='https://example.com/bar/', rate_limit=config)), limiter)
+        self.assertIsNot(get_limiter(ClientConfig(base_url='https://example.org/', rate_limit=config)), limiter)
+        self.assertIsNone(get_limiter(ClientConfig(base_url='https://example.com/')))
+
+    def test_process_share(self):
+        set_process_share(4)
+
+        config = RateLimitConfig(requests_per_second=8, burst=8, max_in_flight=6)
+
+        limiter = get_limiter(ClientConfig(base_url='https://example.com', rate_limit=config))
+
+        self.assertEqual(limiter.bucket.rate, 2.)
+        self.assertEqual(limiter.bucket.burst, 2.)
+        self.assertEqual(limiter.max_in_flight, 1)
+
+    def test_process_share_exceeding_max_in_flight(self):
+        set_process_share(4)
+
+        with self.assertRaises(ValueError) as err:
+            get_limiter(ClientConfig(base_url='https://example.com', rate_limit=RateLimitConfig(max_in_flight=2)))
+
+        self.assertIn('max_in_flight of 2 can\'t be shared by 4 worker processes', str(err.exception))
+
+    def test_client_requests_are_limited(self):
+        client = APIClient(ClientConfig(base_url='https://example.com', rate_limit=RateLimitConfig(max_in_flight=1)))
+        client.limiter = mock.MagicMock()
+        client.session = mock.Mock()
+
+        client.get('foo')
+
+        client.limiter.limit.assert_called_once()
+        client.session.get.assert_called_once()
+
+
+class AsyncRateLimiterTestCase(IsolatedAsyncioTestCase):
+    async def test_limit_async(self):
+        limiter = RateLimiter(RateLimitConfig(requests_per_second=1000, max_in_flight=1))
+
+        async with limiter.limit_async():
+            semaphore = next(iter(limiter._async_semaphores.values()))
+            self.assertTrue(semaphore.locked())
+        self.assertFalse(semaphore.locked())
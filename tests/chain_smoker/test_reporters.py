@@ -0,0 +1,86 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from xml.etree import ElementTree
+
+from src.chain_smoker.reporters import JSONLinesReporter, JUnitXMLReporter
+from src.chain_smoker.results import FileResult, Status, TestResult
+
+
+def create_results():
+    return [
+        FileResult(file='a.yaml', duration=1.5, tests=[
+            TestResult(name='passing', file='a.yaml', status=Status.PASSED, duration=0.5),
+            TestResult(name='failing', file='a.yaml', status=Status.FAILED, duration=1.,
+                       error='Failure for "failing".\n1 != 2'),
+        ]),
+        FileResult(file='b.yaml', error='ValueError: invalid\x1b'),
+    ]
+
+
+def report(reporter, result):
+    for test in result.tests:
+        reporter.report_test(test)
+    reporter.report_file(result)
+
+
+class ReporterTestCase(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'report')
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def test_json_lines(self):
+        with JSONLinesReporter(self.filename, max_error=10) as reporter:
+            for result in create_results():
+                report(reporter, result)
+
+        with open(self.filename) as stream:
+            records = [json.loads(line) for line in stream]
+
+        self.assertEqual([(r['file'], r['test'], r['status']) for r in records], [
+            ('a.yaml', 'passing', 'passed'), ('a.yaml', 'failing', 'failed'), ('b.yaml', None, 'error')
+        ])
+        self.assertEqual(records[0]['duration'], 0.5)
+        self.assertIsNone(records[0]['error'])
+        self.assertEqual(records[1]['error'], 'Failure fo... (19 more characters)')
+
+    def test_json_lines_streams(self):
+        reporter = JSONLinesReporter(self.filename)
+        reporter.report_test(create_results()[0].tests[0])
+
+        with open(self.filename) as stream:
+            self.assertEqual(len(stream.readlines()), 1)
+        reporter.report_file(create_results()[0].model_copy(update={'tests': []}))
+        with open(self.filename) as stream:
+            self.assertEqual(len(stream.readlines()), 1)
+        reporter.close()
+
+    def test_junit_xml(self):
+        with JUnitXMLReporter(self.filename) as reporter:
+            for result in create_results():
+                report(reporter, result)
+
+        suites = ElementTree.parse(self.filename).getroot()
+
+        self.assertEqual(suites.tag, 'testsuites')
+        first, second = suites
+        self.assertEqual([first.get(key) for key in ('name', 'tests', 'failures', 'errors')], ['a.yaml', '2', '1', '0'])
+        passing, failing = first
+        self.assertEqual(len(passing), 0)
+        self.assertEqual(failing.find('failure').get('message'), 'Failure for "failing".')
+        self.assertEqual(failing.find('failure').text, 'Failure for "failing".\n1 != 2')
+        self.assertEqual(second.get('errors'), '1')
+        self.assertEqual(second.find('testcase/error').text, 'ValueError: invalid')
+
+    def test_junit_xml_streams(self):
+        reporter = JUnitXMLReporter(self.filename)
+        report(reporter, create_results()[0])
+
+        with open(self.filename) as stream:
+            self.assertIn('</testsuite>', stream.read())
+        reporter.close()
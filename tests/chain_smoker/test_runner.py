@@ -0,0 +1,203 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase, mock
+
+from src.chain_smoker.config import Engine
+from src.chain_smoker.results import FileResult, TestResult, Status, RunResult
+from src.chain_smoker.runner import RunFailed, run_file, run_files
+
+
+def create_result(filename, passed=True):
+    status = Status.PASSED if passed else Status.FAILED
+    return FileResult(file=filename, tests=[TestResult(name='test', file=filename, status=status)])
+
+
+class RunFileTestCase(TestCase):
+    @mock.patch('src.chain_smoker.runner.TestFileLoader')
+    def test_run_file(self, loader_mock):
+        loader_mock.return_value.run.return_value = create_result('foo.yaml')
+
+        self.assertTrue(run_file('foo.yaml').passed)
+
+        loader_mock.assert_called_once_with('foo.yaml')
+        loader_mock.return_value.run.assert_called_once_with(fail_fast=True, on_result=None)
+
+    @mock.patch('src.chain_smoker.runner.TestFileLoader')
+    def test_run_file_failure(self, loader_mock):
+        loader_mock.return_value.results = []
+        loader_mock.return_value.run.side_effect = AssertionError('Failure for test "foo".')
+
+        result = run_file('foo.yaml')
+
+        self.assertFalse(result.passed)
+        self.assertEqual(result.error, 'Failure for test "foo".')
+
+    @mock.patch('src.chain_smoker.runner.TestFileLoader')
+    def test_run_file_stops_at_failing_test(self, loader_mock):
+        loader_mock.return_value.host = 'example.com'
+        loader_mock.return_value.results = create_result('foo.yaml').tests + create_result('foo.yaml', False).tests
+        loader_mock.return_value.run.side_effect = AssertionError('Failure for test "test".')
+
+        result = run_file('foo.yaml')
+
+        self.assertFalse(result.passed)
+        self.assertIsNone(result.error)
+        self.assertEqual([test.status for test in result.tests], [Status.PASSED, Status.FAILED])
+        self.assertTrue(result.stopped)
+
+    @mock.patch('src.chain_smoker.runner.TestFileLoader')
+    def test_run_file_error(self, loader_mock):
+        loader_mock.side_effect = ValueError('invalid')
+
+        with self.assertRaises(ValueError):
+            run_file('foo.yaml')
+
+        result = run_file('foo.yaml', fail_fast=False)
+        self.assertFalse(result.passed)
+        self.assertEqual(result.error, 'ValueError: invalid')
+
+
+@mock.patch('src.chain_smoker.runner.ProcessPoolExecutor', ThreadPoolExecutor)
+class RunFilesTestCase(TestCase):
+    @mock.patch('src.chain_smoker.runner.TestFileLoader')
+    def test_serial_stops_at_first_failure(self, loader_mock):
+        loader_mock.return_value.results = []
+        loader_mock.return_value.run.side_effect = [create_result('a.yaml'), AssertionError('foo'), None]
+
+        with self.assertRaises(AssertionError):
+            run_files(['a.yaml', 'b.yaml', 'c.yaml'])
+
+        self.assertEqual(loader_mock.call_count, 2)
+
+    @mock.patch('src.chain_smoker.runner.run_file')
+    def test_serial_continue_on_failure(self, run_file_mock):
+        run_file_mock.side_effect = lambda f, fail_fast, **kwargs: create_result(f, f != 'b.yaml')
+
+        result = run_files(['a.yaml', 'b.yaml', 'c.yaml'], fail_fast=False)
+
+        self.assertEqual(run_file_mock.call_count, 3)
+        self.assertFalse(result.passed)
+        self.assertEqual(result.count(Status.PASSED), 2)
+        self.assertEqual(result.count(Status.FAILED), 1)
+
+    @mock.patch('src.chain_smoker.runner.run_file')
+    def test_parallel_runs_all_files(self, run_file_mock):
+        run_file_mock.side_effect = lambda f, **kwargs: create_result(f, f != 'b.yaml')
+
+        with self.assertRaises(RunFailed) as err:
+            run_files(['a.yaml', 'b.yaml', 'c.yaml'], workers=2)
+
+        self.assertEqual(run_file_mock.call_count, 3)
+        self.assertIn('b.yaml', str(err.exception))
+        self.assertNotIn('a.yaml', str(err.exception))
+        self.assertEqual([file.file for file in err.exception.result.files], ['a.yaml', 'b.yaml', 'c.yaml'])
+
+    @mock.patch('src.chain_smoker.runner.run_file')
+    def test_parallel_continue_on_failure(self, run_file_mock):
+        run_file_mock.side_effect = lambda f, **kwargs: create_result(f, f != 'b.yaml')
+
+        result = run_files(['a.yaml', 'b.yaml', 'c.yaml'], workers=2, fail_fast=False)
+
+        self.assertEqual([file.file for file in result.files], ['a.yaml', 'b.yaml', 'c.yaml'])
+        self.assertFalse(result.passed)
+
+    @mock.patch('src.chain_smoker.runner.run_file')
+    def test_parallel_reports_in_order(self, run_file_mock):
+        run_file_mock.side_effect = lambda f, **kwargs: create_result(f)
+
+        with mock.patch('src.chain_smoker.runner.logger') as logger_mock:
+            run_files(['c.yaml', 'a.yaml', 'b.yaml'], workers=3)
+
+        self.assertEqual(
+            [c.args[0] for c in logger_mock.info.call_args_list],
+            ['Success for c.yaml!', 'Success for a.yaml!', 'Success for b.yaml!']
+        )
+
+    @mock.patch('src.chain_smoker.runner.run_file')
+    def test_parallel_starts_before_files_are_exhausted(self, run_file_mock):
+        started = list()
+        run_file_mock.side_effect = lambda f, **kwargs: started.append(f) or create_result(f)
+
+        def files():
+            yield 'a.yaml'
+            for _ in range(100):
+                if started:
+                    break
+                time.sleep(0.01)
+            yield 'b.yaml' if started else 'late.yaml'
+
+        result = run_files(files(), workers=2)
+
+        self.assertEqual([file.file for file in result.files], ['a.yaml', 'b.yaml'])
+
+    @mock.patch('src.chain_smoker.runner.run_file')
+    def test_reporters(self, run_file_mock):
+        run_file_mock.side_effect = lambda f, *args, **kwargs: create_result(f, f != 'b.yaml')
+        reporter = mock.Mock()
+
+        for kwargs in ({}, {'fail_fast': False}, {'workers': 2, 'fail_fast': False}):
+            reporter.reset_mock()
+            with self.subTest(**kwargs):
+                with mock.patch('src.chain_smoker.runner.TestFileLoader') as loader_mock:
+                    loader_mock.return_value.results = []
+                    loader_mock.return_value.run.side_effect = [create_result('a.yaml'), AssertionError('foo')]
+                    try:
+                        run_files(['a.yaml', 'b.yaml', 'c.yaml'], reporters=[reporter], **kwargs)
+                    except AssertionError:
+                        pass
+
+                expected = ['a.yaml', 'b.yaml'] if not kwargs else ['a.yaml', 'b.yaml', 'c.yaml']
+                self.assertEqual([c.args[0].file for c in reporter.report_file.call_args_list], expected)
+
+    def test_reporters_receive_tests(self):
+        reporter = mock.Mock()
+        failing = create_result('b.yaml', False)
+
+        def run(fail_fast, on_result):
+            for test in failing.tests:
+                on_result(test)
+            raise AssertionError('foo')
+
+        for kwargs in ({}, {'workers': 2}):
+            reporter.reset_mock()
+            with self.subTest(**kwargs):
+                with mock.patch('src.chain_smoker.runner.TestFileLoader') as loader_mock:
+                    loader_mock.return_value.host = None
+                    loader_mock.return_value.results = failing.tests
+                    loader_mock.return_value.run.side_effect = run
+                    with self.assertRaises(AssertionError):
+                        run_files(['b.yaml'], reporters=[reporter], **kwargs)
+
+                self.assertEqual(reporter.method_calls, [
+                    mock.call.report_test(failing.tests[0]), mock.call.report_file(mock.ANY)
+                ])
+                self.assertEqual(reporter.report_file.call_args.args[0].tests, failing.tests)
+
+    @mock.patch('src.chain_smoker.runner.run_file_async')
+    def test_async_runs_all_files(self, run_file_mock):
+        run_file_mock.side_effect = lambda f, *args, **kwargs: create_result(f, f != 'b.yaml')
+
+        with self.assertRaises(AssertionError) as err:
+            run_files(['a.yaml', 'b.yaml', 'c.yaml'], workers=2, engine=Engine.ASYNC)
+
+        self.assertEqual(run_file_mock.call_count, 3)
+        self.assertIn('b.yaml', str(err.exception))
+
+
+class RunResultTestCase(TestCase):
+    def test_summary(self):
+        result = RunResult(
+            files=[create_result('a.yaml'), create_result('b.yaml', False), FileResult(file='c.yaml', error='foo')],
+            duration=1.5
+        )
+
+        self.assertFalse(result.passed)
+        self.assertEqual(result.summary(), '1 passed, 1 failed, 0 errors, 1 broken files in 3 files (1.50s)')
+
+    def test_summary_retried(self):
+        result = RunResult(files=[FileResult(file='a.yaml', tests=[
+            TestResult(name='test', status=Status.PASSED, attempts=3),
+            TestResult(name='other', status=Status.PASSED)
+        ])])
+
+        self.assertEqual(result.summary(), '2 passed, 0 failed, 0 errors, 1 retried in 1 files (0.00s)')
@@ -0,0 +1,72 @@
+from unittest import TestCase
+
+from pydantic import ValidationError
+
+from src.chain_smoker.scheduling import Plan, Shard, longest_first, partition, shard
+
+
+DURATIONS = {'a.yaml': 8., 'b.yaml': 1., 'c.yaml': 4., 'd.yaml': 3., 'e.yaml': 2., 'f.yaml': 2.}
+
+
+class ShardTestCase(TestCase):
+    def test_parse(self):
+        self.assertEqual(Shard.parse('2/4'), Shard(index=2, count=4))
+        self.assertEqual(str(Shard.parse('2/4')), '2/4')
+
+        for value in ['2', 'a/b', '0/2', '3/2']:
+            with self.assertRaises(ValueError):
+                Shard.parse(value)
+
+    def test_validation(self):
+        with self.assertRaises(ValidationError):
+            Shard(index=1, count=0)
+
+
+class PartitionTestCase(TestCase):
+    def test_partition_balanced_by_duration(self):
+        partitions = partition(DURATIONS, 2, DURATIONS.get)
+
+        self.assertEqual(partitions, [['a.yaml', 'f.yaml'], ['b.yaml', 'c.yaml', 'd.yaml', 'e.yaml']])
+        self.assertEqual([sum(DURATIONS[u] for u in p) for p in partitions], [10., 10.])
+
+    def test_partition_is_deterministic(self):
+        durations = {f'{i}.yaml': 1. for i in range(10)}
+
+        first = partition(durations, 3, durations.get)
+        self.assertEqual(partition(reversed(list(durations)), 3, durations.get), [list(reversed(p)) for p in first])
+        self.assertEqual(sorted(len(p) for p in first), [3, 3, 4])
+
+    def test_shard(self):
+        shards = [shard(DURATIONS, Shard(index=i, count=3), DURATIONS.get) for i in range(1, 4)]
+
+        self.assertEqual(sorted(u for s in shards for u in s), sorted(DURATIONS))
+        self.assertEqual(shards[0], ['a.yaml'])
+
+    def test_more_shards_than_units(self):
+        self.assertEqual(partition(['a.yaml'], 3, lambda u: 1.), [['a.yaml'], [], []])
+
+
+class PlanTestCase(TestCase):
+    def test_longest_first(self):
+        self.assertEqual(
+            longest_first(DURATIONS, DURATIONS.get), ['a.yaml', 'c.yaml', 'd.yaml', 'e.yaml', 'f.yaml', 'b.yaml']
+        )
+
+    def test_create(self):
+        plan = Plan.create(longest_first(DURATIONS, DURATIONS.get), 2, DURATIONS.get)
+
+        self.assertEqual([(e.unit, e.worker, e.start) for e in plan.entries], [
+            ('a.yaml', 0, 0.), ('c.yaml', 1, 0.), ('d.yaml', 1, 4.), ('e.yaml', 1, 7.), ('f.yaml', 0, 8.),
+            ('b.yaml', 1, 9.),
+        ])
+        self.assertEqual(plan.makespan, 10.)
+        self.assertTrue(plan.summary().endswith('6 units on 2 workers, estimated makespan 10.00s'))
+
+    def test_longest_first_reduces_makespan(self):
+        units = ['b.yaml', 'c.yaml', 'd.yaml', 'e.yaml', 'f.yaml', 'a.yaml']
+
+        self.assertEqual(Plan.create(units, 2, DURATIONS.get).makespan, 14.)
+        self.assertEqual(Plan.create(longest_first(units, DURATIONS.get), 2, DURATIONS.get).makespan, 10.)
+
+    def test_empty(self):
+        self.assertEqual(Plan.create([], 2, DURATIONS.get).makespan, 0.)
@@ -0,0 +1,145 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase, mock
+
+from src.chain_smoker.config import TestConfig
+from src.chain_smoker.file_loader import TestFileLoader
+from src.chain_smoker.selection import TestSelector, TestIndex
+
+
+TEST_FILE = '''
+type: 'api-test'
+config:
+  client:
+    base_url: 'https://example.com'
+tests:
+  test_get_user:
+    endpoint: 'users/1'
+    tags: ['users', 'smoke']
+  test_create_order:
+    endpoint: 'orders/'
+    method: 'post'
+    payload: '{}'
+  test_chain:
+    multi_step: true
+    steps:
+      - name: 'login'
+        endpoint: 'auth/'
+        method: 'post'
+        payload: '{}'
+      - name: 'get_order'
+        endpoint: 'orders/1'
+'''
+
+
+class TestSelectorTestCase(TestCase):
+    def setUp(self) -> None:
+        self.test = TestConfig.from_dict({'name': 'test_get_user', 'endpoint': 'users/1', 'tags': ['users']})
+        self.chain = TestConfig.from_dict({
+            'name': 'test_chain', 'multi_step': True,
+            'steps': [{'name': 'login', 'endpoint': 'auth/', 'method': 'post'}]
+        })
+
+    def test_empty(self):
+        self.assertTrue(TestSelector().is_empty)
+        self.assertTrue(TestSelector().matches_test(self.test))
+
+    def test_keywords(self):
+        self.assertTrue(TestSelector(keywords=['GET_USER']).matches_test(self.test))
+        self.assertTrue(TestSelector(keywords=['foo', 'user']).matches_test(self.test))
+        self.assertFalse(TestSelector(keywords=['foo']).matches_test(self.test))
+        self.assertTrue(TestSelector(keywords=['login']).matches_test(self.chain))
+
+    def test_tags(self):
+        self.assertTrue(TestSelector(tags=['users']).matches_test(self.test))
+        self.assertFalse(TestSelector(tags=['orders']).matches_test(self.test))
+        self.assertFalse(TestSelector(tags=['users']).matches_test(self.chain))
+
+    def test_endpoints_and_methods(self):
+        self.assertTrue(TestSelector(endpoints=['users/*']).matches_test(self.test))
+        self.assertFalse(TestSelector(endpoints=['orders/*']).matches_test(self.test))
+        self.assertTrue(TestSelector(endpoints=['auth/'], methods=['POST']).matches_test(self.chain))
+        self.assertFalse(TestSelector(methods=['post']).matches_test(self.test))
+
+    def test_nodes(self):
+        selector = TestSelector(nodes=['foo.yaml::test_get_user'])
+
+        self.assertFalse(selector.is_empty)
+        self.assertTrue(selector.matches_test(self.test, 'foo.yaml'))
+        self.assertFalse(selector.matches_test(self.test, 'bar.yaml'))
+        self.assertFalse(TestSelector(nodes=[]).matches_test(self.test, 'foo.yaml'))
+
+    def test_with_nodes(self):
+        selector = TestSelector(methods=['get']).with_nodes(['foo.yaml::test_get_user', 'bar.yaml::test_other'])
+
+        self.assertEqual(selector.nodes, {'foo.yaml': {'test_get_user'}, 'bar.yaml': {'test_other'}})
+        self.assertTrue(selector.matches_test(self.test, 'foo.yaml'))
+        self.assertEqual(selector.for_file('foo.yaml').nodes, {'foo.yaml': {'test_get_user'}})
+        self.assertFalse(selector.for_file('baz.yaml').matches_test(self.test, 'foo.yaml'))
+        self.assertIsNone(TestSelector().for_file('foo.yaml').nodes)
+
+    def test_criteria_combined(self):
+        self.assertFalse(TestSelector(keywords=['user'], tags=['orders']).matches_test(self.test))
+
+
+class TestIndexTestCase(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'test.yaml')
+        with open(self.filename, 'w') as stream:
+            stream.write(TEST_FILE)
+        self.other_filename = os.path.join(self.directory, 'other.yaml')
+        with open(self.other_filename, 'w') as stream:
+            stream.write(TEST_FILE.replace("tags: ['users', 'smoke']", 'tags: []'))
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def test_get(self):
+        entry = TestIndex().get(self.filename)
+
+        self.assertEqual([test.name for test in entry.tests], ['test_get_user', 'test_create_order', 'test_chain'])
+        self.assertEqual(entry.tests[0].tags, ['users', 'smoke'])
+        self.assertEqual(entry.tests[2].steps, ['login', 'get_order'])
+        self.assertEqual(entry.tests[2].methods, ['get', 'post', 'get'])
+
+    def test_select(self):
+        index = TestIndex()
+        files = [self.filename, self.other_filename]
+
+        self.assertEqual(list(index.select(files, TestSelector(tags=['smoke']))), [self.filename])
+        self.assertEqual(list(index.select(files, TestSelector(endpoints=['orders/*']))), files)
+        self.assertEqual(list(index.select(files, TestSelector(keywords=['foo']))), [])
+
+    def test_select_tests(self):
+        nodes = list(TestIndex().select_tests([self.filename], TestSelector(methods=['post'])))
+
+        self.assertEqual(nodes, [f'{self.filename}::test_create_order', f'{self.filename}::test_chain'])
+
+    def test_reindex_on_change_only(self):
+        index_file = os.path.join(self.directory, 'index.json')
+        index = TestIndex()
+        index.get(self.filename)
+        index.save(index_file)
+
+        index = TestIndex.load(index_file)
+        with mock.patch.object(TestIndex, '_index_file', wraps=TestIndex._index_file) as index_mock:
+            index.get(self.filename)
+            index_mock.assert_not_called()
+
+            with open(self.filename, 'a') as stream:
+                stream.write("\n  test_new:\n    endpoint: 'new/'\n")
+            self.assertEqual(index.get(self.filename).tests[-1].name, 'test_new')
+            index_mock.assert_called_once()
+
+    def test_load_invalid(self):
+        self.assertEqual(TestIndex.load(os.path.join(self.directory, 'missing.json')).files, {})
+
+        TestIndex(version='0.0.0', files={self.filename: TestIndex().get(self.filename)}).save(self.filename + '.json')
+        self.assertEqual(TestIndex.load(self.filename + '.json').files, {})
+
+    def test_loader_filters_tests(self):
+        loader = TestFileLoader(self.filename, selector=TestSelector(endpoints=['orders/*']))
+
+        self.assertEqual([test.name for test in loader.test_methods], ['test_create_order', 'test_chain'])
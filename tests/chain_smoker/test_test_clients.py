@@ -1,11 +1,14 @@
-from unittest import TestCase, mock
+from unittest import TestCase, IsolatedAsyncioTestCase, mock
 
 from parameterized import parameterized
+from requests import ConnectionError
 from requests.cookies import RequestsCookieJar, create_cookie
 
 from src.chain_smoker.api_client import APIClient
-from src.chain_smoker.config import TestConfig, ClientConfig, AuthHeader, AuthHeaderTemplate, Cookie
+from src.chain_smoker.config import TestConfig, ClientConfig, AuthHeader, AuthHeaderTemplate, Cookie, RetryPolicy
+from src.chain_smoker.results import RequestTimings
 from src.chain_smoker.test_clients import SmokeTest, ChainedSmokeTest
+from src.chain_smoker.test_methods import MaxLatencyTest
 
 
 class SmokeTestTestCase(TestCase):
@@ -84,6 +87,18 @@ class SmokeTestTestCase(TestCase):
         res = test.run()
         self.assertIsNone(res)
 
+    def test_run_error(self):
+        test = self.create_test('test', 'get', 'example.com/')
+        test.client.get.return_value = mock.Mock(status_code=500, json=mock.Mock(return_value={'key': 'value'}))
+
+        self.assertIsNone(test.run())
+        self.assertIn('Unexpected status_code for test!', test.error)
+
+        test.client.get.return_value = mock.Mock(status_code=200, json=mock.Mock(return_value={'key': 'value'}))
+
+        self.assertIsNotNone(test.run())
+        self.assertIsNone(test.error)
+
     def test_run_expected(self):
         test = self.create_test('test', 'get', 'example.com/', expected={'key': 'value'})
         test.client.get.return_value = mock.Mock(status_code=200, json=mock.Mock(return_value={'key': 'value'}))
@@ -153,6 +168,99 @@ class SmokeTestTestCase(TestCase):
         self.assertIsNotNone(res)
 
 
+class SmokeTestLatencyTestCase(TestCase):
+    def test_max_latency(self):
+        test = SmokeTestTestCase.create_test('test', 'get', 'example.com/')
+        test.max_latency = MaxLatencyTest(100, name='test', method='get')
+        test.client.get.return_value = mock.Mock(
+            status_code=200, json=mock.Mock(return_value={}), timings=RequestTimings(ttfb=0.05, total=0.05)
+        )
+
+        self.assertEqual(test.run(), {})
+        self.assertEqual(test.timings.ttfb, 0.05)
+
+        test.client.get.return_value.timings = RequestTimings(ttfb=0.15, total=0.2)
+        self.assertIsNone(test.run())
+        self.assertIn('200.0ms > 100ms', test.error)
+
+    def test_build(self):
+        client = APIClient(ClientConfig(base_url='example.com'))
+
+        test = SmokeTest.build(TestConfig(name='test', max_latency_ms=250), client)
+
+        self.assertEqual(test.max_latency.value, 250)
+
+    def test_chained_timings(self):
+        test = ChainedSmokeTest('chain', [], mock.Mock())
+        self.assertIsNone(test.timings)
+
+        first, second = SmokeTestTestCase.create_test('a', 'get', '/'), SmokeTestTestCase.create_test('b', 'get', '/')
+        first.timings, second.timings = RequestTimings(connect=0.1, total=0.3), RequestTimings(total=0.2)
+        test.tests = {'a': first, 'b': second}
+
+        self.assertEqual(test.timings, RequestTimings(connect=0.1, total=0.5))
+
+
+@mock.patch('src.chain_smoker.test_clients.time.sleep')
+class SmokeTestRetryTestCase(TestCase):
+    @staticmethod
+    def create_test(**retry):
+        test = SmokeTestTestCase.create_test('test', 'get', 'example.com/')
+        test.retry = RetryPolicy(**retry)
+        test.client.RETRYABLE_ERRORS = APIClient.RETRYABLE_ERRORS
+        return test
+
+    def test_retries_status_code(self, sleep_mock):
+        test = self.create_test(retries=2, backoff=0.1)
+        test.client.get.side_effect = [
+            mock.Mock(status_code=502), mock.Mock(status_code=503),
+            mock.Mock(status_code=200, json=mock.Mock(return_value={'key': 'value'}))
+        ]
+
+        self.assertDictEqual(test.run(), {'key': 'value'})
+        self.assertEqual(test.attempts, 3)
+        self.assertEqual(sleep_mock.call_count, 2)
+        self.assertLessEqual(sleep_mock.call_args_list[1].args[0], 0.2)
+
+    def test_retries_exhausted(self, sleep_mock):
+        test = self.create_test(retries=1)
+        test.client.get.return_value = mock.Mock(status_code=502)
+
+        self.assertIsNone(test.run())
+        self.assertEqual(test.attempts, 2)
+        self.assertEqual(test.client.get.call_count, 2)
+
+    def test_no_retry_on_other_status(self, sleep_mock):
+        test = self.create_test(retries=3, retry_on=['5xx'])
+        test.client.get.return_value = mock.Mock(status_code=404)
+
+        self.assertIsNone(test.run())
+        self.assertEqual(test.attempts, 1)
+        sleep_mock.assert_not_called()
+
+    def test_retries_errors(self, sleep_mock):
+        test = self.create_test(retries=1)
+        test.client.get.side_effect = [
+            ConnectionError('reset'), mock.Mock(status_code=200, json=mock.Mock(return_value={}))
+        ]
+
+        self.assertEqual(test.run(), {})
+        self.assertEqual(test.attempts, 2)
+
+        test = self.create_test(retries=1, retry_on=[502])
+        test.client.get.side_effect = ConnectionError('reset')
+        with self.assertRaises(ConnectionError):
+            test.run()
+        self.assertEqual(test.attempts, 1)
+
+    def test_build_overrides_client_policy(self, sleep_mock):
+        client = APIClient(ClientConfig(base_url='example.com', retry=RetryPolicy(retries=2, backoff=1.)))
+
+        test = SmokeTest.build(TestConfig(name='test', retry_on=[500]), client)
+
+        self.assertEqual(test.retry, RetryPolicy(retries=2, retry_on=[500], backoff=1.))
+
+
 class ChainedSmokeTestTestCase(TestCase):
     def test_build(self):
         client = APIClient(ClientConfig(base_url='example.com'))
@@ -166,6 +274,7 @@ class ChainedSmokeTestTestCase(TestCase):
 
     def test_build_test(self):
         client = mock.Mock()
+        client.retry = RetryPolicy()
         name = 'Name'
         test_1 = TestConfig(name='test_1')
         test_2 = TestConfig(
@@ -200,6 +309,7 @@ class ChainedSmokeTestTestCase(TestCase):
 
     def test_run(self):
         client = mock.Mock()
+        client.retry = RetryPolicy()
         name = 'Name'
         test_1 = TestConfig(name='test_1')
         test_2 = TestConfig(
@@ -226,3 +336,76 @@ class ChainedSmokeTestTestCase(TestCase):
         self.assertDictEqual(test.values['test_1'], {'token': 'XXXXX'})
         self.assertIsNotNone(test.values['test_2'])
         self.assertDictEqual(test.values['test_2'], {'token': 'XXXXX'})
+
+    @mock.patch('requests.Session.get')
+    def test_authentication_scoped_to_chain(self, get_mock):
+        get_mock.return_value = mock.Mock(status_code=200, json=mock.Mock(return_value={'token': 'XXXXX'}))
+        client = APIClient(ClientConfig(base_url='http://example.com'))
+        session_headers = dict(client.session.headers)
+        auth = TestConfig(
+            name='auth', is_authentication=True, payload='{}',
+            auth_header_template=AuthHeaderTemplate(
+                auth_header=AuthHeader(Authorization='Bearer {token}'), token_position='res.json().get(\'token\')'
+            )
+        )
+        config = TestConfig(name='Name', steps=[
+            auth, TestConfig(name='with_headers', headers={'X-Foo': 'bar'}),
+            TestConfig(name='unauthenticated', requires_auth=False)
+        ])
+        test = ChainedSmokeTest.build(config, client)
+
+        test.run()
+
+        self.assertEqual(test.tests['with_headers'].headers, {'Authorization': 'Bearer XXXXX', 'X-Foo': 'bar'})
+        self.assertIsNone(test.tests['unauthenticated'].headers)
+        self.assertIsNone(get_mock.call_args.kwargs.get('headers'))
+        self.assertEqual(dict(client.session.headers), session_headers)
+        self.assertNotIn('Authorization', client.unauthenticated_session.headers)
+
+
+class AsyncSmokeTestTestCase(IsolatedAsyncioTestCase):
+    async def test_run_async(self):
+        test = SmokeTestTestCase.create_test('test', 'get', 'example.com/', contains={'key': 'value'})
+        test.client = mock.AsyncMock()
+        test.client.get.return_value = mock.Mock(status_code=200, json=mock.Mock(return_value={'key': 'value'}))
+
+        res = await test.run_async()
+
+        test.client.get.assert_awaited_once_with('example.com/', requires_auth=True)
+        self.assertDictEqual(res, {'key': 'value'})
+
+    @mock.patch('src.chain_smoker.test_clients.asyncio.sleep')
+    async def test_run_async_retries(self, sleep_mock):
+        test = SmokeTestRetryTestCase.create_test(retries=1)
+        test.client = mock.AsyncMock(RETRYABLE_ERRORS=APIClient.RETRYABLE_ERRORS)
+        test.client.get.side_effect = [mock.Mock(status_code=504), mock.Mock(status_code=200, json=mock.Mock())]
+
+        await test.run_async()
+
+        self.assertEqual(test.attempts, 2)
+        sleep_mock.assert_awaited_once()
+
+    async def test_chained_run_async(self):
+        client = mock.AsyncMock()
+        client.retry = RetryPolicy()
+        client.get.return_value = mock.Mock(json=mock.Mock(return_value={'token': 'XXXXX'}))
+        config = TestConfig(
+            name='Name',
+            steps=[
+                TestConfig(
+                    name='auth', is_authentication=True, payload='{}',
+                    auth_header_template=AuthHeaderTemplate(
+                        auth_header=AuthHeader(Authorization='Bearer {token}'),
+                        token_position='res.json().get(\'token\')'
+                    )
+                ),
+                TestConfig(name='test_1'),
+            ]
+        )
+        test = ChainedSmokeTest.build(config, client)
+
+        values = await test.run_async()
+
+        client.get.assert_awaited_with(None, cookies={}, headers={'Authorization': 'Bearer XXXXX'}, requires_auth=True)
+        self.assertDictEqual(values['auth'], {'token': 'XXXXX'})
+        self.assertDictEqual(values['test_1'], {'token': 'XXXXX'})
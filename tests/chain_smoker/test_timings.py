@@ -0,0 +1,55 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from src.chain_smoker.results import FileResult, RunResult, TestResult, Status
+from src.chain_smoker.timings import Timings
+
+
+class TimingsTestCase(TestCase):
+    def setUp(self) -> None:
+        self.timings = Timings()
+        self.timings.update(RunResult(files=[
+            FileResult(file='a.yaml', duration=3., tests=[
+                TestResult(name='foo', status=Status.PASSED, duration=1.),
+                TestResult(name='bar', status=Status.FAILED, duration=2.),
+            ]),
+            FileResult(file='b.yaml', duration=1., tests=[TestResult(name='foo', status=Status.PASSED, duration=1.)]),
+            FileResult(file='c.yaml', error='broken'),
+            FileResult(file='d.yaml', duration=0.1, stopped=True,
+                       tests=[TestResult(name='foo', status=Status.FAILED, duration=0.1)]),
+        ]))
+
+    def test_update(self):
+        self.assertEqual(self.timings.files, {'a.yaml': 3., 'b.yaml': 1.})
+        self.assertEqual(self.timings.tests, {'a.yaml': {'foo': 1., 'bar': 2.}, 'b.yaml': {'foo': 1.}})
+
+    def test_duration(self):
+        self.assertEqual(self.timings.duration('a.yaml'), 3.)
+        self.assertEqual(self.timings.duration('c.yaml'), 2.)
+        self.assertEqual(self.timings.duration('a.yaml::bar'), 2.)
+        self.assertAlmostEqual(self.timings.duration('a.yaml::baz'), 4 / 3)
+        self.assertEqual(Timings().duration('a.yaml'), 1.)
+        self.assertEqual(Timings().duration('a.yaml::foo'), 1.)
+
+    def test_mean_renewed_by_update(self):
+        self.assertEqual(self.timings.duration('c.yaml'), 2.)
+
+        self.timings.update(RunResult(files=[
+            FileResult(file='c.yaml', duration=5., tests=[TestResult(name='foo', status=Status.PASSED, duration=5.)])
+        ]))
+
+        self.assertEqual(self.timings.duration('d.yaml'), 3.)
+        self.assertEqual(self.timings.duration('d.yaml::foo'), 2.25)
+
+    def test_save_load(self):
+        directory = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(directory, 'timings.json')
+            self.timings.save(filename)
+
+            self.assertEqual(Timings.load(filename), self.timings)
+            self.assertEqual(Timings.load(os.path.join(directory, 'missing.json')), Timings())
+        finally:
+            shutil.rmtree(directory)
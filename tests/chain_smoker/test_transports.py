@@ -0,0 +1,173 @@
+import json
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import TestCase
+
+from parameterized import parameterized
+from requests import ConnectionError, ReadTimeout
+
+from src.chain_smoker.api_client import APIClient
+from src.chain_smoker.config import AuthHeader, AuthHeaderTemplate, ClientConfig, PoolConfig, Transport
+from src.chain_smoker.transports import (
+    Urllib3Session, connect_time, get_pool_manager, reset_connect_time, timed_session, unauthenticated_session
+)
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def _respond(self) -> None:
+        length = int(self.headers.get('Content-Length', 0))
+        if self.path.startswith('/slow'):
+            time.sleep(0.5)
+        if self.path.startswith('/redirect'):
+            self.send_response(302)
+            self.send_header('Location', '/target')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = json.dumps({
+            'method': self.command, 'path': self.path, 'headers': dict(self.headers),
+            'body': self.rfile.read(length).decode(),
+        }).encode()
+        self.send_response(200)
+        if self.path.startswith('/login'):
+            self.send_header('Set-Cookie', 'session=foo; Path=/')
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_PATCH = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+class Urllib3SessionTestCase(TestCase):
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), EchoHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_port}/'
+        self.session = Urllib3Session()
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_get(self):
+        self.session.headers['Authorization'] = 'Bearer foo'
+
+        rsp = self.session.get(self.url + 'foo', params={'a': 1, 'b': None}, headers={'X-Test': 'bar'})
+
+        self.assertEqual(rsp.status_code, 200)
+        self.assertEqual(rsp.url, self.url + 'foo?a=1')
+        self.assertEqual(rsp.headers['content-type'], 'application/json')
+        self.assertEqual(rsp.json()['path'], '/foo?a=1')
+        self.assertEqual(rsp.json()['headers']['Authorization'], 'Bearer foo')
+        self.assertEqual(rsp.json()['headers']['X-Test'], 'bar')
+        self.assertEqual(rsp.request.headers['X-Test'], 'bar')
+
+    def test_removes_headers_set_to_none(self):
+        rsp = self.session.get(self.url, headers={'Accept': None})
+
+        self.assertNotIn('Accept', rsp.json()['headers'])
+
+    @parameterized.expand([
+        ({'json': {'foo': 'bar'}}, '{"foo": "bar"}', 'application/json'),
+        ({'data': {'foo': 'bar'}}, 'foo=bar', 'application/x-www-form-urlencoded'),
+        ({'data': 'raw'}, 'raw', None),
+    ])
+    def test_body(self, kwargs, body, content_type):
+        rsp = self.session.post(self.url, **kwargs)
+
+        self.assertEqual(rsp.json()['method'], 'POST')
+        self.assertEqual(rsp.json()['body'], body)
+        self.assertEqual(rsp.json()['headers'].get('Content-Type'), content_type)
+
+    def test_cookies(self):
+        login = self.session.get(self.url + 'login')
+        rsp = self.session.get(self.url + 'foo')
+
+        self.assertEqual(login.cookies['session'], 'foo')
+        self.assertEqual(rsp.json()['headers']['Cookie'], 'session=foo')
+
+    def test_redirects(self):
+        self.assertEqual(self.session.get(self.url + 'redirect').json()['path'], '/target')
+        self.assertEqual(self.session.get(self.url + 'redirect', allow_redirects=False).status_code, 302)
+
+    def test_errors(self):
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+        with self.assertRaises(ConnectionError):
+            self.session.get(f'http://127.0.0.1:{port}/')
+        with self.assertRaises(ReadTimeout):
+            self.session.get(self.url + 'slow', timeout=0.1)
+
+    def test_shares_pool_manager(self):
+        self.assertIs(get_pool_manager(PoolConfig()), get_pool_manager(PoolConfig(keep_alive=False)))
+        self.assertIsNot(get_pool_manager(PoolConfig()), get_pool_manager(PoolConfig(), verify=False))
+
+    def test_unauthenticated_session_ignores_cookies(self):
+        session = unauthenticated_session(transport=Transport.URLLIB3)
+
+        session.get(self.url + 'login')
+
+        self.assertEqual(len(session.cookies), 0)
+
+    def test_timed_session(self):
+        self.assertIsInstance(timed_session(transport=Transport.URLLIB3), Urllib3Session)
+        self.assertEqual(timed_session(PoolConfig(keep_alive=False), Transport.URLLIB3).headers['Connection'], 'close')
+
+    def test_connect_time(self):
+        reset_connect_time()
+        self.session.get(self.url, headers={'Connection': 'close'})
+        self.assertGreater(connect_time(), 0.)
+
+        reset_connect_time()
+        self.assertEqual(connect_time(), 0.)
+
+
+class TransportsTestCase(TestCase):
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), EchoHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f'http://127.0.0.1:{self.server.server_port}/'
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    @parameterized.expand([(Transport.REQUESTS, ), (Transport.URLLIB3, )])
+    def test_client(self, transport):
+        client = APIClient(ClientConfig(base_url=self.base_url, transport=transport, pool={'pool_maxsize': 3}))
+
+        first = client.post('foo', {'foo': 'bar'}, headers={'X-Test': 'bar'})
+        second = client.get('foo', requires_auth=False)
+
+        self.assertEqual(first.json()['body'], '{"foo": "bar"}')
+        self.assertEqual(first.json()['headers']['X-Test'], 'bar')
+        self.assertNotIn('X-Test', second.json()['headers'])
+        self.assertGreater(first.timings.connect, 0.)
+        self.assertEqual(second.timings.connect, 0.)
+        self.assertAlmostEqual(first.timings.connect + first.timings.ttfb + first.timings.download,
+                               first.timings.total)
+
+    @parameterized.expand([(Transport.REQUESTS, ), (Transport.URLLIB3, )])
+    def test_concurrent_request_headers(self, transport):
+        client = APIClient(ClientConfig(
+            base_url=self.base_url, transport=transport,
+            auth_header=AuthHeaderTemplate(auth_header=AuthHeader(Authorization='Bearer foo'))
+        ))
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(executor.map(lambda i: client.get('foo', headers={'X-Test': str(i)}), range(40)))
+
+        for i, rsp in enumerate(responses):
+            self.assertEqual(rsp.json()['headers']['X-Test'], str(i))
+            self.assertEqual(rsp.json()['headers']['Authorization'], 'Bearer foo')
+        self.assertNotIn('X-Test', client.session.headers)